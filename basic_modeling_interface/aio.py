@@ -0,0 +1,116 @@
+#! /usr/bin/env python
+"""An asyncio facade for the Basic Model Interface."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncBmi(object):
+
+    """Call a model's interface from an asyncio event loop.
+
+    Blocking calls are run in an executor and return awaitables, so that
+    an event loop can advance several models at once and overlap their
+    computation with I/O::
+
+        heat, flow = AsyncBmi(Heat()), AsyncBmi(Flow())
+        await asyncio.gather(heat.update(), flow.update())
+
+    By default each facade has its own single-thread executor so that
+    calls to one model run one at a time, in order, while calls to
+    different models run concurrently. Models that do not release the
+    GIL while they compute can be wrapped in a
+    :class:`~bmi.proxy.BmiProxy` to run in their own process.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    executor : concurrent.futures.Executor, optional
+      Executor in which to run calls. It must run them in this process,
+      and calls to the same model must not overlap unless the model is
+      thread-safe. If given, it is not shut down by :func:`shutdown`.
+    """
+
+    def __init__(self, bmi, executor=None):
+        self._bmi = bmi
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1)
+
+    @property
+    def bmi(self):
+        """The wrapped model, for calls that need not be awaited."""
+        return self._bmi
+
+    def call(self, method, *args, **kwds):
+        """Call a method of the model in the executor.
+
+        Parameters
+        ----------
+        method : str
+          Name of the method.
+        *args, **kwds
+          Arguments to pass to the method.
+
+        Returns
+        -------
+        asyncio.Future
+          A future for the method's return value.
+
+        Raises
+        ------
+        RuntimeError
+          If there is no running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(
+            self._executor,
+            functools.partial(getattr(self._bmi, method), *args, **kwds))
+
+    def initialize(self, filename):
+        """Awaitable :func:`~bmi.base.BmiBase.initialize`."""
+        return self.call('initialize', filename)
+
+    def update(self):
+        """Awaitable :func:`~bmi.base.BmiBase.update`."""
+        return self.call('update')
+
+    def update_until(self, time):
+        """Awaitable :func:`~bmi.base.BmiBase.update_until`."""
+        return self.call('update_until', time)
+
+    def update_frac(self, time_frac):
+        """Awaitable :func:`~bmi.base.BmiBase.update_frac`."""
+        return self.call('update_frac', time_frac)
+
+    def finalize(self):
+        """Awaitable :func:`~bmi.base.BmiBase.finalize`."""
+        return self.call('finalize')
+
+    def get_value(self, var_name, dest=None):
+        """Awaitable :func:`~bmi.getter_setter.BmiGetter.get_value`."""
+        if dest is None:
+            return self.call('get_value', var_name)
+        return self.call('get_value', var_name, dest)
+
+    def get_values(self, var_names, dests=None):
+        """Awaitable :func:`~bmi.getter_setter.BmiGetter.get_values`."""
+        if dests is None:
+            return self.call('get_values', var_names)
+        return self.call('get_values', var_names, dests)
+
+    def set_value(self, var_name, src):
+        """Awaitable :func:`~bmi.getter_setter.BmiSetter.set_value`."""
+        return self.call('set_value', var_name, src)
+
+    def shutdown(self, wait=True):
+        """Shut down the executor, if it was created by this facade.
+
+        Parameters
+        ----------
+        wait : bool, optional
+          Wait for pending calls to finish.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
@@ -0,0 +1,269 @@
+#! /usr/bin/env python
+"""Measure the overhead of calls through the Basic Model Interface."""
+
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+from timeit import default_timer
+
+import numpy as np
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from .buffers import (empty_value_buffer, get_value_into,
+                      is_value_ref_shared, supports_dest)
+
+
+#: Grid shapes of the reference benchmarks.
+REFERENCE_SHAPES = ((10, 20), (100, 200), (1000, 2000))
+
+GRID_METHODS = (
+    'get_grid_rank', 'get_grid_size', 'get_grid_type', 'get_grid_shape',
+    'get_grid_spacing', 'get_grid_origin', 'get_grid_x', 'get_grid_y',
+    'get_grid_z', 'get_grid_connectivity', 'get_grid_offset')
+
+
+class CallStats(namedtuple('CallStats', ['count', 'mean', 'p50', 'p90',
+                                         'p99', 'allocated', 'copied'])):
+
+    """Statistics for calls to one method.
+
+    Times are in seconds. *allocated* is the mean peak memory, in bytes,
+    allocated during a call (or ``None`` if allocations were not tracked)
+    and *copied* is the mean number of bytes of variable data copied per
+    call.
+    """
+
+    __slots__ = ()
+
+
+class _CallRecorder(object):
+
+    """Time calls and record allocations and copies."""
+
+    def __init__(self, track_allocations=True):
+        self._track = track_allocations and tracemalloc is not None
+        self._times = {}
+        self._allocated = {}
+        self._copied = {}
+
+    def call(self, key, func, *args, **kwds):
+        start = default_timer()
+        result = func(*args, **kwds)
+        self._times.setdefault(key, []).append(default_timer() - start)
+        return result
+
+    def call_traced(self, key, func, *args, **kwds):
+        if not self._track:
+            return func(*args, **kwds)
+
+        tracemalloc.start()
+        try:
+            result = func(*args, **kwds)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self._allocated.setdefault(key, []).append(peak)
+        return result
+
+    def copied(self, key, nbytes):
+        self._copied.setdefault(key, []).append(nbytes)
+
+    def stats(self):
+        stats = {}
+        for key, times in self._times.items():
+            p50, p90, p99 = np.percentile(times, (50, 90, 99))
+            allocated = self._allocated.get(key)
+            copied = self._copied.get(key)
+            stats[key] = CallStats(
+                count=len(times), mean=float(np.mean(times)),
+                p50=float(p50), p90=float(p90), p99=float(p99),
+                allocated=None if allocated is None else
+                float(np.mean(allocated)),
+                copied=0. if copied is None else float(np.mean(copied)))
+        return stats
+
+
+def _nbytes(value):
+    return getattr(value, 'nbytes', 0)
+
+
+def _implemented_grid_methods(bmi, grid_id):
+    methods = []
+    for name in GRID_METHODS:
+        try:
+            value = getattr(bmi, name)(grid_id)
+        except (NotImplementedError, AttributeError):
+            continue
+        if value is not None:
+            methods.append(name)
+    return methods
+
+
+def benchmark(cls, filename=None, n_calls=100, var_names=None,
+              track_allocations=True):
+    """Benchmark the calls of a model's interface.
+
+    A new instance of *cls* is driven through
+    :func:`~bmi.base.BmiBase.initialize`, *n_calls* rounds of
+    :func:`~bmi.base.BmiBase.update`, the value getters and setters and the
+    grid getters, and :func:`~bmi.base.BmiBase.finalize`. Each call is
+    timed. Allocations are measured, with :mod:`tracemalloc`, on a separate
+    call so that tracing does not affect the timings. Calls to
+    ``get_value`` with a *dest* buffer are skipped for models that do not
+    accept one (see :func:`~bmi.buffers.supports_dest`).
+
+    Parameters
+    ----------
+    cls : type
+      A class that implements the Basic Model Interface.
+    filename : str, optional
+      Path to the model's configuration file.
+    n_calls : int, optional
+      Number of times to call each method.
+    var_names : iterable of str, optional
+      Variables to get and set. If not given, use all of the model's
+      output variables.
+    track_allocations : bool, optional
+      Measure memory allocated by calls.
+
+    Returns
+    -------
+    dict
+      :class:`CallStats` keyed by ``(method, argument)``, where *argument*
+      is the variable name or grid identifier passed to the method, or
+      ``None``.
+    """
+    recorder = _CallRecorder(track_allocations=track_allocations)
+    bmi = cls()
+
+    recorder.call(('initialize', None), bmi.initialize, filename)
+
+    if var_names is None:
+        var_names = bmi.get_output_var_names() or ()
+    var_names = tuple(var_names)
+    input_var_names = set(bmi.get_input_var_names() or ())
+
+    grids = sorted(set(bmi.get_var_grid(name) for name in var_names))
+    grid_methods = dict((grid, _implemented_grid_methods(bmi, grid))
+                        for grid in grids)
+    dests = dict((name, get_value_into(bmi, name,
+                                       empty_value_buffer(bmi, name)))
+                 for name in var_names)
+    takes_dest = supports_dest(bmi)
+    shared = dict((name, is_value_ref_shared(bmi, name))
+                  for name in var_names)
+
+    for call in range(n_calls + 1):
+        traced = call == n_calls
+        run = recorder.call_traced if traced else recorder.call
+
+        run(('update', None), bmi.update)
+        for name in var_names:
+            value = run(('get_value', name), bmi.get_value, name)
+            if takes_dest:
+                run(('get_value(dest)', name), bmi.get_value, name,
+                    dests[name])
+            ref = run(('get_value_ref', name), bmi.get_value_ref, name)
+            if name in input_var_names:
+                run(('set_value', name), bmi.set_value, name, dests[name])
+
+            if not traced:
+                recorder.copied(('get_value', name), _nbytes(value))
+                if takes_dest:
+                    recorder.copied(('get_value(dest)', name),
+                                    _nbytes(dests[name]))
+                recorder.copied(('get_value_ref', name),
+                                0 if shared[name] else _nbytes(ref))
+                if name in input_var_names:
+                    recorder.copied(('set_value', name),
+                                    _nbytes(dests[name]))
+
+        for grid in grids:
+            for method in grid_methods[grid]:
+                run((method, grid), getattr(bmi, method), grid)
+
+    recorder.call(('finalize', None), bmi.finalize)
+
+    return recorder.stats()
+
+
+def benchmark_reference(shapes=REFERENCE_SHAPES, n_calls=100,
+                        track_allocations=True):
+    """Benchmark the reference heat model at several grid sizes.
+
+    Parameters
+    ----------
+    shapes : iterable of tuple of int, optional
+      Grid shapes to benchmark.
+    n_calls : int, optional
+      Number of times to call each method.
+    track_allocations : bool, optional
+      Measure memory allocated by calls.
+
+    Returns
+    -------
+    dict
+      The results of :func:`benchmark`, keyed by grid shape.
+    """
+    from .heat import BmiHeat
+
+    results = {}
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for shape in shapes:
+            config = os.path.join(tmp_dir, 'heat.yaml')
+            with open(config, 'w') as fp:
+                fp.write('shape: {shape}\n'.format(shape=list(shape)))
+            results[tuple(shape)] = benchmark(
+                BmiHeat, config, n_calls=n_calls,
+                track_allocations=track_allocations)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    return results
+
+
+def format_stats(stats):
+    """Format benchmark results as a table.
+
+    Parameters
+    ----------
+    stats : dict
+      Results from :func:`benchmark`.
+
+    Returns
+    -------
+    str
+      A table with a row of statistics for each call.
+    """
+    header = '{:<40} {:>7} {:>11} {:>11} {:>11} {:>12} {:>12}'.format(
+        'call', 'count', 'p50 (us)', 'p90 (us)', 'p99 (us)', 'alloc (B)',
+        'copied (B)')
+    lines = [header, '-' * len(header)]
+    for (method, arg), stat in sorted(stats.items(),
+                                      key=lambda item: str(item[0])):
+        call = method if arg is None else '{0}({1})'.format(method, arg)
+        if len(call) > 40:
+            call = call[:37] + '...'
+        lines.append(
+            '{:<40} {:>7d} {:>11.2f} {:>11.2f} {:>11.2f} {:>12} {:>12.0f}'
+            .format(call, stat.count, stat.p50 * 1e6, stat.p90 * 1e6,
+                    stat.p99 * 1e6,
+                    '-' if stat.allocated is None else
+                    '{:.0f}'.format(stat.allocated),
+                    stat.copied))
+    return os.linesep.join(lines)
+
+
+if __name__ == '__main__':
+    for shape, stats in sorted(benchmark_reference().items()):
+        print('Grid shape: {shape}'.format(shape=shape))
+        print(format_stats(stats))
+        print()
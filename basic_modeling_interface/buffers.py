@@ -0,0 +1,427 @@
+#! /usr/bin/env python
+"""Helpers for working with value buffers and references."""
+
+import inspect
+
+import numpy as np
+
+
+def var_dtype(bmi, var_name):
+    """Get the data type of a variable as a NumPy dtype.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_name : str
+      An input or output variable name, a CSDMS Standard Name.
+
+    Returns
+    -------
+    numpy.dtype
+      The data type of the variable.
+    """
+    return np.dtype(bmi.get_var_type(var_name))
+
+
+def var_size(bmi, var_name):
+    """Get the number of elements of a variable.
+
+    The number of elements is calculated from the size, in bytes, of the
+    variable and its data type.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_name : str
+      An input or output variable name, a CSDMS Standard Name.
+
+    Returns
+    -------
+    int
+      The number of elements of the variable.
+    """
+    return bmi.get_var_nbytes(var_name) // var_dtype(bmi, var_name).itemsize
+
+
+def var_shape(bmi, var_name):
+    """Get the shape of a variable from its grid.
+
+    Variables defined on a grid that has a shape (rectilinear, uniform
+    rectilinear and structured quadrilateral grids) take the shape of
+    their grid. All others, including variables whose size does not
+    match that of their grid, are one-dimensional.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_name : str
+      An input or output variable name, a CSDMS Standard Name.
+
+    Returns
+    -------
+    tuple of int
+      The shape of the variable.
+    """
+    size = var_size(bmi, var_name)
+
+    grid_shape = bmi.get_grid_shape(bmi.get_var_grid(var_name))
+    if grid_shape is not None:
+        grid_shape = tuple(int(dim) for dim in grid_shape)
+        if int(np.prod(grid_shape)) == size:
+            return grid_shape
+
+    return (size, )
+
+
+def empty_value_buffer(bmi, var_name):
+    """Allocate a buffer that can hold the values of a variable.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_name : str
+      An input or output variable name, a CSDMS Standard Name.
+
+    Returns
+    -------
+    ndarray
+      An uninitialized, one-dimensional array suitable to pass as the
+      *dest* argument of :func:`~bmi.getter_setter.BmiGetter.get_value`.
+    """
+    return np.empty(var_size(bmi, var_name), dtype=var_dtype(bmi, var_name))
+
+
+def empty_value_buffers(bmi, var_names):
+    """Allocate buffers that can hold the values of many variables.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_names : iterable of str
+      Input or output variable names, CSDMS Standard Names.
+
+    Returns
+    -------
+    dict
+      Uninitialized buffers, keyed by variable name, suitable to pass as
+      the *dests* argument of
+      :func:`~bmi.getter_setter.BmiGetter.get_values`.
+    """
+    return dict((name, empty_value_buffer(bmi, name)) for name in var_names)
+
+
+def empty_packed_buffer(bmi, var_names):
+    """Allocate a single packed buffer for the values of many variables.
+
+    The buffer is a zero-dimensional structured array with one field for
+    each variable, so that the values of all the variables are held in
+    one contiguous block of memory. Each field is an aligned, contiguous,
+    one-dimensional array.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_names : iterable of str
+      Input or output variable names, CSDMS Standard Names.
+
+    Returns
+    -------
+    ndarray
+      A zero-filled structured array suitable to pass as the *dests*
+      argument of :func:`~bmi.getter_setter.BmiGetter.get_values`.
+    """
+    dtype = np.dtype([(str(name), var_dtype(bmi, name),
+                       (var_size(bmi, name), )) for name in var_names],
+                     align=True)
+    return np.zeros((), dtype=dtype)
+
+
+def check_value_buffer(bmi, var_name, dest):
+    """Check that a buffer can hold the values of a variable.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_name : str
+      An input or output variable name, a CSDMS Standard Name.
+    dest : ndarray
+      A buffer to hold the values of the variable.
+
+    Returns
+    -------
+    ndarray
+      The buffer, *dest*.
+
+    Raises
+    ------
+    TypeError
+      If *dest* is not an array or its data type does not match that of
+      the variable.
+    ValueError
+      If *dest* is the wrong size, is not contiguous, or is read-only.
+    """
+    if not isinstance(dest, np.ndarray):
+        raise TypeError('{name}: buffer must be an ndarray'.format(
+            name=var_name))
+
+    dtype = var_dtype(bmi, var_name)
+    if dest.dtype != dtype:
+        raise TypeError('{name}: buffer type mismatch ({actual} != '
+                        '{expected})'.format(name=var_name,
+                                             actual=dest.dtype,
+                                             expected=dtype))
+
+    nbytes = bmi.get_var_nbytes(var_name)
+    if dest.nbytes != nbytes:
+        raise ValueError('{name}: buffer size mismatch ({actual} != '
+                         '{expected} bytes)'.format(name=var_name,
+                                                    actual=dest.nbytes,
+                                                    expected=nbytes))
+    if not dest.flags['C_CONTIGUOUS']:
+        raise ValueError('{name}: buffer is not contiguous'.format(
+            name=var_name))
+    if not dest.flags['WRITEABLE']:
+        raise ValueError('{name}: buffer is read-only'.format(name=var_name))
+
+    return dest
+
+
+def copy_value(src, dest):
+    """Copy the values of a variable into a buffer.
+
+    This is intended for use by implementations of
+    :func:`~bmi.getter_setter.BmiGetter.get_value` to fill a caller-supplied
+    buffer without making any temporary copies. The shapes of *src* and
+    *dest* are ignored; only their sizes must match.
+
+    Parameters
+    ----------
+    src : array_like
+      The values of a model variable.
+    dest : ndarray
+      A contiguous buffer to hold the values.
+
+    Returns
+    -------
+    ndarray
+      The buffer, *dest*.
+
+    Raises
+    ------
+    ValueError
+      If *dest* is not contiguous or the sizes of *src* and *dest* differ.
+    """
+    if not dest.flags['C_CONTIGUOUS']:
+        raise ValueError('buffer is not contiguous')
+
+    src = np.asarray(src)
+    if src.size != dest.size:
+        raise ValueError('size mismatch ({actual} != {expected})'.format(
+            actual=dest.size, expected=src.size))
+
+    np.copyto(dest.reshape(src.shape), src)
+
+    return dest
+
+
+def supports_dest(bmi):
+    """Check if a model's get_value accepts a destination buffer.
+
+    Models written before *dest* was added to
+    :func:`~bmi.getter_setter.BmiGetter.get_value` take only a variable
+    name. This is decided from the signature of the model's ``get_value``,
+    without calling it. If the signature cannot be inspected, as for some
+    extension types, *dest* is assumed to be accepted.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+
+    Returns
+    -------
+    bool
+      ``True`` if ``get_value(var_name, dest)`` can be called.
+    """
+    get_value = bmi.get_value
+    try:
+        signature = inspect.signature
+    except AttributeError:
+        try:
+            spec = inspect.getargspec(get_value)
+        except TypeError:
+            return True
+        args = spec.args
+        if inspect.ismethod(get_value) and get_value.__self__ is not None:
+            args = args[1:]
+        return len(args) > 1 or spec.varargs is not None
+
+    try:
+        params = signature(get_value).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    positional = [param for param in params if param.kind in (
+        param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)]
+    return len(positional) > 1 or any(
+        param.kind == param.VAR_POSITIONAL for param in params)
+
+
+def get_value_into(bmi, var_name, dest):
+    """Get the values of a variable into a buffer.
+
+    Models whose ``get_value`` accepts a *dest* buffer (see
+    :func:`supports_dest`) fill it themselves. For older models, the
+    values are fetched with ``get_value(var_name)`` and copied into it.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_name : str
+      An input or output variable name, a CSDMS Standard Name.
+    dest : ndarray
+      A contiguous buffer to hold the values.
+
+    Returns
+    -------
+    ndarray
+      The buffer, *dest*.
+    """
+    if supports_dest(bmi):
+        bmi.get_value(var_name, dest)
+    else:
+        copy_value(bmi.get_value(var_name), dest)
+    return dest
+
+
+def _data_address(array):
+    return array.__array_interface__['data'][0]
+
+
+def is_value_ref_shared(bmi, var_name):
+    """Check if a variable's reference shares memory with the model.
+
+    A reference is considered shared if repeated calls to
+    :func:`~bmi.getter_setter.BmiGetter.get_value_ref` refer to the same,
+    writable memory, and a value written to the reference is seen by the
+    model. This is tested by writing a sentinel to the first element and
+    reading it back with
+    :func:`~bmi.getter_setter.BmiGetter.get_value_at_indices` (or
+    :func:`~bmi.getter_setter.BmiGetter.get_value`); the original value is
+    then restored.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_name : str
+      An input or output variable name, a CSDMS Standard Name.
+
+    Returns
+    -------
+    bool
+      ``True`` if the reference is shared, otherwise ``False``.
+    """
+    ref = bmi.get_value_ref(var_name)
+    if ref is None:
+        return False
+
+    first, second = np.asarray(ref), np.asarray(bmi.get_value_ref(var_name))
+
+    if not (first.flags['WRITEABLE'] and first.nbytes == second.nbytes and
+            _data_address(first) == _data_address(second)):
+        return False
+    if first.size == 0:
+        return True
+
+    return _writes_through(bmi, var_name, first)
+
+
+def _writes_through(bmi, var_name, ref):
+    """Check that a write to a reference is seen by the model."""
+    flat = ref.reshape(-1)
+    original = flat[0].copy()
+    if ref.dtype.kind == 'b':
+        sentinel = not original
+    else:
+        sentinel = ref.dtype.type(2 if original == 1 else 1)
+
+    flat[0] = sentinel
+    try:
+        seen = bmi.get_value_at_indices(var_name, np.array([0]))
+        if seen is None:
+            seen = bmi.get_value(var_name)
+        return bool(np.asarray(seen).reshape(-1)[0] == sentinel)
+    finally:
+        flat[0] = original
+
+
+def check_value_ref(bmi, var_name):
+    """Check that a variable's reference meets the zero-copy contract.
+
+    The reference returned by
+    :func:`~bmi.getter_setter.BmiGetter.get_value_ref` must be a writable,
+    C-contiguous array, with the data type and shape of the variable, that
+    shares memory with the model. Frameworks can use a reference that
+    passes this check directly, without defensively copying it.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      A model that implements the Basic Model Interface.
+    var_name : str
+      An input or output variable name, a CSDMS Standard Name.
+
+    Returns
+    -------
+    ndarray
+      The reference, as an array that shares its memory.
+
+    Raises
+    ------
+    TypeError
+      If the reference does not expose the buffer protocol or its data
+      type does not match that of the variable.
+    ValueError
+      If the reference is the wrong shape, is not contiguous, is read-only
+      or does not share memory with the model.
+    """
+    ref = bmi.get_value_ref(var_name)
+    try:
+        memoryview(ref)
+    except TypeError:
+        raise TypeError('{name}: reference does not expose the buffer '
+                        'protocol'.format(name=var_name))
+    ref = np.asarray(ref)
+
+    dtype = var_dtype(bmi, var_name)
+    if ref.dtype != dtype:
+        raise TypeError('{name}: reference type mismatch ({actual} != '
+                        '{expected})'.format(name=var_name,
+                                             actual=ref.dtype,
+                                             expected=dtype))
+
+    shape = var_shape(bmi, var_name)
+    if ref.shape != shape:
+        raise ValueError('{name}: reference shape mismatch ({actual} != '
+                         '{expected})'.format(name=var_name,
+                                              actual=ref.shape,
+                                              expected=shape))
+    if not ref.flags['C_CONTIGUOUS']:
+        raise ValueError('{name}: reference is not contiguous'.format(
+            name=var_name))
+    if not ref.flags['WRITEABLE']:
+        raise ValueError('{name}: reference is read-only'.format(
+            name=var_name))
+    if not is_value_ref_shared(bmi, var_name):
+        raise ValueError('{name}: reference does not share memory with '
+                         'the model'.format(name=var_name))
+
+    return ref
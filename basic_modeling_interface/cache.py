@@ -0,0 +1,324 @@
+#! /usr/bin/env python
+"""Mixins that cache model metadata and grid geometry."""
+
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'currsize'])
+
+
+def _read_only(value):
+    # A view, rather than a copy, so that caching large grid arrays costs
+    # no memory. Callers cannot write through it, but the model can.
+    if isinstance(value, np.ndarray) and value.flags.writeable:
+        value = value.view()
+        value.flags.writeable = False
+    return value
+
+
+def _cached_method(name):
+    def method(self, key):
+        cache = getattr(self, '_metadata_cache', None)
+        if cache is None:
+            return getattr(super(BmiMetadataCache, self), name)(key)
+
+        values, stats = cache[name], self._metadata_cache_stats[name]
+        try:
+            value = values[key]
+        except KeyError:
+            stats[1] += 1
+            value = values[key] = _read_only(
+                getattr(super(BmiMetadataCache, self), name)(key))
+        else:
+            stats[0] += 1
+        return value
+
+    method.__name__ = name
+    method.__doc__ = 'Cached version of :func:`{name}`.'.format(name=name)
+    return method
+
+
+class BmiMetadataCache(object):
+
+    """Cache variable and grid metadata of a model.
+
+    Calls that get variable and grid metadata are forwarded to the model
+    the first time they are made for a given variable or grid, and are
+    answered from a cache thereafter. This avoids repeated, and possibly
+    expensive, calls across a language boundary for wrapped models.
+
+    Use this class as a mixin, listed before the model class::
+
+        class CachedModel(BmiMetadataCache, Model):
+            pass
+
+    Caching begins after :func:`~bmi.base.BmiBase.initialize` and stops at
+    :func:`~bmi.base.BmiBase.finalize`. Metadata is assumed not to change
+    in between; models whose grids do change must call
+    :func:`clear_grid_metadata` (or :func:`clear_var_metadata`) when they
+    do. Cached arrays are returned as read-only views of the model's
+    arrays.
+    """
+
+    VAR_METADATA_METHODS = (
+        'get_var_type', 'get_var_units', 'get_var_itemsize',
+        'get_var_nbytes', 'get_var_grid')
+    GRID_METADATA_METHODS = (
+        'get_grid_rank', 'get_grid_size', 'get_grid_type', 'get_grid_shape',
+        'get_grid_spacing', 'get_grid_origin')
+
+    get_var_type = _cached_method('get_var_type')
+    get_var_units = _cached_method('get_var_units')
+    get_var_itemsize = _cached_method('get_var_itemsize')
+    get_var_nbytes = _cached_method('get_var_nbytes')
+    get_var_grid = _cached_method('get_var_grid')
+
+    get_grid_rank = _cached_method('get_grid_rank')
+    get_grid_size = _cached_method('get_grid_size')
+    get_grid_type = _cached_method('get_grid_type')
+    get_grid_shape = _cached_method('get_grid_shape')
+    get_grid_spacing = _cached_method('get_grid_spacing')
+    get_grid_origin = _cached_method('get_grid_origin')
+
+    def initialize(self, filename):
+        """Initialize the model and start caching its metadata.
+
+        Parameters
+        ----------
+        filename : str, optional
+          The path to the model configuration file.
+        """
+        self._metadata_cache = None
+        result = super(BmiMetadataCache, self).initialize(filename)
+
+        names = self.VAR_METADATA_METHODS + self.GRID_METADATA_METHODS
+        self._metadata_cache = dict((name, {}) for name in names)
+        self._metadata_cache_stats = dict((name, [0, 0]) for name in names)
+
+        return result
+
+    def finalize(self):
+        """Finalize the model and stop caching its metadata."""
+        self._metadata_cache = None
+        return super(BmiMetadataCache, self).finalize()
+
+    def clear_var_metadata(self, var_name=None):
+        """Remove variable metadata from the cache.
+
+        Parameters
+        ----------
+        var_name : str, optional
+          Name of the variable whose metadata to remove. If not given,
+          remove metadata for all variables.
+        """
+        cache = getattr(self, '_metadata_cache', None)
+        if cache is None:
+            return
+        for name in self.VAR_METADATA_METHODS:
+            if var_name is None:
+                cache[name].clear()
+            else:
+                cache[name].pop(var_name, None)
+
+    def clear_grid_metadata(self, grid_id=None):
+        """Remove grid metadata from the cache.
+
+        Metadata for variables defined on the grid is also removed, as
+        their sizes may depend on that of the grid.
+
+        Parameters
+        ----------
+        grid_id : int, optional
+          Identifier of the grid whose metadata to remove. If not given,
+          remove metadata for all grids.
+        """
+        cache = getattr(self, '_metadata_cache', None)
+        if cache is None:
+            return
+        for name in self.GRID_METADATA_METHODS:
+            if grid_id is None:
+                cache[name].clear()
+            else:
+                cache[name].pop(grid_id, None)
+
+        if grid_id is None:
+            self.clear_var_metadata()
+        else:
+            var_grids = list(cache['get_var_grid'].items())
+            for var_name, var_grid in var_grids:
+                if var_grid == grid_id:
+                    self.clear_var_metadata(var_name)
+
+    def clear_metadata_cache(self):
+        """Remove all metadata from the cache."""
+        self.clear_grid_metadata()
+
+    def metadata_cache_info(self):
+        """Get statistics about the metadata cache.
+
+        Returns
+        -------
+        dict
+          A :class:`CacheInfo`, with the number of cache hits, misses and
+          cached entries, for each cached method.
+        """
+        cache = getattr(self, '_metadata_cache', None)
+        if cache is None:
+            return {}
+        return dict(
+            (name, CacheInfo(hits, misses, len(cache[name])))
+            for name, (hits, misses) in self._metadata_cache_stats.items())
+
+
+def _cached_geometry_method(name):
+    def method(self, grid_id):
+        cache = getattr(self, '_grid_cache', None)
+        if cache is None:
+            return getattr(super(BmiGridCache, self), name)(grid_id)
+
+        version = self.get_grid_version(grid_id)
+        try:
+            entry = cache[grid_id]
+        except KeyError:
+            entry = None
+        else:
+            if entry['version'] != version:
+                del cache[grid_id]
+                entry = None
+
+        if entry is None:
+            entry = cache[grid_id] = {'version': version}
+            while len(cache) > self.GRID_CACHE_SIZE:
+                cache.popitem(last=False)
+                self._grid_cache_stats[2] += 1
+        else:
+            cache[grid_id] = cache.pop(grid_id)
+
+        try:
+            value = entry[name]
+        except KeyError:
+            self._grid_cache_stats[1] += 1
+            value = entry[name] = _read_only(
+                getattr(super(BmiGridCache, self), name)(grid_id))
+        else:
+            self._grid_cache_stats[0] += 1
+
+        if isinstance(value, np.ndarray):
+            value = value.view()
+        return value
+
+    method.__name__ = name
+    method.__doc__ = 'Cached version of :func:`{name}`.'.format(name=name)
+    return method
+
+
+class BmiGridCache(object):
+
+    """Cache the geometry of a model's grids.
+
+    Node coordinates, connectivity and offsets are fetched from the model
+    once for each grid and are then served, as read-only views, from a
+    cache. They are not copied, so the cache holds no more memory than the
+    model does. The cache holds at most :attr:`GRID_CACHE_SIZE` grids;
+    when it is full, the least recently used grid is evicted.
+
+    Use this class as a mixin, listed before the model class::
+
+        class CachedModel(BmiGridCache, Model):
+            pass
+
+    Caching begins after :func:`~bmi.base.BmiBase.initialize` and stops at
+    :func:`~bmi.base.BmiBase.finalize`. Grids are assumed to be static.
+    Models whose grids change can either call :func:`clear_grid_geometry`
+    when they do or override :func:`get_grid_version` to return a value,
+    such as a counter, that changes with the grid.
+    """
+
+    #: Maximum number of grids to cache.
+    GRID_CACHE_SIZE = 16
+
+    GRID_GEOMETRY_METHODS = (
+        'get_grid_x', 'get_grid_y', 'get_grid_z', 'get_grid_connectivity',
+        'get_grid_offset')
+
+    get_grid_x = _cached_geometry_method('get_grid_x')
+    get_grid_y = _cached_geometry_method('get_grid_y')
+    get_grid_z = _cached_geometry_method('get_grid_z')
+    get_grid_connectivity = _cached_geometry_method('get_grid_connectivity')
+    get_grid_offset = _cached_geometry_method('get_grid_offset')
+
+    def initialize(self, filename):
+        """Initialize the model and start caching its grid geometry.
+
+        Parameters
+        ----------
+        filename : str, optional
+          The path to the model configuration file.
+        """
+        self._grid_cache = None
+        result = super(BmiGridCache, self).initialize(filename)
+
+        self._grid_cache = OrderedDict()
+        self._grid_cache_stats = [0, 0, 0]
+
+        return result
+
+    def finalize(self):
+        """Finalize the model and stop caching its grid geometry."""
+        self._grid_cache = None
+        return super(BmiGridCache, self).finalize()
+
+    def get_grid_version(self, grid_id):
+        """Get a value that changes whenever a grid changes.
+
+        The cached geometry of a grid is discarded if the value differs
+        from that when the geometry was fetched. This method is called
+        for every cached call so it must be cheap. By default grids are
+        static and this returns ``None``.
+
+        Parameters
+        ----------
+        grid_id : int
+          A grid identifier.
+
+        Returns
+        -------
+        hashable
+          The version of the grid.
+        """
+        return None
+
+    def clear_grid_geometry(self, grid_id=None):
+        """Remove grid geometry from the cache.
+
+        Parameters
+        ----------
+        grid_id : int, optional
+          Identifier of the grid whose geometry to remove. If not given,
+          remove geometry for all grids.
+        """
+        cache = getattr(self, '_grid_cache', None)
+        if cache is None:
+            return
+        if grid_id is None:
+            cache.clear()
+        else:
+            cache.pop(grid_id, None)
+
+    def grid_cache_info(self):
+        """Get statistics about the grid geometry cache.
+
+        Returns
+        -------
+        dict
+          The number of cache ``hits``, ``misses`` and ``evictions``, and
+          the number of cached grids, ``currsize``.
+        """
+        cache = getattr(self, '_grid_cache', None)
+        if cache is None:
+            return {}
+        hits, misses, evictions = self._grid_cache_stats
+        return {'hits': hits, 'misses': misses, 'evictions': evictions,
+                'currsize': len(cache)}
@@ -0,0 +1,290 @@
+#! /usr/bin/env python
+"""Check that a model implements the Basic Model Interface consistently."""
+
+from __future__ import print_function
+
+import argparse
+import importlib
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from .benchmark import benchmark, format_stats
+from .buffers import check_value_ref, empty_value_buffer, supports_dest
+from .checkpoint import _state_var_names
+from .mesh import CsrMesh
+
+
+class Finding(namedtuple('Finding', ['status', 'subject', 'message'])):
+
+    """The result of one check.
+
+    *status* is ``'ok'``, ``'warn'`` or ``'fail'`` and *subject* names the
+    variable, grid or part of the interface that was checked.
+    """
+
+    __slots__ = ()
+
+GRID_TYPES = ('scalar', 'points', 'vector', 'unstructured',
+              'structured_quadrilateral', 'rectilinear',
+              'uniform_rectilinear')
+
+_STRUCTURED_GRID_TYPES = ('structured_quadrilateral', 'rectilinear',
+                          'uniform_rectilinear')
+
+
+def load_class(path):
+    """Import a class given its dotted path.
+
+    Parameters
+    ----------
+    path : str
+      Path to the class, as ``package.module.Class`` or
+      ``package.module:Class``.
+
+    Returns
+    -------
+    type
+      The class.
+    """
+    if ':' in path:
+        module_name, _, class_name = path.partition(':')
+    else:
+        module_name, _, class_name = path.rpartition('.')
+    if not module_name or not class_name:
+        raise ValueError('{path}: not a dotted path to a class'.format(
+            path=path))
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _check_var(bmi, name):
+    findings = []
+    subject = 'var {name}'.format(name=name)
+
+    try:
+        dtype = np.dtype(bmi.get_var_type(name))
+    except TypeError:
+        return [Finding('fail', subject, 'type {type!r} is not a numpy '
+                        'dtype'.format(type=bmi.get_var_type(name)))]
+
+    itemsize = bmi.get_var_itemsize(name)
+    if itemsize != dtype.itemsize:
+        findings.append(Finding(
+            'fail', subject, 'get_var_itemsize ({itemsize}) != itemsize of '
+            '{dtype} ({expected})'.format(itemsize=itemsize, dtype=dtype,
+                                          expected=dtype.itemsize)))
+
+    grid = bmi.get_var_grid(name)
+    nbytes = bmi.get_var_nbytes(name)
+    if grid is None:
+        findings.append(Finding('warn', subject, 'variable has no grid'))
+    else:
+        size = bmi.get_grid_size(grid)
+        if nbytes != itemsize * size:
+            findings.append(Finding(
+                'fail', subject, 'get_var_nbytes ({nbytes}) != '
+                'get_var_itemsize * get_grid_size ({itemsize} * '
+                '{size})'.format(nbytes=nbytes, itemsize=itemsize,
+                                 size=size)))
+
+    value = np.asarray(bmi.get_value(name))
+    if value.nbytes != nbytes:
+        findings.append(Finding(
+            'fail', subject, 'get_value returns {actual} bytes, not '
+            '{nbytes}'.format(actual=value.nbytes, nbytes=nbytes)))
+    if value.dtype != dtype:
+        findings.append(Finding(
+            'fail', subject, 'get_value returns {actual}, not '
+            '{dtype}'.format(actual=value.dtype, dtype=dtype)))
+
+    if value.dtype == dtype and value.nbytes == nbytes:
+        dest = empty_value_buffer(bmi, name)
+        if not supports_dest(bmi):
+            findings.append(Finding('warn', subject, 'get_value does not '
+                                    'accept a dest buffer'))
+        else:
+            try:
+                bmi.get_value(name, dest)
+            except (TypeError, ValueError) as error:
+                findings.append(Finding(
+                    'fail', subject, 'get_value with a dest buffer raises: '
+                    '{error}'.format(error=error)))
+            else:
+                if not np.array_equal(dest.reshape(-1), value.reshape(-1)):
+                    findings.append(Finding(
+                        'fail', subject, 'get_value fills dest with '
+                        'different values'))
+
+    try:
+        check_value_ref(bmi, name)
+    except (TypeError, ValueError) as error:
+        findings.append(Finding('warn', subject,
+                                'get_value_ref copies: {error}'.format(
+                                    error=error)))
+    else:
+        findings.append(Finding('ok', subject, 'get_value_ref is zero-copy'))
+
+    if not any(finding.status == 'fail' for finding in findings):
+        findings.append(Finding('ok', subject, 'metadata is consistent'))
+    return findings
+
+
+def _check_grid(bmi, grid):
+    findings = []
+    subject = 'grid {grid}'.format(grid=grid)
+
+    grid_type = bmi.get_grid_type(grid)
+    if grid_type not in GRID_TYPES:
+        findings.append(Finding('warn', subject, 'unknown grid type '
+                                '{type!r}'.format(type=grid_type)))
+
+    rank, size = bmi.get_grid_rank(grid), bmi.get_grid_size(grid)
+
+    if grid_type in _STRUCTURED_GRID_TYPES:
+        shape = bmi.get_grid_shape(grid)
+        if shape is None:
+            findings.append(Finding('fail', subject,
+                                    'structured grid has no shape'))
+        else:
+            if len(shape) != rank:
+                findings.append(Finding(
+                    'fail', subject, 'get_grid_rank ({rank}) != '
+                    'len(get_grid_shape) ({actual})'.format(
+                        rank=rank, actual=len(shape))))
+            if int(np.prod(shape)) != size:
+                findings.append(Finding(
+                    'fail', subject, 'get_grid_size ({size}) != '
+                    'product of get_grid_shape ({actual})'.format(
+                        size=size, actual=int(np.prod(shape)))))
+
+    if grid_type == 'uniform_rectilinear':
+        for method in ('get_grid_spacing', 'get_grid_origin'):
+            value = getattr(bmi, method)(grid)
+            if value is None or len(value) != rank:
+                findings.append(Finding(
+                    'fail', subject, '{method} does not have one value per '
+                    'dimension'.format(method=method)))
+
+    if grid_type == 'unstructured':
+        connectivity = bmi.get_grid_connectivity(grid)
+        offset = bmi.get_grid_offset(grid)
+        if connectivity is None or offset is None:
+            findings.append(Finding('fail', subject, 'unstructured grid '
+                                    'has no connectivity or offset'))
+        else:
+            try:
+                CsrMesh(connectivity, offset, n_nodes=size)
+            except ValueError as error:
+                findings.append(Finding(
+                    'fail', subject, 'connectivity and offset are '
+                    'inconsistent: {error}'.format(error=error)))
+
+    if not findings:
+        findings.append(Finding('ok', subject, 'metadata is consistent'))
+    return findings
+
+
+def _check_time(bmi):
+    findings = []
+    start, current, end = (bmi.get_start_time(), bmi.get_current_time(),
+                           bmi.get_end_time())
+    if not start <= current <= end:
+        findings.append(Finding(
+            'fail', 'time', 'current time ({current}) is not between start '
+            '({start}) and end ({end})'.format(current=current, start=start,
+                                               end=end)))
+    time_step = bmi.get_time_step()
+    if time_step is None or time_step <= 0.:
+        findings.append(Finding('warn', 'time', 'time step ({dt}) is not '
+                                'positive'.format(dt=time_step)))
+    if not findings:
+        findings.append(Finding('ok', 'time', 'times are consistent'))
+    return findings
+
+
+def check_model(bmi):
+    """Check the consistency of an initialized model's interface.
+
+    Each variable's type, itemsize and size are checked against one
+    another and against its grid; each grid's rank, shape and size, and
+    the connectivity of unstructured grids, are checked; and
+    :func:`~bmi.getter_setter.BmiGetter.get_value_ref` is checked to
+    share the model's memory (see :func:`~bmi.buffers.check_value_ref`).
+
+    Parameters
+    ----------
+    bmi : Bmi
+      An initialized model.
+
+    Returns
+    -------
+    list of Finding
+      The results of the checks.
+    """
+    findings = _check_time(bmi)
+    grids = []
+    for name in _state_var_names(bmi):
+        findings.extend(_check_var(bmi, name))
+        grid = bmi.get_var_grid(name)
+        if grid is not None and grid not in grids:
+            grids.append(grid)
+    for grid in grids:
+        findings.extend(_check_grid(bmi, grid))
+    return findings
+
+
+def main(argv=None):
+    """Check a model from the command line.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+      Command line arguments, without the program name.
+
+    Returns
+    -------
+    int
+      Exit status: non-zero if any check failed.
+    """
+    parser = argparse.ArgumentParser(
+        prog='bmi-check',
+        description='Check that a model implements the Basic Model '
+        'Interface consistently, and time its calls.')
+    parser.add_argument('cls', metavar='CLASS',
+                        help='dotted path to the class, e.g. '
+                        'basic_modeling_interface.heat.BmiHeat')
+    parser.add_argument('config', nargs='?', default=None,
+                        help='path to the model configuration file')
+    parser.add_argument('--n-calls', type=int, default=100,
+                        help='number of times to call each method')
+    parser.add_argument('--no-timings', action='store_true',
+                        help='check the model only, without timing it')
+    parser.add_argument('--no-allocations', action='store_true',
+                        help='do not measure allocations')
+    args = parser.parse_args(argv)
+
+    cls = load_class(args.cls)
+    bmi = cls()
+    bmi.initialize(args.config)
+    try:
+        findings = check_model(bmi)
+    finally:
+        bmi.finalize()
+
+    for finding in findings:
+        print('{status:<4} {subject}: {message}'.format(
+            status=finding.status.upper(), subject=finding.subject,
+            message=finding.message))
+
+    if not args.no_timings:
+        print()
+        print(format_stats(benchmark(
+            cls, filename=args.config, n_calls=args.n_calls,
+            track_allocations=not args.no_allocations)))
+
+    return int(any(finding.status == 'fail' for finding in findings))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#! /usr/bin/env python
+"""Save and restore the variables of a model with memory-mapped files."""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from .buffers import (check_value_ref, copy_value, get_value_into,
+                      var_dtype, var_shape)
+
+
+#: Bytes that start every checkpoint file.
+MAGIC = b'BMICKPT1'
+
+#: Alignment, in bytes, of the values of each variable.
+ALIGNMENT = 64
+
+_HEADER_SIZE = struct.Struct('<Q')
+
+# os.replace is new in Python 3.3; on POSIX, os.rename also replaces.
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _state_var_names(bmi):
+    names = []
+    for name in (tuple(bmi.get_input_var_names() or ()) +
+                 tuple(bmi.get_output_var_names() or ())):
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def _data_start(header_size):
+    return _align(len(MAGIC) + _HEADER_SIZE.size + header_size)
+
+
+def _read_header(filename):
+    """Read the header of a checkpoint and the offset of its data."""
+    with open(filename, 'rb') as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError('{filename}: not a checkpoint file'.format(
+                filename=filename))
+        size, = _HEADER_SIZE.unpack(fp.read(_HEADER_SIZE.size))
+        return json.loads(fp.read(size).decode('utf-8')), _data_start(size)
+
+
+def read_checkpoint_header(filename):
+    """Read the header of a checkpoint file.
+
+    Parameters
+    ----------
+    filename : str
+      Path to a checkpoint file.
+
+    Returns
+    -------
+    dict
+      The header: the component name, the model time at which the
+      checkpoint was saved, and the type, shape, size and offset of each
+      variable.
+
+    Raises
+    ------
+    ValueError
+      If the file is not a checkpoint.
+    """
+    return _read_header(filename)[0]
+
+
+def save_checkpoint(bmi, filename, var_names=None):
+    """Save the variables of a model to a checkpoint file.
+
+    The file holds a short header, with the metadata of each variable,
+    followed by the values of the variables, each aligned to
+    :data:`ALIGNMENT` bytes. The file is memory-mapped and values are
+    written straight into it with
+    :func:`~bmi.getter_setter.BmiGetter.get_value`, so that no temporary
+    copies of the model's state are made. The file is written under a
+    temporary name and then renamed, so an existing checkpoint is never
+    left half-written.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      An initialized model.
+    filename : str
+      Path to the checkpoint file.
+    var_names : iterable of str, optional
+      Names of the variables to save. If not given, save all input and
+      output variables.
+
+    Returns
+    -------
+    dict
+      The header of the checkpoint.
+    """
+    if var_names is None:
+        var_names = _state_var_names(bmi)
+
+    variables, offset = {}, 0
+    for name in var_names:
+        dtype = var_dtype(bmi, name)
+        nbytes = int(bmi.get_var_nbytes(name))
+        variables[name] = {
+            'type': dtype.str,
+            'shape': [int(dim) for dim in var_shape(bmi, name)],
+            'nbytes': nbytes,
+            'offset': offset,
+        }
+        offset = _align(offset + nbytes)
+    header = {
+        'component': bmi.get_component_name(),
+        'time': float(bmi.get_current_time()),
+        'time_units': bmi.get_time_units(),
+        'order': list(var_names),
+        'vars': variables,
+    }
+
+    # Offsets of variables are relative to the start of the data, which
+    # follows the header at the next aligned byte.
+    encoded = json.dumps(header, sort_keys=True).encode('utf-8')
+    data_start = _data_start(len(encoded))
+
+    temp = '{filename}.{pid}.tmp'.format(filename=filename, pid=os.getpid())
+    with open(temp, 'wb') as fp:
+        fp.write(MAGIC)
+        fp.write(_HEADER_SIZE.pack(len(encoded)))
+        fp.write(encoded)
+        fp.truncate(max(data_start + offset, 1))
+
+    try:
+        if offset > 0:
+            data = np.memmap(temp, dtype=np.uint8, mode='r+',
+                             offset=data_start, shape=(offset, ))
+            for name in var_names:
+                var = variables[name]
+                dest = data[var['offset']:var['offset'] + var['nbytes']]
+                get_value_into(bmi, name, dest.view(var['type']))
+            data.flush()
+            del data
+        _replace(temp, filename)
+    except Exception:
+        os.remove(temp)
+        raise
+
+    return header
+
+
+def load_checkpoint(bmi, filename, var_names=None):
+    """Restore the variables of a model from a checkpoint file.
+
+    The file is memory-mapped, read-only, and values are copied straight
+    from it into the model. Input variables are restored with
+    :func:`~bmi.getter_setter.BmiSetter.set_value`. Output-only variables
+    are copied into the array from
+    :func:`~bmi.getter_setter.BmiGetter.get_value_ref`, but only if it
+    passes :func:`~bmi.buffers.check_value_ref`, so that the values are
+    known to reach the model. Only the pages of the file that are used
+    are read.
+
+    The interface has no way to set a model's clock, so the time at which
+    the checkpoint was saved, in its header, must be restored by the
+    caller if the model does not keep its clock in a variable.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      An initialized model.
+    filename : str
+      Path to a checkpoint file.
+    var_names : iterable of str, optional
+      Names of the variables to restore. If not given, restore all
+      variables in the checkpoint.
+
+    Returns
+    -------
+    list of str
+      Names of the variables that were restored. Output-only variables
+      whose memory the model does not share are skipped.
+
+    Raises
+    ------
+    ValueError
+      If a variable's type or size differs from that in the checkpoint.
+    """
+    header, data_start = _read_header(filename)
+    if var_names is None:
+        var_names = header['order']
+
+    size = max(var['offset'] + var['nbytes']
+               for var in header['vars'].values()) if header['vars'] else 0
+    data = None
+    if size > 0:
+        data = np.memmap(filename, dtype=np.uint8, mode='r',
+                         offset=data_start, shape=(size, ))
+
+    input_names = set(bmi.get_input_var_names() or ())
+    restored = []
+    for name in var_names:
+        var = header['vars'][name]
+        if (np.dtype(var['type']) != var_dtype(bmi, name) or
+                var['nbytes'] != int(bmi.get_var_nbytes(name))):
+            raise ValueError('{name}: checkpoint does not match model '
+                             '({type}, {nbytes} bytes)'.format(
+                                 name=name, type=var['type'],
+                                 nbytes=var['nbytes']))
+        values = data[var['offset']:var['offset'] + var['nbytes']].view(
+            var['type']).reshape(var['shape'])
+
+        if name in input_names:
+            bmi.set_value(name, values)
+        else:
+            try:
+                ref = check_value_ref(bmi, name)
+            except (TypeError, ValueError):
+                continue
+            copy_value(values, ref)
+        restored.append(name)
+
+    return restored
@@ -0,0 +1,228 @@
+#! /usr/bin/env python
+"""Lazily evaluated coordinates of uniform rectilinear grids."""
+
+import numpy as np
+
+
+class UniformRectilinearCoords(object):
+
+    """Node coordinates of a uniform rectilinear grid.
+
+    Coordinates are computed on demand from the shape, spacing and origin
+    of the grid, so that the full arrays of node coordinates, which may be
+    large, are never created unless asked for. As with
+    :class:`~bmi.grid_uniform_rectilinear.BmiGridUniformRectilinear`,
+    dimensions are ordered with "ij" indexing so that, for a 2D grid, the
+    first dimension is *y* and the second is *x*.
+
+    Indexing returns an open mesh, like :data:`numpy.ogrid`, of the
+    coordinates of a tile of the grid: one array per dimension, each of
+    which varies only along its own dimension, that broadcast against one
+    another to the shape of the tile::
+
+        >>> coords = UniformRectilinearCoords((3, 4), (2., 1.), (0., 10.))
+        >>> y, x = coords[1:, :2]
+        >>> y
+        array([[2.],
+               [4.]])
+        >>> x
+        array([[10., 11.]])
+
+    Parameters
+    ----------
+    shape : tuple of int
+      Number of nodes in each dimension.
+    spacing : tuple of float
+      Distance between nodes in each dimension.
+    origin : tuple of float
+      Coordinates of the first node.
+    """
+
+    def __init__(self, shape, spacing, origin):
+        self._shape = tuple(int(dim) for dim in shape)
+        self._spacing = np.array(spacing, dtype=float).reshape(-1)
+        self._origin = np.array(origin, dtype=float).reshape(-1)
+
+        if not (len(self._spacing) == len(self._origin) == len(self._shape)):
+            raise ValueError('shape, spacing and origin must have the same '
+                             'length')
+
+        self._spacing.flags.writeable = False
+        self._origin.flags.writeable = False
+
+    @classmethod
+    def from_bmi(cls, bmi, grid_id):
+        """Get the coordinates of a model's grid.
+
+        Parameters
+        ----------
+        bmi : Bmi
+          A model that implements the Basic Model Interface.
+        grid_id : int
+          Identifier of a uniform rectilinear grid.
+
+        Returns
+        -------
+        UniformRectilinearCoords
+          Coordinates of the grid nodes.
+        """
+        return cls(bmi.get_grid_shape(grid_id),
+                   bmi.get_grid_spacing(grid_id),
+                   bmi.get_grid_origin(grid_id))
+
+    @property
+    def shape(self):
+        """Number of nodes in each dimension."""
+        return self._shape
+
+    @property
+    def spacing(self):
+        """Distance between nodes in each dimension."""
+        return self._spacing
+
+    @property
+    def origin(self):
+        """Coordinates of the first node."""
+        return self._origin
+
+    @property
+    def ndim(self):
+        """Number of dimensions of the grid."""
+        return len(self._shape)
+
+    @property
+    def size(self):
+        """Number of nodes in the grid."""
+        return int(np.prod(self._shape))
+
+    def axis(self, dim, index=None):
+        """Get coordinates along one dimension.
+
+        Parameters
+        ----------
+        dim : int
+          The dimension.
+        index : int, slice or array_like of int, optional
+          Indices of the nodes along the dimension. If not given, get
+          coordinates of all nodes.
+
+        Returns
+        -------
+        ndarray of float
+          Coordinates along the dimension.
+
+        Raises
+        ------
+        IndexError
+          If an index is out of the bounds of the dimension.
+        """
+        n_nodes = self._shape[dim]
+        if index is None:
+            index = slice(None)
+        if isinstance(index, slice):
+            index = np.arange(*index.indices(n_nodes))
+        else:
+            index = np.asarray(index)
+            out_of_bounds = (index < -n_nodes) | (index >= n_nodes)
+            if np.any(out_of_bounds):
+                raise IndexError('index {index} is out of bounds for '
+                                 'dimension {dim} with size {size}'.format(
+                                     index=index[out_of_bounds].flat[0],
+                                     dim=dim, size=n_nodes))
+            index = np.where(index < 0, index + n_nodes, index)
+        return self._origin[dim] + self._spacing[dim] * index
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key, )
+        if len(key) > self.ndim:
+            raise IndexError('too many indices')
+        key = key + (slice(None), ) * (self.ndim - len(key))
+
+        coords = []
+        for dim, index in enumerate(key):
+            shape = [1] * self.ndim
+            shape[dim] = -1
+            coords.append(self.axis(dim, index).reshape(shape))
+
+        return tuple(coords)
+
+    def at(self, indices):
+        """Get coordinates of nodes given their flattened indices.
+
+        Parameters
+        ----------
+        indices : array_like of int
+          Indices of nodes into the flattened grid.
+
+        Returns
+        -------
+        tuple of ndarray
+          Coordinates of the nodes, one array for each dimension.
+        """
+        ij = np.unravel_index(np.asarray(indices), self._shape)
+        return tuple(self._origin[dim] + self._spacing[dim] * ij[dim]
+                     for dim in range(self.ndim))
+
+    def locate(self, *coords):
+        """Get the fractional indices of points.
+
+        This is the inverse of indexing: the integer part of a fractional
+        index is that of the node at the lower-left corner of the cell that
+        contains the point and the remainder is the point's position
+        within that cell.
+
+        Parameters
+        ----------
+        coords : array_like of float
+          Coordinates of the points, one array for each dimension.
+
+        Returns
+        -------
+        tuple of ndarray
+          Fractional indices of the points, one array for each dimension.
+        """
+        if len(coords) != self.ndim:
+            raise ValueError('expected {ndim} coordinate arrays'.format(
+                ndim=self.ndim))
+        return tuple((np.asarray(coords[dim], dtype=float) -
+                      self._origin[dim]) / self._spacing[dim]
+                     for dim in range(self.ndim))
+
+    def tiles(self, tile_shape):
+        """Iterate over the grid in tiles.
+
+        Parameters
+        ----------
+        tile_shape : tuple of int
+          The largest shape of each tile.
+
+        Yields
+        ------
+        tuple
+          The slices that select the tile and an open mesh of its
+          coordinates.
+        """
+        if len(tile_shape) != self.ndim:
+            raise ValueError('tile shape must have {ndim} dimensions'.format(
+                ndim=self.ndim))
+
+        starts = np.ndindex(*[(n + step - 1) // step
+                              for n, step in zip(self._shape, tile_shape)])
+        for start in starts:
+            key = tuple(slice(i * step, min((i + 1) * step, n))
+                        for i, step, n in zip(start, tile_shape,
+                                              self._shape))
+            yield key, self[key]
+
+    def materialize(self):
+        """Create the full arrays of node coordinates.
+
+        Returns
+        -------
+        tuple of ndarray
+          Coordinates of every node, one array, of the shape of the grid,
+          for each dimension.
+        """
+        return tuple(np.ascontiguousarray(coords)
+                     for coords in np.broadcast_arrays(*self[()]))
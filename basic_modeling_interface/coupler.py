@@ -0,0 +1,241 @@
+#! /usr/bin/env python
+"""Couple several models and update them in parallel."""
+
+from collections import namedtuple
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+
+class Connection(namedtuple('Connection',
+                             ['provider', 'consumer', 'var_name'])):
+
+    """A variable passed from one component to another."""
+
+    __slots__ = ()
+
+
+def find_connections(components):
+    """Find the variables that components can pass to one another.
+
+    A component is connected to another if one of its output variables is
+    an input variable of the other.
+
+    Parameters
+    ----------
+    components : dict
+      Initialized models, keyed by component name.
+
+    Returns
+    -------
+    list of Connection
+      The connections between components.
+    """
+    inputs = dict((name, set(bmi.get_input_var_names() or ()))
+                  for name, bmi in components.items())
+
+    connections = []
+    for provider, bmi in sorted(components.items()):
+        for var_name in bmi.get_output_var_names() or ():
+            for consumer in sorted(components):
+                if consumer != provider and var_name in inputs[consumer]:
+                    connections.append(
+                        Connection(provider, consumer, var_name))
+    return connections
+
+
+def pass_value(provider, consumer, var_name):
+    """Pass the current values of a variable from one model to another.
+
+    Values are taken, without a copy, from
+    :func:`~bmi.getter_setter.BmiGetter.get_value_ref` of the provider or,
+    if it returns ``None``, from
+    :func:`~bmi.getter_setter.BmiGetter.get_value`, and given to
+    :func:`~bmi.getter_setter.BmiSetter.set_value` of the consumer.
+
+    Parameters
+    ----------
+    provider : Bmi
+      The model that provides the values.
+    consumer : Bmi
+      The model that receives the values.
+    var_name : str
+      An output variable of *provider* that is an input variable of
+      *consumer*.
+    """
+    value = provider.get_value_ref(var_name)
+    if value is None:
+        value = provider.get_value(var_name)
+    consumer.set_value(var_name, value)
+
+
+def _reachable(graph, start):
+    seen, stack = set(), [start]
+    while stack:
+        node = stack.pop()
+        for succ in graph[node]:
+            if succ not in seen:
+                seen.add(succ)
+                stack.append(succ)
+    return seen
+
+
+def dependency_levels(names, connections):
+    """Group components into levels that can be updated in parallel.
+
+    A component is placed in a later level than all of the components
+    that provide its inputs. Components that depend on one another, through
+    a cycle of connections, are placed in the same level and exchange
+    values lagged by one update.
+
+    Parameters
+    ----------
+    names : iterable of str
+      Component names.
+    connections : iterable of Connection
+      Connections between the components.
+
+    Returns
+    -------
+    list of list of str
+      Component names, grouped by level, in the order in which the levels
+      are updated.
+    """
+    names = sorted(names)
+    graph = dict((name, set()) for name in names)
+    for connection in connections:
+        graph[connection.provider].add(connection.consumer)
+
+    reach = dict((name, _reachable(graph, name)) for name in names)
+
+    # Components that can reach one another form a strongly connected
+    # group; a group's level is one more than that of any group upstream.
+    group = dict((name, frozenset([name]) |
+                  frozenset(other for other in reach[name]
+                            if name in reach[other]))
+                 for name in names)
+
+    level = {}
+
+    def level_of(name):
+        if name not in level:
+            upstream = [other for other in names
+                        if name in reach[other] and
+                        group[other] != group[name]]
+            level[name] = 1 + max([level_of(other) for other in upstream] or
+                                  [-1])
+        return level[name]
+
+    levels = {}
+    for name in names:
+        levels.setdefault(level_of(name), []).append(name)
+    return [levels[key] for key in sorted(levels)]
+
+
+class Coupler(object):
+
+    """Update coupled models in parallel, in order of their dependencies.
+
+    The connections between components are found from their input and
+    output variable names (or given explicitly) and used to group the
+    components into levels (see :func:`dependency_levels`). Each update
+    of the coupler visits the levels in order. Within a level, each
+    component first receives its inputs, from
+    :func:`~bmi.getter_setter.BmiGetter.get_value_ref` of its providers
+    and passed to :func:`~bmi.getter_setter.BmiSetter.set_value`, and then
+    all of the level's components are updated at the same time in a pool
+    of threads.
+
+    Components that compute while holding the GIL can be run in their own
+    processes by wrapping them in :class:`~bmi.proxy.BmiProxy`.
+
+    Parameters
+    ----------
+    components : dict
+      Initialized models, keyed by component name.
+    connections : iterable of Connection, optional
+      Connections between the components. If not given, use
+      :func:`find_connections`.
+    max_workers : int, optional
+      Maximum number of components to update at once.
+    """
+
+    def __init__(self, components, connections=None, max_workers=None):
+        if ThreadPoolExecutor is None:
+            raise RuntimeError('Coupler requires concurrent.futures (Python '
+                               '3.2 or later, or the futures package)')
+        self._components = dict(components)
+        if connections is None:
+            connections = find_connections(self._components)
+        self._connections = tuple(connections)
+
+        self._inputs = dict((name, []) for name in self._components)
+        for connection in self._connections:
+            self._inputs[connection.consumer].append(connection)
+
+        self._levels = dependency_levels(self._components, self._connections)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(len(self._components), 1))
+
+    @property
+    def components(self):
+        """The coupled models, keyed by component name."""
+        return dict(self._components)
+
+    @property
+    def connections(self):
+        """The connections between components."""
+        return self._connections
+
+    @property
+    def levels(self):
+        """Component names grouped by the order in which they update."""
+        return [list(level) for level in self._levels]
+
+    def exchange(self, consumer):
+        """Pass a component the current values of all of its inputs.
+
+        Parameters
+        ----------
+        consumer : str
+          Name of the component that receives the values.
+        """
+        bmi = self._components[consumer]
+        for connection in self._inputs[consumer]:
+            pass_value(self._components[connection.provider], bmi,
+                       connection.var_name)
+
+    def _run_level(self, level, method, *args):
+        for name in level:
+            self.exchange(name)
+
+        futures = [self._executor.submit(getattr(self._components[name],
+                                                 method), *args)
+                   for name in level]
+        for future in futures:
+            future.result()
+
+    def update(self):
+        """Update every component by one time step."""
+        for level in self._levels:
+            self._run_level(level, 'update')
+
+    def update_until(self, time):
+        """Update every component until the given time.
+
+        Inputs are exchanged once, before each level is updated, so this
+        is suited to components that are loosely coupled over the interval.
+
+        Parameters
+        ----------
+        time : float
+          A model time value.
+        """
+        for level in self._levels:
+            self._run_level(level, 'update_until', time)
+
+    def close(self):
+        """Shut down the pool of threads used to update components."""
+        self._executor.shutdown()
@@ -0,0 +1,108 @@
+#! /usr/bin/env python
+"""Advance models to a time with whole and fractional steps."""
+
+import math
+from collections import namedtuple
+
+
+#: Relative tolerance, in time steps, below which a remainder is ignored.
+RTOL = 1e-9
+
+
+class StepPlan(namedtuple('StepPlan', ['n_steps', 'time_frac'])):
+
+    """Whole steps, then a fraction of a step, to reach a time.
+
+    *time_frac* is zero if the time is reached with whole steps alone.
+    """
+
+    __slots__ = ()
+
+
+def plan_steps(current_time, time, time_step):
+    """Find the fewest calls that advance a model to a time.
+
+    Parameters
+    ----------
+    current_time : float
+      The model's current time.
+    time : float
+      The time to advance to.
+    time_step : float
+      The model's time step.
+
+    Returns
+    -------
+    StepPlan
+      The number of whole steps and the fraction of a step that follows.
+
+    Examples
+    --------
+    >>> from basic_modeling_interface.driver import plan_steps
+    >>> plan_steps(0., 2.5, 1.)
+    StepPlan(n_steps=2, time_frac=0.5)
+    >>> plan_steps(0., 3., 1.)
+    StepPlan(n_steps=3, time_frac=0.0)
+    """
+    if time <= current_time or time_step <= 0.:
+        return StepPlan(0, 0.)
+
+    n_steps = (time - current_time) / time_step
+    whole = int(math.floor(n_steps + RTOL))
+    time_frac = n_steps - whole
+    if time_frac <= RTOL:
+        time_frac = 0.
+    return StepPlan(whole, time_frac)
+
+
+def _advance(bmi, time):
+    plan = plan_steps(bmi.get_current_time(), time, bmi.get_time_step())
+    for _ in range(plan.n_steps):
+        bmi.update()
+    if plan.time_frac > 0.:
+        # Wrappers forward update_frac whether or not the model implements
+        # it, so check that the clock moved rather than trusting the class.
+        before = bmi.get_current_time()
+        bmi.update_frac(plan.time_frac)
+        if bmi.get_current_time() == before:
+            bmi.update_until(time)
+        if bmi.get_current_time() == before:
+            bmi.update()
+    return bmi.get_current_time()
+
+
+def advance(models, time):
+    """Advance one or more models to a time.
+
+    Each model takes as many whole steps, with
+    :func:`~bmi.base.BmiBase.update`, as fit before *time* (see
+    :func:`plan_steps`) and then a single fraction of a step to land on
+    *time*, rather than a whole step that overshoots it. The fraction is
+    taken with :func:`~bmi.base.BmiBase.update_frac`. If that leaves the
+    model's clock where it was, as it does for models that do not
+    implement it, the fraction is taken with
+    :func:`~bmi.base.BmiBase.update_until` and, failing that, with one
+    more whole ``update``, which may overshoot.
+
+    Parameters
+    ----------
+    models : Bmi or sequence of Bmi
+      The models to advance.
+    time : float
+      The time to advance to, in the units of the models.
+
+    Returns
+    -------
+    float or list of float
+      The current time of each model after advancing.
+
+    Examples
+    --------
+    Advance a model with a time step of 0.25 to 1.1: four updates then
+    an update of 0.4 of a step::
+
+        advance(model, 1.1)
+    """
+    if hasattr(models, 'update'):
+        return _advance(models, time)
+    return [_advance(bmi, time) for bmi in models]
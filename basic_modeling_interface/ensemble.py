@@ -0,0 +1,246 @@
+#! /usr/bin/env python
+"""Run ensembles of a model in a pool of worker processes."""
+
+import multiprocessing
+import sys
+import traceback
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+try:
+    from multiprocessing import resource_tracker
+except ImportError:
+    resource_tracker = None
+
+try:
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from concurrent.futures.process import BrokenProcessPool
+except ImportError:
+    ProcessPoolExecutor = None
+
+from .buffers import get_value_into, var_dtype, var_size
+
+
+#: Error recorded for a member whose worker process died while running it.
+EXITED_ERROR = 'member process exited unexpectedly'
+
+_started = None
+
+
+def _init_worker(started):
+    global _started
+    _started = started
+
+
+def _run_member(args):
+    """Run one ensemble member and place its outputs in shared memory."""
+    index, cls, filename, time, var_names = args
+    if _started is not None:
+        _started[index] = 1
+
+    segments, dest = [], None
+    try:
+        bmi = cls()
+        bmi.initialize(filename)
+        try:
+            bmi.update_until(bmi.get_end_time() if time is None else time)
+
+            outputs = {}
+            for name in var_names:
+                dtype, size = var_dtype(bmi, name), var_size(bmi, name)
+                segment = shared_memory.SharedMemory(
+                    create=True, size=max(dtype.itemsize * size, 1))
+                segments.append(segment)
+
+                dest = np.ndarray((size, ), dtype=dtype, buffer=segment.buf)
+                get_value_into(bmi, name, dest)
+                dest = None
+
+                outputs[name] = (segment.name, dtype.str, size)
+        finally:
+            bmi.finalize()
+    except Exception:
+        dest = None
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+        return index, None, traceback.format_exc()
+    else:
+        for segment in segments:
+            segment.close()
+        return index, outputs, None
+
+
+class EnsembleResult(object):
+
+    """Outputs of an ensemble run.
+
+    Parameters
+    ----------
+    filenames : tuple of str
+      Configuration file of each member.
+    values : dict
+      Output values, keyed by variable name. Each is an array with one row
+      for each member, in the order of *filenames*.
+    errors : tuple of str or None
+      For each member, a traceback if the member failed, otherwise
+      ``None``.
+    """
+
+    def __init__(self, filenames, values, errors):
+        self.filenames = filenames
+        self.values = values
+        self.errors = errors
+
+    @property
+    def failed(self):
+        """Indices of the members that failed."""
+        return tuple(index for index, error in enumerate(self.errors)
+                     if error is not None)
+
+    @property
+    def succeeded(self):
+        """Indices of the members that succeeded."""
+        return tuple(index for index, error in enumerate(self.errors)
+                     if error is None)
+
+
+def run_ensemble(cls, filenames, var_names, time=None, processes=None,
+                 maxtasksperchild=None):
+    """Run an ensemble of a model in parallel.
+
+    Each member of the ensemble is an instance of *cls*, created in a
+    worker process, that is initialized with one of *filenames*, advanced
+    with :func:`~bmi.base.BmiBase.update_until` and finalized. The values
+    of the selected output variables are written by the model, with
+    :func:`~bmi.getter_setter.BmiGetter.get_value`, directly into shared
+    memory and copied from there into the results, so that they are never
+    pickled.
+
+    A member that raises an exception, or whose worker process dies, is
+    recorded as failed without stopping the rest of the ensemble. The
+    error of a member whose process died is :data:`EXITED_ERROR`.
+
+    Parameters
+    ----------
+    cls : type
+      A class that implements the Basic Model Interface. It must be
+      importable by the worker processes.
+    filenames : iterable of str
+      Configuration files, one for each member.
+    var_names : iterable of str
+      Output variables to collect from each member.
+    time : float, optional
+      Time to which to run each member. If not given, run each member to
+      its end time.
+    processes : int, optional
+      Number of worker processes. If not given, use one for each CPU.
+    maxtasksperchild : int, optional
+      Number of members a worker runs before it is replaced. Use ``1`` for
+      models that leak memory. Requires Python 3.11 or later; on earlier
+      versions, a :class:`RuntimeError` is raised.
+
+    Returns
+    -------
+    EnsembleResult
+      The outputs and errors of each member. Rows of failed members are
+      filled with zeros.
+    """
+    if shared_memory is None:
+        raise RuntimeError('ensemble runs require multiprocessing.'
+                           'shared_memory (Python 3.8 or later)')
+    if maxtasksperchild is not None and sys.version_info < (3, 11):
+        raise RuntimeError('maxtasksperchild requires Python 3.11 or later')
+
+    filenames = tuple(filenames)
+    var_names = tuple(var_names)
+
+    values = {}
+    errors = [None] * len(filenames)
+
+    tasks = [(index, cls, filename, time, var_names)
+             for index, filename in enumerate(filenames)]
+
+    def collect(index, outputs, error):
+        if error is not None:
+            errors[index] = error
+            return
+
+        for name, (segment_name, dtype, size) in outputs.items():
+            segment = shared_memory.SharedMemory(name=segment_name)
+            try:
+                if name not in values:
+                    values[name] = np.zeros((len(filenames), size),
+                                            dtype=dtype)
+                if values[name].shape[1] != size:
+                    errors[index] = (
+                        '{name}: size mismatch ({actual} != '
+                        '{expected})'.format(
+                            name=name, actual=size,
+                            expected=values[name].shape[1]))
+                else:
+                    values[name][index] = np.ndarray(
+                        (size, ), dtype=dtype, buffer=segment.buf)
+            finally:
+                segment.close()
+                segment.unlink()
+
+    # Workers must share this process's resource tracker so that segments
+    # they create are not unlinked when they exit.
+    if resource_tracker is not None:
+        resource_tracker.ensure_running()
+
+    started = multiprocessing.RawArray('b', max(len(tasks), 1))
+
+    # A worker that dies breaks the pool and every member it has not
+    # finished. Members that had not started are run again in a new pool;
+    # those that had are run again one at a time, so that the one that
+    # killed its worker is found and the others are not blamed.
+    pending, suspects = list(range(len(tasks))), []
+    while pending:
+        lost = _run_pool(tasks, pending, started, collect, processes,
+                         maxtasksperchild)
+        crashed = [index for index in lost if started[index]]
+        pending = [index for index in lost if not started[index]]
+        if lost and not crashed:
+            crashed, pending = lost, []
+        suspects.extend(crashed)
+
+    for index in sorted(suspects):
+        started[index] = 0
+        if _run_pool(tasks, [index], started, collect, 1, None):
+            errors[index] = EXITED_ERROR
+
+    return EnsembleResult(filenames, values, tuple(errors))
+
+
+def _run_pool(tasks, indices, started, collect, processes,
+              maxtasksperchild):
+    """Run members in a new pool and return those lost to a broken pool."""
+    kwds = {}
+    if maxtasksperchild is not None:
+        kwds['max_tasks_per_child'] = maxtasksperchild
+    executor = ProcessPoolExecutor(max_workers=processes,
+                                   initializer=_init_worker,
+                                   initargs=(started, ), **kwds)
+
+    lost = []
+    try:
+        futures = dict((executor.submit(_run_member, tasks[index]), index)
+                       for index in indices)
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                lost.append(futures[future])
+            else:
+                collect(*result)
+    finally:
+        executor.shutdown()
+
+    return sorted(lost)
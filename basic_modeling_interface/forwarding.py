@@ -0,0 +1,44 @@
+#! /usr/bin/env python
+"""Forward the calls of the Basic Model Interface to another model."""
+
+from .bmi import Bmi
+
+
+def _forwarded_method(name, doc):
+    def method(self, *args, **kwds):
+        return self._call(name, *args, **kwds)
+
+    method.__name__ = name
+    method.__doc__ = doc.format(name=name)
+    return method
+
+
+def forward_methods(cls, doc):
+    """Forward the methods of the interface that a class does not define.
+
+    Each method of :class:`~bmi.bmi.Bmi` that is not defined by *cls*
+    itself is replaced by one that calls ``self._call(name, *args,
+    **kwds)``, which *cls* must provide.
+    :func:`~bmi.getter_setter.BmiGetter.get_values` is built on
+    :func:`~bmi.getter_setter.BmiGetter.get_value`, so it is inherited,
+    not forwarded, and gets the values through the class's own
+    ``get_value``.
+
+    Parameters
+    ----------
+    cls : type
+      A subclass of :class:`~bmi.bmi.Bmi`.
+    doc : str
+      Docstring of the forwarded methods, formatted with the method
+      *name*.
+
+    Returns
+    -------
+    type
+      The class, *cls*.
+    """
+    for name in dir(Bmi):
+        if not name.startswith('_') and name not in cls.__dict__ and (
+                name != 'get_values'):
+            setattr(cls, name, _forwarded_method(name, doc))
+    return cls
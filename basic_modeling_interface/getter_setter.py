@@ -11,22 +11,36 @@ class BmiGetter(object):
     current values.
     """
 
-    def get_value(self, var_name):
+    def get_value(self, var_name, dest=None):
         """Get a copy of values of the given variable.
 
         This is a getter for the model, used to access the model's
         current state. It returns a *copy* of a model variable, with
         the return type, size and rank dependent on the variable.
 
+        If *dest* is given, the values are copied into it rather than
+        into a newly allocated array, so that a caller can reuse the
+        same buffer from one time step to the next.
+
         Parameters
         ----------
         var_name : str
           An input or output variable name, a CSDMS Standard Name.
+        dest : ndarray, optional
+          A preallocated, contiguous array into which to place the
+          values. Its data type must match that given by
+          :func:`~bmi.vars.BmiVars.get_var_type` and its size, in
+          bytes, that given by :func:`~bmi.vars.BmiVars.get_var_nbytes`.
 
         Returns
         -------
         array_like
-          The value of a model variable.
+          The value of a model variable. If *dest* was given, this is
+          *dest*.
+
+        See Also
+        --------
+        bmi.buffers.check_value_buffer : Validate a *dest* buffer.
 
         Notes
         -----
@@ -44,6 +58,15 @@ class BmiGetter(object):
         current state. It returns a reference to a model variable,
         with the return type, size and rank dependent on the variable.
 
+        The reference must share memory with the model so that a caller
+        can read it, and write to it, without making a copy. It must be a
+        writable, C-contiguous :class:`numpy.ndarray` (or an object, such
+        as a :class:`memoryview`, that exposes the buffer protocol) whose
+        data type is that given by :func:`~bmi.vars.BmiVars.get_var_type`
+        and whose shape is that of the variable's grid. Repeated calls
+        must refer to the same memory for as long as the variable's grid
+        does not change.
+
         Parameters
         ----------
         var_name : str
@@ -51,9 +74,14 @@ class BmiGetter(object):
 
         Returns
         -------
-        array_like
+        ndarray
           A reference to a model variable.
 
+        See Also
+        --------
+        bmi.buffers.check_value_ref : Check that a reference meets this
+            contract.
+
         Notes
         -----
         .. code-block:: c
@@ -64,6 +92,39 @@ class BmiGetter(object):
         """
         pass
 
+    def get_values(self, var_names, dests=None):
+        """Get copies of the values of many variables.
+
+        This is a batched form of :func:`get_value`. The default
+        implementation calls :func:`get_value` for each variable in turn;
+        models with many variables can override it to gather values
+        with less overhead.
+
+        Parameters
+        ----------
+        var_names : iterable of str
+          Input or output variable names, CSDMS Standard Names.
+        dests : mapping, optional
+          Preallocated buffers, keyed by variable name, into which to
+          place the values. This may be a ``dict`` of arrays or a packed
+          structured array whose fields are the variable names.
+
+        Returns
+        -------
+        dict
+          The values of the variables, keyed by variable name.
+
+        See Also
+        --------
+        bmi.buffers.empty_value_buffers : Allocate *dests*.
+        bmi.buffers.empty_packed_buffer : Allocate a packed *dests*.
+        """
+        if dests is None:
+            return dict((name, self.get_value(name)) for name in var_names)
+        else:
+            return dict((name, self.get_value(name, dests[name]))
+                        for name in var_names)
+
     def get_value_at_indices(self, var_name, indices):
         """Get values at particular indices.
 
@@ -71,8 +132,10 @@ class BmiGetter(object):
         ----------
         var_name : str
           An input or output variable name, a CSDMS Standard Name.
-        indices : array_like
-          The indices into the variable array.
+        indices : array_like or IndexSet
+          The indices into the variable array. Pass an
+          :class:`~bmi.indices.IndexSet` to reuse indices that have
+          already been validated and sorted.
 
         Returns
         -------
@@ -128,8 +191,10 @@ class BmiSetter(object):
         ----------
         var_name : str
           An input or output variable name, a CSDMS Standard Name.
-        indices : array_like
-          The indices into the variable array.
+        indices : array_like or IndexSet
+          The indices into the variable array. Pass an
+          :class:`~bmi.indices.IndexSet` to reuse indices that have
+          already been validated and sorted.
         src : array_like
           The new value for the specified variable.
 
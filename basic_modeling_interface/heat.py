@@ -0,0 +1,221 @@
+#! /usr/bin/env python
+"""A reference model that solves the heat equation on a uniform grid."""
+
+import ast
+
+import numpy as np
+
+from .bmi import Bmi
+from .buffers import check_value_buffer, copy_value
+from .coords import UniformRectilinearCoords
+from .indices import IndexSet
+
+
+def read_config(filename):
+    """Read a simple configuration file.
+
+    Each line of the file is a ``key: value`` pair, where the value is a
+    Python literal. Blank lines and lines that start with ``#`` are
+    ignored. This is a subset of YAML.
+
+    Parameters
+    ----------
+    filename : str
+      Path to the configuration file.
+
+    Returns
+    -------
+    dict
+      The configuration values.
+    """
+    config = {}
+    with open(filename, 'r') as fp:
+        for line in fp:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            key, value = line.split(':', 1)
+            config[key.strip()] = ast.literal_eval(value.strip())
+    return config
+
+
+class BmiHeat(Bmi):
+
+    """Diffusion of heat on a uniform rectilinear grid.
+
+    The temperature of a plate is advanced with an explicit finite
+    difference scheme. Boundary values are held fixed. The model is small
+    enough to serve as a template for implementing the interface and
+    cheap enough, per element, that it is useful as a reference when
+    benchmarking the overhead of calls through the interface.
+
+    The configuration file may give the ``shape``, ``spacing`` and
+    ``origin`` of the grid, the thermal diffusivity, ``alpha``, and the
+    ``end_time`` of the model. Without a configuration file, defaults are
+    used.
+    """
+
+    _name = 'The 2D Heat Equation'
+    _input_var_names = ('plate_surface__temperature', )
+    _output_var_names = ('plate_surface__temperature', )
+    _var_units = {'plate_surface__temperature': 'K'}
+    _var_grid = {'plate_surface__temperature': 0}
+
+    def __init__(self):
+        self._shape = None
+        self._spacing = None
+        self._origin = None
+        self._alpha = 1.
+        self._time = 0.
+        self._time_step = 0.
+        self._end_time = np.finfo('d').max
+        self._values = {}
+        self._work = None
+
+    def initialize(self, filename=None):
+        config = {}
+        if filename is not None:
+            config = read_config(filename)
+
+        self._shape = tuple(int(n) for n in config.get('shape', (10, 20)))
+        self._spacing = tuple(
+            float(dx) for dx in config.get('spacing', (1., 1.)))
+        self._origin = tuple(float(x) for x in config.get('origin', (0., 0.)))
+        self._alpha = float(config.get('alpha', 1.))
+        self._end_time = float(config.get('end_time', np.finfo('d').max))
+
+        self._time = 0.
+        self._time_step = min(self._spacing) ** 2 / (4. * self._alpha)
+
+        temperature = np.zeros(self._shape, dtype=float)
+        temperature[self._shape[0] // 2, self._shape[1] // 2] = 100.
+        self._values = {'plate_surface__temperature': temperature}
+        self._work = np.empty((2, ) + temperature[1:-1, 1:-1].shape)
+
+    def _step(self, dt):
+        z = self._values['plate_surface__temperature']
+        center = z[1:-1, 1:-1]
+        lap, work = self._work
+        dy, dx = self._spacing
+
+        # Second differences, in place, so that a step allocates nothing.
+        np.add(z[1:-1, :-2], z[1:-1, 2:], out=lap)
+        lap -= center
+        lap -= center
+        lap *= 1. / (dx * dx)
+
+        np.add(z[:-2, 1:-1], z[2:, 1:-1], out=work)
+        work -= center
+        work -= center
+        work *= 1. / (dy * dy)
+
+        lap += work
+        lap *= self._alpha * dt
+        center += lap
+
+        self._time += dt
+
+    def update(self):
+        self._step(self._time_step)
+
+    def update_frac(self, time_frac):
+        self._step(self._time_step * time_frac)
+
+    def update_until(self, time):
+        n_steps = int((time - self._time) / self._time_step)
+        for _ in range(n_steps):
+            self.update()
+        remainder = (time - self._time) / self._time_step
+        if remainder > 0.:
+            self.update_frac(remainder)
+
+    def finalize(self):
+        self._values = {}
+        self._work = None
+
+    def get_component_name(self):
+        return self._name
+
+    def get_input_var_names(self):
+        return self._input_var_names
+
+    def get_output_var_names(self):
+        return self._output_var_names
+
+    def get_start_time(self):
+        return 0.
+
+    def get_current_time(self):
+        return self._time
+
+    def get_end_time(self):
+        return self._end_time
+
+    def get_time_step(self):
+        return self._time_step
+
+    def get_time_units(self):
+        return 's'
+
+    def get_var_type(self, var_name):
+        return str(self._values[var_name].dtype)
+
+    def get_var_units(self, var_name):
+        return self._var_units[var_name]
+
+    def get_var_itemsize(self, var_name):
+        return self._values[var_name].itemsize
+
+    def get_var_nbytes(self, var_name):
+        return self._values[var_name].nbytes
+
+    def get_var_grid(self, var_name):
+        return self._var_grid[var_name]
+
+    def get_value(self, var_name, dest=None):
+        if dest is None:
+            return self._values[var_name].reshape(-1).copy()
+        return copy_value(self._values[var_name],
+                          check_value_buffer(self, var_name, dest))
+
+    def get_value_ref(self, var_name):
+        return self._values[var_name]
+
+    def get_value_at_indices(self, var_name, indices):
+        if isinstance(indices, IndexSet):
+            return indices.take(self._values[var_name])
+        return self._values[var_name].reshape(-1).take(indices)
+
+    def set_value(self, var_name, src):
+        np.copyto(self._values[var_name],
+                  np.asarray(src).reshape(self._values[var_name].shape))
+
+    def set_value_at_indices(self, var_name, indices, src):
+        if isinstance(indices, IndexSet):
+            indices.put(self._values[var_name], src)
+        else:
+            self._values[var_name].reshape(-1)[indices] = src
+
+    def get_grid_rank(self, grid_id):
+        return len(self._shape)
+
+    def get_grid_size(self, grid_id):
+        return int(np.prod(self._shape))
+
+    def get_grid_type(self, grid_id):
+        return 'uniform_rectilinear'
+
+    def get_grid_shape(self, grid_id):
+        return np.array(self._shape)
+
+    def get_grid_spacing(self, grid_id):
+        return np.array(self._spacing)
+
+    def get_grid_origin(self, grid_id):
+        return np.array(self._origin)
+
+    def get_grid_x(self, grid_id):
+        return UniformRectilinearCoords.from_bmi(self, grid_id).axis(1)
+
+    def get_grid_y(self, grid_id):
+        return UniformRectilinearCoords.from_bmi(self, grid_id).axis(0)
@@ -0,0 +1,169 @@
+#! /usr/bin/env python
+"""Reusable sets of indices into model variables."""
+
+import numpy as np
+
+
+class IndexSet(object):
+
+    """A validated, sorted set of unique indices into a variable.
+
+    An index set is built once, from an arbitrary array of indices, and
+    can then be passed to
+    :func:`~bmi.getter_setter.BmiGetter.get_value_at_indices` and
+    :func:`~bmi.getter_setter.BmiSetter.set_value_at_indices` at every
+    time step. The indices are sorted and duplicates removed so that
+    values are always ordered by index. Runs of consecutive indices are
+    detected so that, where there are few of them, values are gathered
+    and scattered with slices rather than with fancy indexing.
+
+    Because an index set can be converted to an array, implementations
+    that index with plain arrays continue to work unchanged.
+
+    Parameters
+    ----------
+    indices : array_like of int
+      Indices into a flattened variable array.
+    size : int, optional
+      Size of the variable that is being indexed. If given, all indices
+      are checked to be less than *size*.
+
+    Raises
+    ------
+    TypeError
+      If *indices* are not integers.
+    ValueError
+      If any index is negative or out of range.
+    """
+
+    # Minimum mean run length for which slicing beats fancy indexing.
+    _MIN_RUN_LENGTH = 8
+
+    def __init__(self, indices, size=None):
+        indices = np.asarray(indices).reshape(-1)
+        if indices.size == 0:
+            indices = indices.astype(np.intp)
+        if indices.dtype.kind not in 'iu':
+            raise TypeError('indices must be integers')
+
+        indices = np.unique(indices).astype(np.intp, copy=False)
+        if len(indices) > 0:
+            if indices[0] < 0:
+                raise ValueError('indices must be non-negative')
+            if size is not None and indices[-1] >= size:
+                raise ValueError('index out of range ({index} >= '
+                                 '{size})'.format(index=indices[-1],
+                                                  size=size))
+        indices.flags.writeable = False
+
+        breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+        starts = np.concatenate(([0], breaks))
+        stops = np.concatenate((breaks, [len(indices)]))
+        if len(indices) == 0:
+            starts, stops = starts[:0], stops[:0]
+
+        self._indices = indices
+        self._size = size
+        self._runs = tuple(
+            (int(start), slice(int(indices[start]),
+                               int(indices[stop - 1]) + 1))
+            for start, stop in zip(starts, stops))
+        self._use_slices = (
+            len(self._runs) * self._MIN_RUN_LENGTH <= len(indices))
+
+    @property
+    def indices(self):
+        """The sorted, unique indices as a read-only array."""
+        return self._indices
+
+    @property
+    def size(self):
+        """Size of the indexed variable, if known."""
+        return self._size
+
+    @property
+    def slices(self):
+        """Slices, one for each run of consecutive indices."""
+        return tuple(run for _, run in self._runs)
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __iter__(self):
+        return iter(self._indices)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self._indices
+        else:
+            return self._indices.astype(dtype)
+
+    def __repr__(self):
+        return 'IndexSet({indices!r}, size={size!r})'.format(
+            indices=self._indices.tolist(), size=self._size)
+
+    def take(self, array, out=None):
+        """Get values of an array at the indices.
+
+        Parameters
+        ----------
+        array : ndarray
+          Values of a variable. Multidimensional arrays are indexed as if
+          they were flattened.
+        out : ndarray, optional
+          A buffer, of the same length as the index set, into which to
+          place the values.
+
+        Returns
+        -------
+        ndarray
+          The values at the indices. If *out* was given, this is *out*.
+        """
+        flat = np.ravel(array)
+        if out is None:
+            out = np.empty(len(self._indices), dtype=flat.dtype)
+
+        if self._use_slices:
+            for start, run in self._runs:
+                out[start:start + run.stop - run.start] = flat[run]
+        else:
+            np.take(flat, self._indices, out=out)
+
+        return out
+
+    def put(self, array, values):
+        """Set values of an array at the indices.
+
+        Parameters
+        ----------
+        array : ndarray
+          Values of a variable, which are changed in place. Multidimensional
+          arrays are indexed as if they were flattened.
+        values : array_like
+          New values, either one for each index or a single value for all
+          of them.
+
+        Raises
+        ------
+        ValueError
+          If *array* is not contiguous or the number of values does not
+          match the number of indices.
+        """
+        if not array.flags['C_CONTIGUOUS']:
+            raise ValueError('array is not contiguous')
+        flat = array.reshape(-1)
+
+        values = np.asarray(values)
+        if values.size == 1:
+            values = np.broadcast_to(values.reshape(()), (len(self), ))
+        elif values.size == len(self):
+            values = values.reshape(-1)
+        else:
+            raise ValueError('size mismatch ({actual} != {expected})'.format(
+                actual=values.size, expected=len(self)))
+
+        if self._use_slices:
+            for start, run in self._runs:
+                flat[run] = values[start:start + run.stop - run.start]
+        else:
+            flat[self._indices] = values
@@ -0,0 +1,170 @@
+#! /usr/bin/env python
+"""Interpolate a model's variables in time between coupled components."""
+
+import numpy as np
+
+from .buffers import copy_value, supports_dest, var_dtype, var_size
+
+
+class SnapshotBuffer(object):
+
+    """Recent snapshots of a variable, interpolated to any time.
+
+    A ring buffer holds the last *capacity* snapshots of a variable from a
+    provider, each recorded at the provider's current time. A consumer
+    that steps more often than the provider can then get values at its
+    own times, interpolated between the provider's snapshots, without
+    forcing the provider to step more often.
+
+    All storage is allocated when the buffer is created. Snapshots are
+    written directly into it with
+    :func:`~bmi.getter_setter.BmiGetter.get_value` so that recording a
+    snapshot allocates nothing. Models whose ``get_value`` does not accept
+    a destination buffer (see :func:`~bmi.buffers.supports_dest`) are
+    still supported, at the cost of a temporary copy.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      The model that provides the variable.
+    var_name : str
+      An output variable name, a CSDMS Standard Name.
+    capacity : int, optional
+      Number of snapshots to keep. This must be greater than *order*.
+    order : int, optional
+      Order of the interpolating polynomial: ``1`` for linear, ``2`` for
+      quadratic, and so on.
+    """
+
+    def __init__(self, bmi, var_name, capacity=2, order=1):
+        if order < 1:
+            raise ValueError('order must be at least 1')
+        if capacity <= order:
+            raise ValueError('capacity must be greater than order')
+
+        self._bmi = bmi
+        self._var_name = var_name
+        self._order = order
+
+        dtype = var_dtype(bmi, var_name)
+        self._direct = dtype.kind == 'f'
+        self._takes_dest = supports_dest(bmi)
+        if not self._direct:
+            dtype = np.dtype(float)
+        size = var_size(bmi, var_name)
+
+        self._values = np.empty((capacity, size), dtype=dtype)
+        self._times = np.empty(capacity, dtype=float)
+        self._scratch = np.empty(size, dtype=dtype)
+        self._count = 0
+        self._head = 0
+
+    @property
+    def capacity(self):
+        """Maximum number of snapshots held."""
+        return len(self._times)
+
+    @property
+    def times(self):
+        """Times of the held snapshots, oldest first."""
+        return self._times[self._order_slots()]
+
+    def __len__(self):
+        return self._count
+
+    def _order_slots(self):
+        """Slots of the held snapshots, oldest first."""
+        first = (self._head - self._count) % self.capacity
+        return (first + np.arange(self._count)) % self.capacity
+
+    def record(self):
+        """Record a snapshot of the variable at the provider's current time.
+
+        If a snapshot already exists for the current time, it is replaced.
+        Otherwise the oldest snapshot is discarded once the buffer is full.
+        """
+        time = self._bmi.get_current_time()
+
+        last = (self._head - 1) % self.capacity
+        if self._count > 0 and time == self._times[last]:
+            slot = last
+        else:
+            if self._count > 0 and time < self._times[last]:
+                raise ValueError('snapshots must be recorded in time order')
+            slot = self._head
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+        if not self._direct:
+            np.copyto(self._values[slot],
+                      np.ravel(self._bmi.get_value_ref(self._var_name)))
+        elif self._takes_dest:
+            self._bmi.get_value(self._var_name, self._values[slot])
+        else:
+            copy_value(self._bmi.get_value(self._var_name),
+                       self._values[slot])
+        self._times[slot] = time
+
+    def interpolate(self, time, out=None, extrapolate=False):
+        """Get the values of the variable at a time.
+
+        The values are interpolated with a polynomial through the
+        ``order + 1`` snapshots nearest to *time*.
+
+        Parameters
+        ----------
+        time : float
+          Time at which to get values.
+        out : ndarray, optional
+          A buffer into which to place the values.
+        extrapolate : bool, optional
+          Allow times outside of those of the held snapshots.
+
+        Returns
+        -------
+        ndarray
+          The values at *time*. If *out* was given, this is *out*.
+
+        Raises
+        ------
+        ValueError
+          If there are too few snapshots or, unless *extrapolate* is set,
+          *time* is outside of the times of the snapshots.
+        """
+        if self._count == 0:
+            raise ValueError('no snapshots have been recorded')
+
+        slots = self._order_slots()
+        times = self._times[slots]
+        if not extrapolate and not times[0] <= time <= times[-1]:
+            raise ValueError('time is outside of recorded times ({time} '
+                             'not in [{start}, {stop}])'.format(
+                                 time=time, start=times[0], stop=times[-1]))
+
+        if out is None:
+            out = np.empty(self._values.shape[1], dtype=self._values.dtype)
+
+        n_points = min(self._order + 1, self._count)
+        start = np.searchsorted(times, time) - n_points // 2
+        start = max(0, min(start, self._count - n_points))
+        points = slice(start, start + n_points)
+
+        weights = _lagrange_weights(times[points], time)
+        for n, (slot, weight) in enumerate(zip(slots[points], weights)):
+            if n == 0:
+                np.multiply(self._values[slot], weight, out=out)
+            else:
+                np.multiply(self._values[slot], weight, out=self._scratch)
+                out += self._scratch
+
+        return out
+
+
+def _lagrange_weights(times, time):
+    """Weights of the Lagrange polynomial through times, evaluated at time."""
+    weights = np.ones(len(times))
+    for i in range(len(times)):
+        for j in range(len(times)):
+            if i != j:
+                weights[i] *= (time - times[j]) / (times[i] - times[j])
+    return weights
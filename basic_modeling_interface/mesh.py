@@ -0,0 +1,284 @@
+#! /usr/bin/env python
+"""Compressed sparse row topology of unstructured grids."""
+
+import numpy as np
+
+
+def _index_dtype(max_value):
+    """Smallest signed integer type able to hold indices up to max_value."""
+    if max_value < np.iinfo(np.int32).max:
+        return np.dtype(np.int32)
+    else:
+        return np.dtype(np.int64)
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+def _csr_from_pairs(rows, cols, n_rows):
+    """Build CSR index arrays from (row, col) pairs sorted by row."""
+    indptr = np.zeros(n_rows + 1, dtype=_index_dtype(len(cols)))
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols
+
+
+class CsrMesh(object):
+
+    """Topology of an unstructured grid in compressed sparse row form.
+
+    A mesh is built from the connectivity and offset arrays of an
+    unstructured grid, as given by
+    :func:`~bmi.grid_unstructured.BmiGridUnstructured.get_grid_connectivity`
+    and :func:`~bmi.grid_unstructured.BmiGridUnstructured.get_grid_offset`.
+    The nodes of cell *i* are ``indices[indptr[i]:indptr[i + 1]]``, listed
+    in order around the cell.
+
+    Derived topology (node-to-cell and cell-to-cell adjacency and the edges
+    of the mesh) is computed, with vectorized operations, the first time
+    it is needed and is then kept. All index arrays are read-only and use
+    32-bit integers unless the mesh is too large for them.
+
+    Parameters
+    ----------
+    connectivity : array_like of int
+      Nodes of each cell, concatenated.
+    offset : array_like of int
+      Position in *connectivity* of the end of each cell. A leading zero,
+      marking the start of the first cell, is optional.
+    n_nodes : int, optional
+      Number of nodes in the mesh. If not given, this is one more than the
+      largest node index in *connectivity*.
+
+    Raises
+    ------
+    ValueError
+      If the offsets are not consistent with the connectivity.
+    """
+
+    def __init__(self, connectivity, offset, n_nodes=None):
+        connectivity = np.asarray(connectivity).reshape(-1)
+        offset = np.asarray(offset).reshape(-1)
+
+        if len(offset) == 0 or offset[0] != 0:
+            offset = np.concatenate(([0], offset))
+        if offset[-1] != len(connectivity):
+            raise ValueError('last offset does not match length of '
+                             'connectivity ({actual} != {expected})'.format(
+                                 actual=offset[-1],
+                                 expected=len(connectivity)))
+        if np.any(np.diff(offset) < 0):
+            raise ValueError('offsets must not decrease')
+
+        if n_nodes is None:
+            n_nodes = int(connectivity.max()) + 1 if len(connectivity) else 0
+        elif len(connectivity) and connectivity.max() >= n_nodes:
+            raise ValueError('node index out of range')
+
+        dtype = _index_dtype(max(n_nodes, len(connectivity)))
+
+        self._n_nodes = int(n_nodes)
+        self._indptr = _read_only(offset.astype(dtype))
+        self._indices = _read_only(connectivity.astype(dtype))
+
+        self._node_cells = None
+        self._edges = None
+        self._cell_edges = None
+        self._cell_cells = None
+
+    @classmethod
+    def from_bmi(cls, bmi, grid_id):
+        """Build the mesh of a model's unstructured grid.
+
+        Parameters
+        ----------
+        bmi : Bmi
+          A model that implements the Basic Model Interface.
+        grid_id : int
+          Identifier of an unstructured grid.
+
+        Returns
+        -------
+        CsrMesh
+          The topology of the grid.
+        """
+        return cls(bmi.get_grid_connectivity(grid_id),
+                   bmi.get_grid_offset(grid_id),
+                   n_nodes=bmi.get_grid_size(grid_id))
+
+    @property
+    def n_nodes(self):
+        """Number of nodes."""
+        return self._n_nodes
+
+    @property
+    def n_cells(self):
+        """Number of cells."""
+        return len(self._indptr) - 1
+
+    @property
+    def n_edges(self):
+        """Number of unique edges."""
+        return len(self.edges)
+
+    @property
+    def indptr(self):
+        """Start of each cell in :attr:`indices`, and the end of the last."""
+        return self._indptr
+
+    @property
+    def indices(self):
+        """Nodes of each cell, concatenated."""
+        return self._indices
+
+    @property
+    def nodes_per_cell(self):
+        """Number of nodes of each cell."""
+        return np.diff(self._indptr)
+
+    def nodes_of_cell(self, cell):
+        """Get the nodes of a cell.
+
+        Parameters
+        ----------
+        cell : int
+          A cell index.
+
+        Returns
+        -------
+        ndarray of int
+          The nodes of the cell, in order around the cell.
+        """
+        return self._indices[self._indptr[cell]:self._indptr[cell + 1]]
+
+    @property
+    def node_cells(self):
+        """Cells that share each node, as CSR ``(indptr, indices)``."""
+        if self._node_cells is None:
+            cells = self._entry_cells()
+            order = np.argsort(self._indices, kind='mergesort')
+            indptr, indices = _csr_from_pairs(self._indices[order],
+                                              cells[order], self.n_nodes)
+            self._node_cells = (_read_only(indptr), _read_only(indices))
+        return self._node_cells
+
+    def cells_of_node(self, node):
+        """Get the cells that share a node.
+
+        Parameters
+        ----------
+        node : int
+          A node index.
+
+        Returns
+        -------
+        ndarray of int
+          The cells, in increasing order.
+        """
+        indptr, indices = self.node_cells
+        return indices[indptr[node]:indptr[node + 1]]
+
+    @property
+    def edges(self):
+        """Unique edges, as pairs of nodes, with the smaller node first."""
+        if self._edges is None:
+            self._build_edges()
+        return self._edges
+
+    @property
+    def cell_edges(self):
+        """Edges of each cell, with the same ``indptr`` as the cells."""
+        if self._cell_edges is None:
+            self._build_edges()
+        return self._indptr, self._cell_edges
+
+    @property
+    def cell_cells(self):
+        """Cells that share an edge with each cell, as CSR."""
+        if self._cell_cells is None:
+            self._build_cell_cells()
+        return self._cell_cells
+
+    def neighbors_of_cell(self, cell):
+        """Get the cells that share an edge with a cell.
+
+        Parameters
+        ----------
+        cell : int
+          A cell index.
+
+        Returns
+        -------
+        ndarray of int
+          The neighboring cells, in increasing order.
+        """
+        indptr, indices = self.cell_cells
+        return indices[indptr[cell]:indptr[cell + 1]]
+
+    def _entry_cells(self):
+        """Cell of each entry of the connectivity array."""
+        return np.repeat(np.arange(self.n_cells, dtype=self._indices.dtype),
+                         self.nodes_per_cell)
+
+    def _build_edges(self):
+        n_entries = len(self._indices)
+
+        # Each node is joined to the next one around its cell, with the
+        # last node of a cell joined back to the first.
+        following = np.arange(1, n_entries + 1)
+        starts, stops = self._indptr[:-1], self._indptr[1:]
+        not_empty = stops > starts
+        following[stops[not_empty] - 1] = starts[not_empty]
+
+        first = self._indices.astype(np.int64)
+        second = first[following]
+        lower, upper = np.minimum(first, second), np.maximum(first, second)
+
+        keys = lower * max(self.n_nodes, 1) + upper
+        unique_keys, edge_ids = np.unique(keys, return_inverse=True)
+
+        dtype = self._indices.dtype
+        edges = np.empty((len(unique_keys), 2), dtype=dtype)
+        edges[:, 0] = unique_keys // max(self.n_nodes, 1)
+        edges[:, 1] = unique_keys % max(self.n_nodes, 1)
+
+        self._edges = _read_only(edges)
+        self._cell_edges = _read_only(
+            edge_ids.reshape(-1).astype(_index_dtype(len(unique_keys))))
+
+    def _build_cell_cells(self):
+        _, edge_ids = self.cell_edges
+        cells = self._entry_cells()
+
+        order = np.argsort(edge_ids, kind='mergesort')
+        edge_ids, cells = edge_ids[order], cells[order]
+
+        # Cells that share an edge are adjacent after sorting by edge.
+        # Almost all edges are shared by at most two cells but, for
+        # non-manifold meshes, pair cells further apart too.
+        pairs = []
+        shift = 1
+        while shift < len(edge_ids):
+            same = edge_ids[shift:] == edge_ids[:-shift]
+            if not np.any(same):
+                break
+            pairs.append((cells[:-shift][same], cells[shift:][same]))
+            shift += 1
+
+        if pairs:
+            left = np.concatenate([pair[0] for pair in pairs])
+            right = np.concatenate([pair[1] for pair in pairs])
+        else:
+            left = right = cells[:0]
+        left, right = (np.concatenate((left, right)),
+                       np.concatenate((right, left)))
+
+        keep = left != right
+        keys = np.unique(left[keep].astype(np.int64) * max(self.n_cells, 1) +
+                         right[keep])
+        rows = keys // max(self.n_cells, 1)
+        cols = (keys % max(self.n_cells, 1)).astype(self._indices.dtype)
+
+        indptr, indices = _csr_from_pairs(rows, cols, self.n_cells)
+        self._cell_cells = (_read_only(indptr), _read_only(indices))
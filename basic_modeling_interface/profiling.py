@@ -0,0 +1,197 @@
+#! /usr/bin/env python
+"""A mixin that profiles calls through the Basic Model Interface."""
+
+import csv
+import json
+import os
+import threading
+from timeit import default_timer
+
+from .bmi import Bmi
+
+
+def _call_key(name, args):
+    """Key under which to aggregate a call: the method and its subject."""
+    if name == 'get_values':
+        # Batched calls are keyed by method alone; the default
+        # implementation also records a call for each variable.
+        return name, None
+    if args and (name.startswith('get_var_') or name.startswith('get_grid_')
+                 or name.startswith('get_value') or
+                 name.startswith('set_value')):
+        try:
+            hash(args[0])
+        except TypeError:
+            return name, None
+        return name, args[0]
+    return name, None
+
+
+def _bytes_moved(name, args, kwds, result):
+    """Bytes of variable data moved by a call to a getter or setter."""
+    if name == 'get_values':
+        # Counted by the calls to get_value that gather the values.
+        return 0
+    elif name == 'get_value_ref':
+        # A reference to the model's memory; nothing is copied.
+        return 0
+    elif name.startswith('set_value'):
+        src = kwds.get('src', args[-1] if len(args) > 1 else None)
+        return getattr(src, 'nbytes', 0)
+    elif name.startswith('get_value') and result is not None:
+        if isinstance(result, dict):
+            return sum(getattr(value, 'nbytes', 0)
+                       for value in result.values())
+        return getattr(result, 'nbytes', 0)
+    return 0
+
+
+def _profiled_method(name):
+    def method(self, *args, **kwds):
+        start = default_timer()
+        result = None
+        try:
+            result = getattr(super(BmiProfiler, self), name)(*args, **kwds)
+            return result
+        finally:
+            elapsed = default_timer() - start
+            self._record_call(name, args, start, elapsed,
+                              _bytes_moved(name, args, kwds, result))
+
+    method.__name__ = name
+    method.__doc__ = 'Profiled version of :func:`{name}`.'.format(name=name)
+    return method
+
+
+class BmiProfiler(object):
+
+    """Profile the calls of a model's interface.
+
+    Every method of :class:`~bmi.bmi.Bmi` is wrapped with a timer. Calls
+    are aggregated by method and, for methods that take a variable name or
+    grid identifier, by variable or grid. The number of bytes of variable
+    data copied by the getters and setters is also counted; references
+    from :func:`~bmi.getter_setter.BmiGetter.get_value_ref` count as none.
+    This makes it possible to tell whether a coupled run spends its time
+    in :func:`~bmi.base.BmiBase.update` or in exchanging data.
+
+    Use this class as a mixin, listed before the model class::
+
+        class ProfiledModel(BmiProfiler, Model):
+            pass
+
+    Set :attr:`profile_trace` to record each call as an event, for export
+    as a Chrome trace.
+    """
+
+    #: Record every call, as well as aggregate statistics.
+    profile_trace = False
+
+    def _profile_state(self):
+        try:
+            return self._profile
+        except AttributeError:
+            self._profile = {'calls': {}, 'events': [],
+                             'origin': default_timer()}
+            return self._profile
+
+    def _record_call(self, name, args, start, elapsed, nbytes):
+        profile = self._profile_state()
+        key = _call_key(name, args)
+        try:
+            stats = profile['calls'][key]
+        except KeyError:
+            profile['calls'][key] = [1, elapsed, elapsed, elapsed, nbytes]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed < stats[2]:
+                stats[2] = elapsed
+            if elapsed > stats[3]:
+                stats[3] = elapsed
+            stats[4] += nbytes
+
+        if self.profile_trace:
+            profile['events'].append((key, start, elapsed, nbytes,
+                                      threading.current_thread().ident))
+
+    def reset_profile(self):
+        """Discard all profiling statistics and events."""
+        try:
+            del self._profile
+        except AttributeError:
+            pass
+
+    def profile_stats(self):
+        """Get aggregated profiling statistics.
+
+        Returns
+        -------
+        dict
+          Statistics keyed by ``(method, subject)``, where *subject* is the
+          variable name or grid identifier passed to the method, or
+          ``None``. Each is a ``dict`` with the number of calls,
+          ``count``, the ``total``, ``mean``, ``min`` and ``max`` times,
+          in seconds, and the number of bytes of variable data moved,
+          ``nbytes``.
+        """
+        stats = {}
+        for key, (count, total, fastest, slowest, nbytes) in (
+                self._profile_state()['calls'].items()):
+            stats[key] = {'count': count, 'total': total,
+                          'mean': total / count, 'min': fastest,
+                          'max': slowest, 'nbytes': nbytes}
+        return stats
+
+    def write_profile_csv(self, filename):
+        """Write aggregated profiling statistics as CSV.
+
+        Parameters
+        ----------
+        filename : str
+          Path to the output file.
+        """
+        fields = ('count', 'total', 'mean', 'min', 'max', 'nbytes')
+        stats = self.profile_stats()
+        with open(filename, 'w') as fp:
+            writer = csv.writer(fp, lineterminator=os.linesep)
+            writer.writerow(('method', 'subject') + fields)
+            for key in sorted(stats, key=str):
+                method, subject = key
+                writer.writerow(
+                    (method, '' if subject is None else subject) +
+                    tuple(stats[key][field] for field in fields))
+
+    def write_chrome_trace(self, filename):
+        """Write recorded calls in the Chrome trace event format.
+
+        The file can be loaded into ``chrome://tracing`` or Perfetto.
+        Only calls made while :attr:`profile_trace` was set are recorded.
+
+        Parameters
+        ----------
+        filename : str
+          Path to the output file.
+        """
+        profile = self._profile_state()
+        pid = os.getpid()
+
+        events = []
+        for (method, subject), start, elapsed, nbytes, tid in (
+                profile['events']):
+            args = {'nbytes': nbytes}
+            if subject is not None:
+                args['subject'] = str(subject)
+            events.append({
+                'name': method, 'cat': 'bmi', 'ph': 'X', 'pid': pid,
+                'tid': tid, 'ts': (start - profile['origin']) * 1e6,
+                'dur': elapsed * 1e6, 'args': args})
+
+        with open(filename, 'w') as fp:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, fp)
+
+
+for _name in dir(Bmi):
+    if not _name.startswith('_'):
+        setattr(BmiProfiler, _name, _profiled_method(_name))
+del _name
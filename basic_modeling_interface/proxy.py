@@ -0,0 +1,293 @@
+#! /usr/bin/env python
+"""Run a model in a separate process behind the Basic Model Interface."""
+
+import multiprocessing
+import pickle
+import threading
+import traceback
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+try:
+    from multiprocessing import resource_tracker
+except ImportError:
+    resource_tracker = None
+
+from .bmi import Bmi
+from .buffers import copy_value, get_value_into, var_dtype, var_shape
+from .forwarding import forward_methods
+
+
+class RemoteError(RuntimeError):
+
+    """An exception raised in the child process that could not be sent."""
+
+    pass
+
+
+class _SharedArrayBase(object):
+
+    """Keep a shared memory segment mapped while arrays refer to it."""
+
+    def __init__(self, segment, shape, dtype):
+        self._segment = segment
+        self.__array_interface__ = {
+            'data': (np.frombuffer(segment.buf, dtype=np.uint8).ctypes.data,
+                     False),
+            'shape': tuple(shape), 'typestr': np.dtype(dtype).str,
+            'version': 3}
+
+
+def _serve(cls, conn):
+    """Serve calls to a model over a connection until told to stop."""
+    bmi = cls()
+    segments = {}
+
+    def attach(var_name, segment_name, dtype, shape):
+        detach(var_name)
+        segment = shared_memory.SharedMemory(name=segment_name)
+        segments[var_name] = (segment, np.ndarray(shape, dtype=dtype,
+                                                  buffer=segment.buf))
+
+    def detach(var_name):
+        if var_name in segments:
+            segment, _ = segments.pop(var_name)
+            segment.close()
+
+    def copy_out(var_name):
+        get_value_into(bmi, var_name, segments[var_name][1].reshape(-1))
+
+    def copy_in(var_name):
+        bmi.set_value(var_name, segments[var_name][1])
+
+    commands = {'_attach': attach, '_detach': detach, '_copy_out': copy_out,
+                '_copy_in': copy_in}
+
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            method, args, kwds = message
+            try:
+                if method in commands:
+                    result = commands[method](*args, **kwds)
+                else:
+                    result = getattr(bmi, method)(*args, **kwds)
+            except Exception as error:
+                try:
+                    conn.send(('error', pickle.dumps(error)))
+                except Exception:
+                    conn.send(('error', pickle.dumps(
+                        RemoteError(traceback.format_exc()))))
+            else:
+                conn.send(('ok', result))
+    finally:
+        for var_name in list(segments):
+            detach(var_name)
+        conn.close()
+
+
+class BmiProxy(Bmi):
+
+    """A model that runs in a child process.
+
+    Every method of the interface is forwarded, over a pipe, to an
+    instance of *cls* running in a child process. This isolates a model
+    that leaks memory or is not thread-safe from the calling process.
+
+    Variable values do not go through the pipe. Each variable that is
+    exchanged is given a segment of shared memory, sized from
+    :func:`~bmi.vars.BmiVars.get_var_nbytes`. The child copies values
+    into the segment with :func:`~bmi.getter_setter.BmiGetter.get_value`
+    and out of it with :func:`~bmi.getter_setter.BmiSetter.set_value`, so
+    that an exchange costs a memory copy but no serialization.
+
+    Because the model's memory is in another process,
+    :func:`get_value_ref` returns a read-only array backed by the shared
+    segment that is refreshed with the model's values on every call. It
+    does not meet the zero-copy contract, as writes could not reach the
+    model, so values must be changed with :func:`set_value`. It is no
+    longer updated after :func:`release_buffers` or :func:`close`.
+
+    Parameters
+    ----------
+    cls : type
+      A class that implements the Basic Model Interface. It must be
+      picklable if processes are started with *spawn*.
+    context : multiprocessing context, optional
+      Context used to start the child process.
+
+    Examples
+    --------
+    A proxy is a context manager that stops the child process on exit::
+
+        with BmiProxy(Model) as bmi:
+            bmi.initialize('model.yaml')
+            bmi.update()
+            bmi.finalize()
+    """
+
+    def __init__(self, cls, context=None):
+        if shared_memory is None:
+            raise RuntimeError('proxies require multiprocessing.'
+                               'shared_memory (Python 3.8 or later)')
+        context = context or multiprocessing
+
+        # The child must share this process's resource tracker so that
+        # segments it attaches to are not unlinked when it exits.
+        if resource_tracker is not None:
+            resource_tracker.ensure_running()
+
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_serve, args=(cls, child_conn))
+        self._process.daemon = True
+        self._process.start()
+        child_conn.close()
+
+        self._lock = threading.Lock()
+        self._segments = {}
+
+    def _call(self, method, *args, **kwds):
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError('proxy is closed')
+            self._conn.send((method, args, kwds))
+            status, result = self._conn.recv()
+        if status == 'error':
+            raise pickle.loads(result)
+        return result
+
+    def _segment(self, var_name):
+        """Get the shared memory of a variable, creating it if needed."""
+        try:
+            return self._segments[var_name][1]
+        except KeyError:
+            pass
+
+        dtype, shape = var_dtype(self, var_name), var_shape(self, var_name)
+        segment = shared_memory.SharedMemory(
+            create=True,
+            size=max(dtype.itemsize * int(np.prod(shape)), 1))
+        array = np.asarray(_SharedArrayBase(segment, shape, dtype))
+        view = array.view()
+        view.flags.writeable = False
+        self._segments[var_name] = (segment, array, view)
+        try:
+            self._call('_attach', var_name, segment.name, dtype.str, shape)
+        except Exception:
+            self._release(var_name)
+            raise
+
+        return array
+
+    def _release(self, var_name):
+        # Arrays returned by get_value_ref may still refer to the segment so
+        # it is not closed here. It is unmapped once they are all gone.
+        segment = self._segments.pop(var_name)[0]
+        segment.unlink()
+
+    def release_buffers(self):
+        """Release the shared memory of all variables.
+
+        Call this if the sizes of the model's variables change. New
+        segments are created, as needed, by the next exchange.
+        """
+        for var_name in list(self._segments):
+            if self._conn is not None:
+                self._call('_detach', var_name)
+            self._release(var_name)
+
+    def initialize(self, filename):
+        """Initialize the model in the child process.
+
+        Parameters
+        ----------
+        filename : str, optional
+          The path to the model configuration file.
+        """
+        self.release_buffers()
+        return self._call('initialize', filename)
+
+    def get_value(self, var_name, dest=None):
+        """Get a copy of values of the given variable.
+
+        Parameters
+        ----------
+        var_name : str
+          An input or output variable name, a CSDMS Standard Name.
+        dest : ndarray, optional
+          A preallocated, contiguous array into which to place the values.
+
+        Returns
+        -------
+        ndarray
+          The value of the variable. If *dest* was given, this is *dest*.
+        """
+        array = self._segment(var_name)
+        self._call('_copy_out', var_name)
+        if dest is None:
+            return array.reshape(-1).copy()
+        return copy_value(array, dest)
+
+    def get_value_ref(self, var_name):
+        """Get the values of the given variable in shared memory.
+
+        Parameters
+        ----------
+        var_name : str
+          An input or output variable name, a CSDMS Standard Name.
+
+        Returns
+        -------
+        ndarray
+          A read-only array, backed by shared memory, that holds the
+          current values of the variable.
+        """
+        self._segment(var_name)
+        self._call('_copy_out', var_name)
+        return self._segments[var_name][2]
+
+    def set_value(self, var_name, src):
+        """Specify a new value for a model variable.
+
+        Parameters
+        ----------
+        var_name : str
+          An input or output variable name, a CSDMS Standard Name.
+        src : array_like
+          The new value for the specified variable.
+        """
+        array = self._segment(var_name)
+        src = np.asarray(src)
+        if not (src.ctypes.data == array.ctypes.data and
+                src.nbytes == array.nbytes):
+            copy_value(src, array)
+        self._call('_copy_in', var_name)
+
+    def close(self):
+        """Stop the child process and release shared memory."""
+        if self._conn is None:
+            return
+        try:
+            self.release_buffers()
+            with self._lock:
+                self._conn.send(None)
+        finally:
+            self._process.join()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+forward_methods(BmiProxy, 'Call :func:`{name}` in the child process.')
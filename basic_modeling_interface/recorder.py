@@ -0,0 +1,267 @@
+#! /usr/bin/env python
+"""Record a model's output variables to disk as it runs."""
+
+import json
+import os
+import threading
+
+import numpy as np
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from .buffers import copy_value, get_value_into, var_dtype, var_shape
+
+
+#: Name of the file that describes a recording.
+INDEX_FILE = 'index.json'
+
+#: Name of the file that holds the time of each record, as float64.
+TIMES_FILE = 'times.bin'
+
+#: Version of the recording format.
+FORMAT_VERSION = 1
+
+_GRID_SCALARS = ('get_grid_type', 'get_grid_rank', 'get_grid_size')
+_GRID_VECTORS = ('get_grid_shape', 'get_grid_spacing', 'get_grid_origin')
+_GRID_ARRAYS = ('get_grid_x', 'get_grid_y', 'get_grid_z',
+                'get_grid_connectivity', 'get_grid_offset')
+
+
+def _call_if_implemented(method, *args):
+    try:
+        return method(*args)
+    except NotImplementedError:
+        return None
+
+
+def _as_float(value):
+    return None if value is None else float(value)
+
+
+def _grid_metadata(bmi, grid_id, path):
+    """Describe a grid, saving its coordinate arrays to *path*."""
+    metadata = {}
+    for name in _GRID_SCALARS:
+        value = _call_if_implemented(getattr(bmi, name), grid_id)
+        if value is not None:
+            metadata[name[len('get_grid_'):]] = (
+                str(value) if name == 'get_grid_type' else int(value))
+    for name in _GRID_VECTORS:
+        value = _call_if_implemented(getattr(bmi, name), grid_id)
+        if value is not None:
+            metadata[name[len('get_grid_'):]] = np.asarray(value).tolist()
+    for name in _GRID_ARRAYS:
+        value = _call_if_implemented(getattr(bmi, name), grid_id)
+        if value is not None:
+            filename = 'grid{id}_{name}.npy'.format(
+                id=grid_id, name=name[len('get_grid_'):])
+            np.save(os.path.join(path, filename), np.asarray(value))
+            metadata[name[len('get_grid_'):]] = filename
+    return metadata
+
+
+class OutputRecorder(object):
+
+    """Write snapshots of a model's variables to disk in the background.
+
+    Each call to :func:`record` copies the current values of the
+    variables, from :func:`~bmi.getter_setter.BmiGetter.get_value_ref`,
+    into one of two staging buffers and hands it to a writer thread. The
+    model can then be updated while the snapshot is written; it waits only
+    if both buffers are still being written.
+
+    A recording is a directory that holds:
+
+    ``index.json``
+      The component name, time units and time step, the metadata of each
+      variable (type, units, itemsize, nbytes, grid, shape and data file)
+      and of each grid, written once.
+    ``times.bin``
+      The time of each record, as native float64.
+    ``var<n>.bin``
+      The values of each variable, one record after another in native
+      byte order, appended as they are recorded.
+    ``grid<id>_<name>.npy``
+      Coordinate and connectivity arrays of the grids, where the model
+      provides them.
+
+    A record is complete once its time has been written, so the number of
+    records is the size of ``times.bin`` divided by eight. Recordings can
+    be played back with :class:`~bmi.replay.BmiReplay`. Any existing
+    recording in the directory is replaced.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      An initialized model.
+    var_names : iterable of str
+      Names of the variables to record.
+    path : str
+      Directory in which to write the recording.
+    every : int, optional
+      Record every *every* calls to :func:`update`.
+    component : str, optional
+      Name of the component. If not given, use
+      :func:`~bmi.info.BmiInfo.get_component_name`.
+
+    Examples
+    --------
+    Record a model's output every ten steps::
+
+        with OutputRecorder(model, ['plate_surface__temperature'], 'out',
+                            every=10) as recorder:
+            while model.get_current_time() < model.get_end_time():
+                recorder.update()
+    """
+
+    def __init__(self, bmi, var_names, path, every=1, component=None):
+        self._bmi = bmi
+        self._var_names = tuple(var_names)
+        self._path = path
+        self._every = int(every)
+        self._n_updates = 0
+        self._n_records = 0
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        if component is None:
+            component = _call_if_implemented(bmi.get_component_name)
+
+        variables, grids = {}, {}
+        for n, name in enumerate(self._var_names):
+            grid = bmi.get_var_grid(name)
+            variables[name] = {
+                'type': str(var_dtype(bmi, name)),
+                'units': bmi.get_var_units(name),
+                'itemsize': int(bmi.get_var_itemsize(name)),
+                'nbytes': int(bmi.get_var_nbytes(name)),
+                'grid': None if grid is None else int(grid),
+                'shape': [int(dim) for dim in var_shape(bmi, name)],
+                'file': 'var{n}.bin'.format(n=n),
+            }
+            if grid is not None and str(grid) not in grids:
+                grids[str(grid)] = _grid_metadata(bmi, grid, path)
+
+        index = {
+            'format': 'bmi-recording',
+            'version': FORMAT_VERSION,
+            'component': component,
+            'time_units': _call_if_implemented(bmi.get_time_units),
+            'start_time': _as_float(_call_if_implemented(bmi.get_start_time)),
+            'time_step': _as_float(_call_if_implemented(bmi.get_time_step)),
+            'input_var_names': [
+                name for name in bmi.get_input_var_names() or ()
+                if name in variables],
+            'output_var_names': [
+                name for name in bmi.get_output_var_names() or ()
+                if name in variables],
+            'vars': variables,
+            'grids': grids,
+        }
+        with open(os.path.join(path, INDEX_FILE), 'w') as fp:
+            json.dump(index, fp, indent=2, sort_keys=True)
+
+        self._files = [
+            open(os.path.join(path, variables[name]['file']), 'wb')
+            for name in self._var_names]
+        self._times_file = open(os.path.join(path, TIMES_FILE), 'wb')
+
+        self._staging = [
+            [np.empty(variables[name]['nbytes'] //
+                      variables[name]['itemsize'],
+                      dtype=variables[name]['type'])
+             for name in self._var_names]
+            for _ in range(2)]
+        self._times = [np.empty(1, dtype=np.float64) for _ in range(2)]
+
+        self._free = queue.Queue()
+        self._pending = queue.Queue()
+        for slot in range(2):
+            self._free.put(slot)
+
+        self._error = None
+        self._writer = threading.Thread(target=self._write)
+        self._writer.daemon = True
+        self._writer.start()
+
+    @property
+    def path(self):
+        """Directory of the recording."""
+        return self._path
+
+    @property
+    def record_count(self):
+        """Number of snapshots taken so far."""
+        return self._n_records
+
+    def _write(self):
+        while True:
+            slot = self._pending.get()
+            if slot is None:
+                break
+            try:
+                if self._error is None:
+                    for fp, values in zip(self._files, self._staging[slot]):
+                        values.tofile(fp)
+                        fp.flush()
+                    self._times[slot].tofile(self._times_file)
+                    self._times_file.flush()
+            except Exception as error:
+                self._error = error
+            finally:
+                self._free.put(slot)
+
+    def _check_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def record(self):
+        """Take a snapshot of the variables at the model's current time."""
+        self._check_error()
+        if self._writer is None:
+            raise ValueError('recorder is closed')
+
+        slot = self._free.get()
+        try:
+            for name, values in zip(self._var_names, self._staging[slot]):
+                ref = self._bmi.get_value_ref(name)
+                if ref is None:
+                    get_value_into(self._bmi, name, values)
+                else:
+                    copy_value(ref, values)
+            self._times[slot][0] = self._bmi.get_current_time()
+        except Exception:
+            self._free.put(slot)
+            raise
+
+        self._pending.put(slot)
+        self._n_records += 1
+
+    def update(self):
+        """Update the model by one time step, recording as scheduled."""
+        self._bmi.update()
+        self._n_updates += 1
+        if self._n_updates % self._every == 0:
+            self.record()
+
+    def close(self):
+        """Wait for pending snapshots to be written and close the files."""
+        if self._writer is None:
+            return
+
+        self._pending.put(None)
+        self._writer.join()
+        self._writer = None
+        for fp in self._files + [self._times_file]:
+            fp.close()
+        self._check_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,178 @@
+#! /usr/bin/env python
+"""A registry of a model's input and output variables."""
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from .buffers import var_dtype
+
+
+class VarInfo(object):
+
+    """Immutable metadata for a single variable.
+
+    Parameters
+    ----------
+    name : str
+      The variable name, a CSDMS Standard Name.
+    dtype : numpy.dtype
+      Data type of the variable.
+    units : str
+      Units of the variable.
+    itemsize : int
+      Size, in bytes, of each element of the variable.
+    nbytes : int
+      Size, in bytes, of the variable.
+    grid : int
+      Identifier of the variable's grid.
+    role : {'in', 'out', 'inout'}
+      Whether the variable is an input, an output or both.
+    """
+
+    __slots__ = ('name', 'dtype', 'units', 'itemsize', 'nbytes', 'grid',
+                 'role')
+
+    def __init__(self, name, dtype, units, itemsize, nbytes, grid, role):
+        for attr, value in zip(self.__slots__, (name, dtype, units, itemsize,
+                                                nbytes, grid, role)):
+            object.__setattr__(self, attr, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('VarInfo is read-only')
+
+    def __delattr__(self, name):
+        raise AttributeError('VarInfo is read-only')
+
+    def __eq__(self, other):
+        if not isinstance(other, VarInfo):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr)
+                   for attr in self.__slots__)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, attr) for attr in self.__slots__))
+
+    def __repr__(self):
+        return 'VarInfo({0})'.format(', '.join(
+            '{0}={1!r}'.format(attr, getattr(self, attr))
+            for attr in self.__slots__))
+
+    @property
+    def size(self):
+        """Number of elements of the variable."""
+        return self.nbytes // self.itemsize
+
+    @property
+    def is_input(self):
+        """``True`` if the variable is an input variable."""
+        return self.role in ('in', 'inout')
+
+    @property
+    def is_output(self):
+        """``True`` if the variable is an output variable."""
+        return self.role in ('out', 'inout')
+
+
+class VarRegistry(Mapping):
+
+    """An immutable registry of a model's variables.
+
+    The registry maps variable names to :class:`VarInfo` records. Build it
+    once, with :func:`from_bmi`, after a model has been initialized and
+    then use it in place of repeated calls to the
+    :class:`~bmi.vars.BmiVars` methods.
+
+    Parameters
+    ----------
+    infos : iterable of VarInfo
+      Metadata for each variable.
+    """
+
+    def __init__(self, infos):
+        infos = tuple(infos)
+        self._infos = dict((info.name, info) for info in infos)
+        self._inputs = tuple(info.name for info in infos if info.is_input)
+        self._outputs = tuple(info.name for info in infos if info.is_output)
+
+    @classmethod
+    def from_bmi(cls, bmi):
+        """Build a registry from a model's metadata.
+
+        Parameters
+        ----------
+        bmi : Bmi
+          An initialized model that implements the Basic Model Interface.
+
+        Returns
+        -------
+        VarRegistry
+          A registry of the model's input and output variables.
+        """
+        inputs = tuple(bmi.get_input_var_names() or ())
+        outputs = tuple(bmi.get_output_var_names() or ())
+
+        names = inputs + tuple(name for name in outputs if name not in inputs)
+        infos = []
+        for name in names:
+            if name in inputs and name in outputs:
+                role = 'inout'
+            elif name in inputs:
+                role = 'in'
+            else:
+                role = 'out'
+            infos.append(VarInfo(name, var_dtype(bmi, name),
+                                 bmi.get_var_units(name),
+                                 bmi.get_var_itemsize(name),
+                                 bmi.get_var_nbytes(name),
+                                 bmi.get_var_grid(name), role))
+
+        return cls(infos)
+
+    @property
+    def input_var_names(self):
+        """Names of the input variables."""
+        return self._inputs
+
+    @property
+    def output_var_names(self):
+        """Names of the output variables."""
+        return self._outputs
+
+    @property
+    def grids(self):
+        """Identifiers of the grids on which variables are defined."""
+        return tuple(sorted(set(info.grid for info in self._infos.values())))
+
+    def vars_on_grid(self, grid_id):
+        """Get the names of the variables defined on a grid.
+
+        Parameters
+        ----------
+        grid_id : int
+          A grid identifier.
+
+        Returns
+        -------
+        tuple of str
+          Names of the variables on the grid.
+        """
+        return tuple(name for name, info in self._infos.items()
+                     if info.grid == grid_id)
+
+    def __getitem__(self, name):
+        return self._infos[name]
+
+    def __iter__(self):
+        return iter(self._infos)
+
+    def __len__(self):
+        return len(self._infos)
+
+    def __repr__(self):
+        return 'VarRegistry({0!r})'.format(list(self._infos.values()))
@@ -0,0 +1,420 @@
+#! /usr/bin/env python
+"""Regrid values between the grids of coupled models."""
+
+import hashlib
+import os
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+from .buffers import copy_value
+from .coords import UniformRectilinearCoords
+
+
+METHODS = ('nearest', 'bilinear', 'conservative')
+
+#: Number of destination points compared at once by the brute-force search.
+_NEAREST_CHUNK_SIZE = 1024
+
+# For Python 2, which has no os.replace.
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _node_coords(bmi, grid_id, rank):
+    """Get the node coordinates of a grid, ordered with "ij" indexing."""
+    names = ('get_grid_z', 'get_grid_y', 'get_grid_x')[3 - rank:]
+    return tuple(np.asarray(getattr(bmi, name)(grid_id),
+                            dtype=float).reshape(-1) for name in names)
+
+
+class _Grid(object):
+
+    """Geometry of a model's grid, read through the grid getters."""
+
+    def __init__(self, bmi, grid_id):
+        self.type = bmi.get_grid_type(grid_id)
+        self.rank = bmi.get_grid_rank(grid_id)
+        self.coords = None
+
+        if self.type == 'uniform_rectilinear':
+            self.coords = UniformRectilinearCoords.from_bmi(bmi, grid_id)
+            self.axes = tuple(self.coords.axis(dim)
+                              for dim in range(self.rank))
+            self._nodes = None
+        elif self.type == 'rectilinear':
+            self.axes = _node_coords(bmi, grid_id, self.rank)
+            self._nodes = None
+        else:
+            self.axes = None
+            self._nodes = _node_coords(bmi, grid_id, self.rank)
+
+    @property
+    def shape(self):
+        if self.axes is None:
+            return (len(self._nodes[0]), )
+        return tuple(len(axis) for axis in self.axes)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def nodes(self):
+        """Coordinates of every node, one flat array for each dimension."""
+        if self._nodes is None:
+            return tuple(coords.reshape(-1) for coords in np.meshgrid(
+                *self.axes, indexing='ij'))
+        return self._nodes
+
+    def fractional_index(self, dim, coords):
+        """Fractional indices along a structured dimension."""
+        if self.coords is not None:
+            return self.coords.locate(
+                *[coords if n == dim else 0. for n in range(self.rank)])[dim]
+        return np.interp(coords, self.axes[dim],
+                         np.arange(len(self.axes[dim]), dtype=float))
+
+    def digest(self):
+        """A hash of the grid's geometry."""
+        sha1 = hashlib.sha1()
+        sha1.update('{type}:{rank}'.format(type=self.type,
+                                           rank=self.rank).encode())
+        if self.coords is not None:
+            arrays = (np.array(self.coords.shape, dtype=np.int64),
+                      self.coords.spacing, self.coords.origin)
+        else:
+            arrays = self.axes or self._nodes
+        for array in arrays:
+            sha1.update(np.ascontiguousarray(array).tobytes())
+        return sha1.hexdigest()
+
+
+def _nearest_weights(src, dst):
+    points = dst.nodes()
+    n_points = len(points[0])
+
+    if src.axes is not None:
+        index = tuple(
+            np.clip(np.rint(src.fractional_index(dim, points[dim])),
+                    0, src.shape[dim] - 1).astype(np.intp)
+            for dim in range(src.rank))
+        cols = np.ravel_multi_index(index, src.shape)
+    elif cKDTree is not None:
+        _, cols = cKDTree(np.column_stack(src.nodes())).query(
+            np.column_stack(points))
+    else:
+        nodes = np.column_stack(src.nodes())
+        cols = np.empty(n_points, dtype=np.intp)
+        for start in range(0, n_points, _NEAREST_CHUNK_SIZE):
+            chunk = slice(start, start + _NEAREST_CHUNK_SIZE)
+            block = np.column_stack([coords[chunk] for coords in points])
+            distance = ((block[:, np.newaxis, :] -
+                         nodes[np.newaxis, :, :]) ** 2).sum(axis=2)
+            cols[chunk] = distance.argmin(axis=1)
+
+    return np.arange(n_points), np.asarray(cols), np.ones(n_points)
+
+
+def _bilinear_weights(src, dst):
+    if src.axes is None:
+        raise NotImplementedError(
+            'bilinear weights require a rectilinear source grid (use '
+            'nearest for unstructured grids)')
+
+    points = dst.nodes()
+    n_points = len(points[0])
+
+    lower, frac = [], []
+    for dim in range(src.rank):
+        n_nodes = src.shape[dim]
+        index = np.clip(src.fractional_index(dim, points[dim]),
+                        0, n_nodes - 1)
+        base = np.clip(np.floor(index), 0, max(n_nodes - 2, 0))
+        lower.append(base.astype(np.intp))
+        frac.append(index - base)
+
+    rows, cols, data = [], [], []
+    for corner in range(2 ** src.rank):
+        index, weight = [], np.ones(n_points)
+        for dim in range(src.rank):
+            upper = (corner >> dim) & 1
+            index.append(np.minimum(lower[dim] + upper, src.shape[dim] - 1))
+            weight *= frac[dim] if upper else 1. - frac[dim]
+        rows.append(np.arange(n_points))
+        cols.append(np.ravel_multi_index(index, src.shape))
+        data.append(weight)
+
+    rows, cols, data = (np.concatenate(rows), np.concatenate(cols),
+                        np.concatenate(data))
+    keep = data != 0.
+    return rows[keep], cols[keep], data[keep]
+
+
+def _cell_edges(coords, dim):
+    """Edges of the cells centered on the nodes along a dimension."""
+    spacing, origin = coords.spacing[dim], coords.origin[dim]
+    return origin + spacing * (np.arange(coords.shape[dim] + 1) - .5)
+
+
+def _overlap_weights(src_edges, dst_edges):
+    """Overlaps of 1D cells, as fractions of the destination cells."""
+    edges = np.union1d(src_edges, dst_edges)
+    middle = .5 * (edges[:-1] + edges[1:])
+    length = np.diff(edges)
+
+    cols = np.searchsorted(src_edges, middle) - 1
+    rows = np.searchsorted(dst_edges, middle) - 1
+    inside = ((cols >= 0) & (cols < len(src_edges) - 1) &
+              (rows >= 0) & (rows < len(dst_edges) - 1) & (length > 0.))
+    rows, cols = rows[inside], cols[inside]
+    return rows, cols, length[inside] / np.diff(dst_edges)[rows]
+
+
+def _conservative_weights(src, dst):
+    if src.coords is None or dst.coords is None or src.rank != dst.rank:
+        raise NotImplementedError(
+            'conservative weights require uniform rectilinear grids of the '
+            'same rank')
+
+    rows, cols, data = (np.zeros(1, dtype=np.intp),
+                        np.zeros(1, dtype=np.intp), np.ones(1))
+    for dim in range(src.rank):
+        dim_rows, dim_cols, dim_data = _overlap_weights(
+            _cell_edges(src.coords, dim), _cell_edges(dst.coords, dim))
+        rows = (rows[:, np.newaxis] * dst.shape[dim] + dim_rows).reshape(-1)
+        cols = (cols[:, np.newaxis] * src.shape[dim] + dim_cols).reshape(-1)
+        data = (data[:, np.newaxis] * dim_data).reshape(-1)
+    return rows, cols, data
+
+
+_WEIGHTS = {
+    'nearest': _nearest_weights,
+    'bilinear': _bilinear_weights,
+    'conservative': _conservative_weights,
+}
+
+
+class Regridder(object):
+
+    """Move values from the grid of one model to that of another.
+
+    Both grids are read through the grid getters of the models, and the
+    weights that map source nodes to destination nodes are computed once,
+    as a sparse matrix, with one of :data:`METHODS`:
+
+    ``nearest``
+      The value of the nearest source node. Any grid type may be used.
+    ``bilinear``
+      Multilinear interpolation between the nodes of the source cell that
+      holds each destination node. The source grid must be rectilinear
+      (uniform or not); points outside of it take values from its edge.
+    ``conservative``
+      The average of source values over each destination cell, weighted
+      by area, which conserves the integral of the values. Each node is
+      taken to be the center of a cell. Both grids must be uniform
+      rectilinear; destination cells that fall partly outside of the
+      source grid get only the overlapping part.
+
+    Weights are applied, for each exchange, as a sparse matrix-vector
+    product. If a *cache_dir* is given, weights are saved there, in a
+    file named by a hash of the method and the geometry of both grids,
+    and read back rather than recomputed on later runs.
+
+    SciPy is used, if it is installed, to find nearest nodes on
+    unstructured grids and to apply weights; otherwise NumPy is used.
+
+    Parameters
+    ----------
+    src : Bmi
+      The model that provides values.
+    src_grid : int
+      Identifier of the source grid.
+    dst : Bmi
+      The model that receives values.
+    dst_grid : int
+      Identifier of the destination grid.
+    method : str, optional
+      One of :data:`METHODS`. If not given, use ``bilinear`` if the source
+      grid is rectilinear and ``nearest`` if it is not.
+    cache_dir : str, optional
+      Directory in which to cache weights.
+
+    Examples
+    --------
+    Pass a variable between models on different grids::
+
+        regridder = Regridder.from_var(ocean, atmosphere,
+                                       'sea_surface__temperature')
+        regridder.exchange(ocean, atmosphere, 'sea_surface__temperature')
+    """
+
+    def __init__(self, src, src_grid, dst, dst_grid, method=None,
+                 cache_dir=None):
+        if method is not None and method not in _WEIGHTS:
+            raise ValueError('{method}: unknown method (not one of {methods})'
+                             .format(method=method, methods=METHODS))
+
+        src_geometry, dst_geometry = _Grid(src, src_grid), _Grid(dst, dst_grid)
+        if method is None:
+            method = 'bilinear' if src_geometry.axes is not None else 'nearest'
+        self._method = method
+        self._shape = (dst_geometry.size, src_geometry.size)
+
+        sha1 = hashlib.sha1(method.encode())
+        sha1.update(src_geometry.digest().encode())
+        sha1.update(dst_geometry.digest().encode())
+        self._key = sha1.hexdigest()
+
+        path = None
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, self._key + '.npz')
+
+        if path is not None and os.path.isfile(path):
+            with np.load(path) as weights:
+                rows, cols, data = (weights['rows'], weights['cols'],
+                                    weights['data'])
+        else:
+            rows, cols, data = _WEIGHTS[method](src_geometry, dst_geometry)
+            if path is not None:
+                self._save(path, rows, cols, data)
+
+        order = np.argsort(rows, kind='stable')
+        self._rows = np.asarray(rows[order], dtype=np.intp)
+        self._cols = np.asarray(cols[order], dtype=np.intp)
+        self._data = np.asarray(data[order], dtype=float)
+
+        if sparse is not None:
+            self._matrix = sparse.csr_matrix(
+                (self._data, (self._rows, self._cols)), shape=self._shape)
+        else:
+            self._matrix = None
+            self._products = np.empty_like(self._data)
+        self._buffers = {}
+
+    @classmethod
+    def from_var(cls, src, dst, var_name, dst_var_name=None, **kwds):
+        """Create a regridder between the grids of a variable.
+
+        Parameters
+        ----------
+        src : Bmi
+          The model that provides values.
+        dst : Bmi
+          The model that receives values.
+        var_name : str
+          Name of the variable in the source model.
+        dst_var_name : str, optional
+          Name of the variable in the destination model, if different.
+        **kwds
+          Other arguments passed to :class:`Regridder`.
+
+        Returns
+        -------
+        Regridder
+          A regridder from the source grid to the destination grid.
+        """
+        return cls(src, src.get_var_grid(var_name), dst,
+                   dst.get_var_grid(dst_var_name or var_name), **kwds)
+
+    def _save(self, path, rows, cols, data):
+        temp = '{path}.{pid}.tmp'.format(path=path, pid=os.getpid())
+        with open(temp, 'wb') as fp:
+            np.savez(fp, rows=rows, cols=cols, data=data)
+        _replace(temp, path)
+
+    @property
+    def method(self):
+        """The regridding method."""
+        return self._method
+
+    @property
+    def key(self):
+        """Hash of the method and grid geometries that names the weights."""
+        return self._key
+
+    @property
+    def shape(self):
+        """Sizes of the destination and source grids."""
+        return self._shape
+
+    @property
+    def weights(self):
+        """Destination indices, source indices and weights, as COO arrays."""
+        return self._rows, self._cols, self._data
+
+    def regrid(self, values, out=None):
+        """Move values from the source grid to the destination grid.
+
+        Parameters
+        ----------
+        values : array_like
+          Values on the source grid.
+        out : ndarray, optional
+          A buffer, of the size of the destination grid, into which to
+          place the values.
+
+        Returns
+        -------
+        ndarray
+          Values on the destination grid. If *out* was given, this is *out*.
+        """
+        values = np.asarray(values).reshape(-1)
+        if values.size != self._shape[1]:
+            raise ValueError('size mismatch ({actual} != {expected})'.format(
+                actual=values.size, expected=self._shape[1]))
+
+        if self._matrix is not None:
+            result = self._matrix.dot(values)
+        else:
+            if values.dtype == self._products.dtype:
+                np.take(values, self._cols, out=self._products)
+                self._products *= self._data
+            else:
+                np.multiply(values[self._cols], self._data,
+                            out=self._products)
+            result = np.bincount(self._rows, weights=self._products,
+                                 minlength=self._shape[0])
+
+        if out is None:
+            return result
+        if out.dtype != result.dtype:
+            if out.dtype.kind in 'iu':
+                np.rint(result, out=result)
+            result = result.astype(out.dtype)
+        return copy_value(result, out)
+
+    def exchange(self, src, dst, var_name, dst_var_name=None):
+        """Pass a variable from one model to another, regridded.
+
+        Parameters
+        ----------
+        src : Bmi
+          The model that provides values.
+        dst : Bmi
+          The model that receives values.
+        var_name : str
+          Name of the variable in the source model.
+        dst_var_name : str, optional
+          Name of the variable in the destination model, if different.
+        """
+        dst_var_name = dst_var_name or var_name
+
+        values = src.get_value_ref(var_name)
+        if values is None:
+            values = src.get_value(var_name)
+
+        try:
+            buffer = self._buffers[dst_var_name]
+        except KeyError:
+            buffer = self._buffers[dst_var_name] = np.empty(
+                self._shape[0], dtype=dst.get_var_type(dst_var_name))
+
+        dst.set_value(dst_var_name, self.regrid(values, out=buffer))
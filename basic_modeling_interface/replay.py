@@ -0,0 +1,210 @@
+#! /usr/bin/env python
+"""A model that plays back a recorded run."""
+
+import json
+import os
+
+import numpy as np
+
+from .bmi import Bmi
+from .buffers import check_value_buffer, copy_value
+from .indices import IndexSet
+from .recorder import INDEX_FILE, TIMES_FILE
+
+
+class BmiReplay(Bmi):
+
+    """Serve the outputs of a run recorded by an output recorder.
+
+    The configuration file passed to :func:`initialize` is the directory
+    written by :class:`~bmi.recorder.OutputRecorder` (or its
+    ``index.json``). The metadata of the recorded variables and grids are
+    read back, so the replay describes itself as the recorded model did,
+    and the values of each variable are memory-mapped rather than read.
+
+    Each :func:`update` moves to the next record, so the time step is the
+    interval between records. :func:`update_until` moves to the last
+    record at or before the given time. Values are those of the current
+    record; :func:`get_value_ref` returns a view into the mapped file, so
+    serving a record costs no copy and no I/O until its pages are touched.
+
+    A replay takes no inputs. Values passed to :func:`set_value` change
+    the current record in memory, but never the recording.
+
+    Examples
+    --------
+    Stand in for an expensive model with a recording of its run::
+
+        model = BmiReplay()
+        model.initialize('recording')
+        model.update_until(10.)
+    """
+
+    def __init__(self):
+        self._path = None
+        self._index = {}
+        self._times = np.empty(0)
+        self._values = {}
+        self._grids = {}
+        self._record = 0
+
+    def initialize(self, filename):
+        path = filename
+        if os.path.basename(path) == INDEX_FILE:
+            path = os.path.dirname(path)
+        with open(os.path.join(path, INDEX_FILE), 'r') as fp:
+            self._index = json.load(fp)
+
+        self._path = path
+        self._times = np.fromfile(os.path.join(path, TIMES_FILE),
+                                  dtype=np.float64)
+        if len(self._times) == 0:
+            raise ValueError('{path}: recording has no records'.format(
+                path=path))
+
+        self._values = {}
+        for name, var in self._index['vars'].items():
+            self._values[name] = np.memmap(
+                os.path.join(path, var['file']), dtype=var['type'], mode='c',
+                shape=(len(self._times), ) + tuple(var['shape']))
+
+        self._grids = dict((int(grid), info)
+                           for grid, info in self._index['grids'].items())
+        self._record = 0
+
+    def _load_grid_array(self, grid_id, name):
+        filename = self._grids[grid_id].get(name)
+        if filename is None:
+            return None
+        return np.load(os.path.join(self._path, filename), mmap_mode='r')
+
+    @property
+    def record(self):
+        """Index of the current record."""
+        return self._record
+
+    @property
+    def record_count(self):
+        """Number of records in the recording."""
+        return len(self._times)
+
+    def update(self):
+        if self._record + 1 >= len(self._times):
+            raise ValueError('no records after time {time}'.format(
+                time=self._times[self._record]))
+        self._record += 1
+
+    def update_frac(self, time_frac):
+        self.update_until(self.get_current_time() +
+                          time_frac * self.get_time_step())
+
+    def update_until(self, time):
+        atol = 1e-9 * max(abs(time), 1.)
+        self._record = max(int(np.searchsorted(self._times, time + atol,
+                                               side='right')) - 1, 0)
+
+    def finalize(self):
+        self._values = {}
+
+    def get_component_name(self):
+        return self._index.get('component')
+
+    def get_input_var_names(self):
+        return ()
+
+    def get_output_var_names(self):
+        return tuple(self._index.get('output_var_names') or
+                     sorted(self._index['vars']))
+
+    def get_start_time(self):
+        return float(self._times[0])
+
+    def get_current_time(self):
+        return float(self._times[self._record])
+
+    def get_end_time(self):
+        return float(self._times[-1])
+
+    def get_time_step(self):
+        if len(self._times) > 1:
+            return float(self._times[1] - self._times[0])
+        return self._index.get('time_step')
+
+    def get_time_units(self):
+        return self._index.get('time_units')
+
+    def get_var_type(self, var_name):
+        return self._index['vars'][var_name]['type']
+
+    def get_var_units(self, var_name):
+        return self._index['vars'][var_name]['units']
+
+    def get_var_itemsize(self, var_name):
+        return self._index['vars'][var_name]['itemsize']
+
+    def get_var_nbytes(self, var_name):
+        return self._index['vars'][var_name]['nbytes']
+
+    def get_var_grid(self, var_name):
+        return self._index['vars'][var_name]['grid']
+
+    def get_value(self, var_name, dest=None):
+        values = self._values[var_name][self._record]
+        if dest is None:
+            return values.reshape(-1).copy()
+        return copy_value(values, check_value_buffer(self, var_name, dest))
+
+    def get_value_ref(self, var_name):
+        return self._values[var_name][self._record]
+
+    def get_value_at_indices(self, var_name, indices):
+        values = self._values[var_name][self._record]
+        if isinstance(indices, IndexSet):
+            return indices.take(values)
+        return values.reshape(-1).take(indices)
+
+    def set_value(self, var_name, src):
+        copy_value(src, self._values[var_name][self._record])
+
+    def set_value_at_indices(self, var_name, indices, src):
+        values = self._values[var_name][self._record]
+        if isinstance(indices, IndexSet):
+            indices.put(values, src)
+        else:
+            values.reshape(-1)[indices] = src
+
+    def get_grid_rank(self, grid_id):
+        return self._grids[grid_id].get('rank')
+
+    def get_grid_size(self, grid_id):
+        return self._grids[grid_id].get('size')
+
+    def get_grid_type(self, grid_id):
+        return self._grids[grid_id].get('type')
+
+    def get_grid_shape(self, grid_id):
+        if 'shape' in self._grids[grid_id]:
+            return np.array(self._grids[grid_id]['shape'])
+
+    def get_grid_spacing(self, grid_id):
+        if 'spacing' in self._grids[grid_id]:
+            return np.array(self._grids[grid_id]['spacing'])
+
+    def get_grid_origin(self, grid_id):
+        if 'origin' in self._grids[grid_id]:
+            return np.array(self._grids[grid_id]['origin'])
+
+    def get_grid_x(self, grid_id):
+        return self._load_grid_array(grid_id, 'x')
+
+    def get_grid_y(self, grid_id):
+        return self._load_grid_array(grid_id, 'y')
+
+    def get_grid_z(self, grid_id):
+        return self._load_grid_array(grid_id, 'z')
+
+    def get_grid_connectivity(self, grid_id):
+        return self._load_grid_array(grid_id, 'connectivity')
+
+    def get_grid_offset(self, grid_id):
+        return self._load_grid_array(grid_id, 'offset')
@@ -0,0 +1,226 @@
+#! /usr/bin/env python
+"""Advance coupled models with different time steps."""
+
+import math
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+from .coupler import dependency_levels, find_connections, pass_value
+from .units import time_conversion
+
+
+class ExchangeScheduler(object):
+
+    """Advance coupled models only as far as their next exchange.
+
+    Components are not stepped in lockstep. Instead, values are passed
+    along each connection at an interval equal to the longer of the time
+    steps of its provider and consumer, starting from the latest start
+    time of the components. At each exchange time, only the components
+    that take part in an exchange are advanced, with
+    :func:`~bmi.base.BmiBase.update_until`, to that time; each then steps
+    freely until its next exchange. A fast component coupled to a slow
+    one therefore receives new values once per slow step, rather than
+    once per fast step, and neither waits on the other in between.
+
+    Components that must be advanced to the same time are advanced in
+    order of their dependencies (see
+    :func:`~bmi.coupler.dependency_levels`) and, within a level, in
+    parallel threads.
+
+    Components may keep time in different units. Each component's times
+    and time step are converted, with a scale and offset found once from
+    :func:`~bmi.time.BmiTime.get_time_units`, to a common unit in which
+    the scheduler works.
+
+    Parameters
+    ----------
+    components : dict
+      Initialized models, keyed by component name.
+    connections : iterable of Connection, optional
+      Connections between the components. If not given, use
+      :func:`~bmi.coupler.find_connections`.
+    max_workers : int, optional
+      Maximum number of components to advance at once.
+    time_units : str, optional
+      Units of the scheduler's times. If not given, use the time units of
+      the first component, by name. Components without time units are
+      assumed to use these.
+    """
+
+    #: Relative tolerance used when comparing times.
+    rtol = 1e-9
+
+    def __init__(self, components, connections=None, max_workers=None,
+                 time_units=None):
+        if ThreadPoolExecutor is None:
+            raise RuntimeError('ExchangeScheduler requires '
+                               'concurrent.futures (Python 3.2 or later, or '
+                               'the futures package)')
+        self._components = dict(components)
+        if connections is None:
+            connections = find_connections(self._components)
+        self._connections = tuple(connections)
+
+        if time_units is None:
+            time_units = self._components[min(self._components)
+                                          ].get_time_units()
+        self._time_units = time_units
+        self._conversions = dict(
+            (name, self._conversion(bmi.get_time_units()))
+            for name, bmi in self._components.items())
+
+        self._levels = dependency_levels(self._components, self._connections)
+        self._start = max(self._to_common(name, bmi.get_start_time())
+                          for name, bmi in self._components.items())
+        self._time = self._start
+        self._started = False
+
+        self._intervals = dict(
+            (connection, max(self._time_step(connection.provider),
+                             self._time_step(connection.consumer)))
+            for connection in self._connections)
+
+        self._exchange_count = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(len(self._components), 1))
+
+    def _conversion(self, units):
+        if not units or not self._time_units or units == self._time_units:
+            return 1., 0.
+        return time_conversion(units, self._time_units)
+
+    def _to_common(self, name, time):
+        scale, offset = self._conversions[name]
+        return time * scale + offset
+
+    def _from_common(self, name, time):
+        scale, offset = self._conversions[name]
+        return (time - offset) / scale
+
+    def _time_step(self, name):
+        return self._components[name].get_time_step() * (
+            self._conversions[name][0])
+
+    @property
+    def time(self):
+        """Time to which all exchanges have been made."""
+        return self._time
+
+    @property
+    def time_units(self):
+        """Units of the scheduler's times."""
+        return self._time_units
+
+    @property
+    def exchange_count(self):
+        """Number of values passed between components so far."""
+        return self._exchange_count
+
+    def interval(self, connection):
+        """Get the time between exchanges along a connection.
+
+        Parameters
+        ----------
+        connection : Connection
+          A connection between components.
+
+        Returns
+        -------
+        float
+          The exchange interval.
+        """
+        return self._intervals[connection]
+
+    def next_exchange_time(self, connection, after):
+        """Get the first exchange time along a connection after a time.
+
+        Parameters
+        ----------
+        connection : Connection
+          A connection between components.
+        after : float
+          A time.
+
+        Returns
+        -------
+        float
+          The next exchange time. This is infinite for connections whose
+          components have no positive time step (steady-state components,
+          for instance); these exchange only at the end of each
+          :func:`run_until`.
+        """
+        interval = self._intervals[connection]
+        if interval <= 0.:
+            return float('inf')
+        n_intervals = math.floor((after - self._start) / interval +
+                                 self.rtol) + 1
+        return self._start + n_intervals * interval
+
+    def _isclose(self, a, b):
+        if math.isinf(a) or math.isinf(b):
+            return a == b
+        return abs(a - b) <= self.rtol * max(abs(a), abs(b), 1.)
+
+    def _advance(self, names, time):
+        for level in self._levels:
+            futures = []
+            for name in level:
+                bmi = self._components[name]
+                if name in names and not self._isclose(
+                        self._to_common(name, bmi.get_current_time()), time):
+                    futures.append(self._executor.submit(
+                        bmi.update_until, self._from_common(name, time)))
+            for future in futures:
+                future.result()
+
+    def _exchange(self, connection):
+        pass_value(self._components[connection.provider],
+                   self._components[connection.consumer], connection.var_name)
+        self._exchange_count += 1
+
+    def run_until(self, time):
+        """Advance all components to the given time.
+
+        Parameters
+        ----------
+        time : float
+          A time, in the scheduler's time units.
+        """
+        if not self._started:
+            for connection in self._connections:
+                self._exchange(connection)
+            self._started = True
+
+        while self._time < time and not self._isclose(self._time, time):
+            next_times = dict(
+                (connection, self.next_exchange_time(connection, self._time))
+                for connection in self._connections)
+            now = min(list(next_times.values()) + [time])
+
+            if not now > self._time or self._isclose(now, self._time):
+                raise RuntimeError('scheduler time did not advance past '
+                                   '{time}'.format(time=self._time))
+
+            at_end = self._isclose(now, time)
+            due = [connection for connection in self._connections
+                   if self._isclose(next_times[connection], now) or
+                   (at_end and self._intervals[connection] <= 0.)]
+            if at_end:
+                names = set(self._components)
+            else:
+                names = set()
+                for connection in due:
+                    names.update((connection.provider, connection.consumer))
+
+            self._advance(names, now)
+            for connection in due:
+                self._exchange(connection)
+            self._time = now
+
+    def close(self):
+        """Shut down the pool of threads used to advance components."""
+        self._executor.shutdown()
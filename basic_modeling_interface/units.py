@@ -0,0 +1,590 @@
+#! /usr/bin/env python
+"""Parse units and convert values between them."""
+
+import datetime
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from .bmi import Bmi
+from .buffers import var_dtype, var_size
+from .forwarding import forward_methods
+
+
+class TimeUnits(namedtuple('TimeUnits', ['scale', 'epoch'])):
+
+    """Time units as seconds per unit and an optional epoch."""
+
+    __slots__ = ()
+
+
+_SECONDS = dict(
+    [(name, 1e-3) for name in ('ms', 'msec', 'millisecond', 'milliseconds')] +
+    [(name, 1.) for name in ('s', 'sec', 'secs', 'second', 'seconds')] +
+    [(name, 60.) for name in ('min', 'mins', 'minute', 'minutes')] +
+    [(name, 3600.) for name in ('h', 'hr', 'hrs', 'hour', 'hours')] +
+    [(name, 86400.) for name in ('d', 'day', 'days')] +
+    [(name, 604800.) for name in ('wk', 'week', 'weeks')] +
+    [(name, 31556925.9747) for name in ('a', 'yr', 'year', 'years')])
+
+
+class Units(namedtuple('Units', ['scale', 'offset', 'dims'])):
+
+    """Units as a scale and offset from SI base units.
+
+    A value, *v*, in the units is ``v * scale + offset`` in the SI base
+    units given by *dims*, the powers of m, kg, s, K, mol and A.
+    """
+
+    __slots__ = ()
+
+
+_DIMS = ('m', 'kg', 's', 'K', 'mol', 'A')
+
+
+def _dims(**powers):
+    return tuple(powers.get(name, 0) for name in _DIMS)
+
+
+# Base units that take SI prefixes, as (scale, offset, dims).
+_PREFIXABLE = dict(
+    [(name, (1., 0., _dims(m=1))) for name in ('m', 'meter', 'meters',
+                                               'metre', 'metres')] +
+    [(name, (1e-3, 0., _dims(kg=1))) for name in ('g', 'gram', 'grams')] +
+    [(name, (scale, 0., _dims(s=1))) for name, scale in (
+        ('s', 1.), ('sec', 1.), ('second', 1.), ('seconds', 1.))] +
+    [(name, (1e-3, 0., _dims(m=3))) for name in ('L', 'l', 'liter',
+                                                 'liters', 'litre')] +
+    [('K', (1., 0., _dims(K=1))), ('mol', (1., 0., _dims(mol=1))),
+     ('A', (1., 0., _dims(A=1))), ('Pa', (1., 0., _dims(kg=1, m=-1, s=-2))),
+     ('bar', (1e5, 0., _dims(kg=1, m=-1, s=-2))),
+     ('N', (1., 0., _dims(kg=1, m=1, s=-2))),
+     ('J', (1., 0., _dims(kg=1, m=2, s=-2))),
+     ('W', (1., 0., _dims(kg=1, m=2, s=-3)))])
+
+# Units that do not take prefixes.
+_UNPREFIXABLE = dict(
+    [(name, (scale, 0., _dims(s=1))) for name, scale in _SECONDS.items()] +
+    [(name, (1., 0., _dims())) for name in ('1', '-', 'none',
+                                            'dimensionless')] +
+    [('%', (1e-2, 0., _dims())), ('ha', (1e4, 0., _dims(m=2))),
+     ('t', (1e3, 0., _dims(kg=1))), ('kelvin', (1., 0., _dims(K=1)))] +
+    [(name, (1., 273.15, _dims(K=1))) for name in (
+        'degC', 'deg_C', 'celsius', 'Celsius', 'C')] +
+    [(name, (5. / 9., 459.67 * 5. / 9., _dims(K=1))) for name in (
+        'degF', 'deg_F', 'fahrenheit', 'Fahrenheit', 'F')])
+
+_PREFIXES = {'n': 1e-9, 'u': 1e-6, 'm': 1e-3, 'c': 1e-2, 'd': 1e-1,
+             'k': 1e3, 'M': 1e6, 'G': 1e9}
+
+_FACTOR = re.compile(r'^(?P<name>[^\d^+-]+|1|-)(?:\^?(?P<power>[+-]?\d+))?$')
+
+_UNITS = {}
+_CONVERSIONS = {}
+
+_EPOCH_FORMATS = ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S',
+                  '%Y-%m-%d %H:%M', '%Y-%m-%d')
+
+_TIME_UNITS = {}
+_TIME_CONVERSIONS = {}
+
+
+def _parse_epoch(epoch):
+    epoch = re.sub(r'(\s*(UTC|Z))$', '', epoch.strip()).replace('T', ' ')
+    for fmt in _EPOCH_FORMATS:
+        try:
+            return datetime.datetime.strptime(epoch, fmt)
+        except ValueError:
+            pass
+    raise ValueError('{epoch}: unable to parse epoch'.format(epoch=epoch))
+
+
+def parse_time_units(units):
+    """Parse a time unit string.
+
+    Units are either a duration, such as ``s``, ``d`` or ``days``, or a
+    duration since an epoch, in the style of UDUNITS, such as ``hours since
+    1970-01-01`` or ``s since 2000-01-01 12:00:00``. Parsed units are
+    remembered, so repeated calls are cheap.
+
+    Parameters
+    ----------
+    units : str
+      Time units, as from :func:`~bmi.time.BmiTime.get_time_units`.
+
+    Returns
+    -------
+    TimeUnits
+      Seconds per unit and, if given, the epoch as a ``datetime``.
+
+    Raises
+    ------
+    ValueError
+      If the units are not recognized.
+
+    Examples
+    --------
+    >>> from basic_modeling_interface.units import parse_time_units
+    >>> parse_time_units('days')
+    TimeUnits(scale=86400.0, epoch=None)
+    >>> parse_time_units('h since 1970-01-02').epoch.day
+    2
+    """
+    try:
+        return _TIME_UNITS[units]
+    except KeyError:
+        pass
+
+    name, _, epoch = units.strip().partition(' since ')
+    try:
+        scale = _SECONDS[name.strip().lower()]
+    except KeyError:
+        raise ValueError('{units}: unknown time units'.format(units=units))
+    if epoch:
+        epoch = _parse_epoch(epoch)
+    else:
+        epoch = None
+
+    parsed = _TIME_UNITS[units] = TimeUnits(scale, epoch)
+    return parsed
+
+
+def time_conversion(from_units, to_units):
+    """Get the factors that convert times from one unit to another.
+
+    A time, *t*, in *from_units* is ``t * scale + offset`` in *to_units*.
+    The offset accounts for a difference between the epochs of the units.
+    Times in units without an epoch are taken to be measured from the
+    epoch of the other units, if any. Conversions are remembered, so that
+    comparing times of coupled models costs only a multiply and an add.
+
+    Parameters
+    ----------
+    from_units : str
+      Time units to convert from.
+    to_units : str
+      Time units to convert to.
+
+    Returns
+    -------
+    tuple of float
+      The scale and offset of the conversion.
+
+    Examples
+    --------
+    >>> from basic_modeling_interface.units import time_conversion
+    >>> time_conversion('d', 's')
+    (86400.0, 0.0)
+    >>> time_conversion('hours since 1970-01-02', 'days since 1970-01-01')
+    (0.041666666666666664, 1.0)
+    """
+    key = (from_units, to_units)
+    try:
+        return _TIME_CONVERSIONS[key]
+    except KeyError:
+        pass
+
+    src, dst = parse_time_units(from_units), parse_time_units(to_units)
+    scale = src.scale / dst.scale
+    if src.epoch is not None and dst.epoch is not None:
+        offset = (src.epoch - dst.epoch).total_seconds() / dst.scale
+    else:
+        offset = 0.
+
+    conversion = _TIME_CONVERSIONS[key] = (scale, offset)
+    return conversion
+
+
+def _parse_name(name):
+    """Get the scale, offset and dimensions of a single unit name."""
+    try:
+        return _UNPREFIXABLE[name]
+    except KeyError:
+        pass
+    try:
+        return _PREFIXABLE[name]
+    except KeyError:
+        pass
+    if name[:1] in _PREFIXES and name[1:] in _PREFIXABLE:
+        scale, offset, dims = _PREFIXABLE[name[1:]]
+        return scale * _PREFIXES[name[:1]], offset, dims
+    raise KeyError(name)
+
+
+def parse_units(units):
+    """Parse a unit string.
+
+    Units are products of unit names, separated by spaces, ``.`` or
+    ``*``, each optionally raised to an integer power (``m2``, ``m^2``,
+    ``m**2`` or ``s-1``). A name that follows a ``/`` is divided by.
+    Names may take an SI prefix, so ``mm/day``, ``m s-1``, ``kg m-2 s-1``
+    and ``degC`` are all understood. Parsed units are remembered, so
+    repeated calls are cheap.
+
+    Parameters
+    ----------
+    units : str
+      Units, as from :func:`~bmi.vars.BmiVars.get_var_units`.
+
+    Returns
+    -------
+    Units
+      The scale, offset and dimensions of the units.
+
+    Raises
+    ------
+    ValueError
+      If the units are not recognized.
+
+    Examples
+    --------
+    >>> from basic_modeling_interface.units import parse_units
+    >>> parse_units('km2')
+    Units(scale=1000000.0, offset=0.0, dims=(2, 0, 0, 0, 0, 0))
+    """
+    try:
+        return _UNITS[units]
+    except KeyError:
+        pass
+
+    scale, offset, dims = 1., 0., [0] * len(_DIMS)
+    factors = units.strip().replace('**', '^').replace('*', ' ')
+    factors = re.sub(r'\.(?=\D)', ' ', re.sub(r'\s*/\s*', ' /', factors))
+    factors = factors.split()
+    for factor in factors:
+        sign = -1 if factor.startswith('/') else 1
+        match = _FACTOR.match(factor.lstrip('/'))
+        try:
+            name_scale, offset, name_dims = _parse_name(match.group('name'))
+        except (AttributeError, KeyError):
+            raise ValueError('{units}: unknown units'.format(units=units))
+        power = sign * int(match.group('power') or 1)
+
+        scale *= name_scale ** power
+        dims = [dim + power * name_dim
+                for dim, name_dim in zip(dims, name_dims)]
+
+    # An offset only applies to a lone unit, such as degC; in a compound
+    # unit, such as degC/s, it is an interval.
+    if len(factors) != 1 or power != 1:
+        offset = 0.
+
+    parsed = _UNITS[units] = Units(scale, offset, tuple(dims))
+    return parsed
+
+
+def unit_conversion(from_units, to_units):
+    """Get the factors that convert values from one unit to another.
+
+    A value, *v*, in *from_units* is ``v * scale + offset`` in *to_units*.
+    Conversions are remembered, so each pair of units is compiled once.
+
+    Parameters
+    ----------
+    from_units : str
+      Units to convert from.
+    to_units : str
+      Units to convert to.
+
+    Returns
+    -------
+    tuple of float
+      The scale and offset of the conversion.
+
+    Raises
+    ------
+    ValueError
+      If the units are not recognized or have different dimensions.
+
+    Examples
+    --------
+    >>> from basic_modeling_interface.units import unit_conversion
+    >>> unit_conversion('degC', 'K')
+    (1.0, 273.15)
+    >>> scale, offset = unit_conversion('mm/day', 'm s-1')
+    >>> round(scale * 86400. * 1000., 12), offset
+    (1.0, 0.0)
+    """
+    key = (from_units, to_units)
+    try:
+        return _CONVERSIONS[key]
+    except KeyError:
+        pass
+
+    src, dst = parse_units(from_units), parse_units(to_units)
+    if src.dims != dst.dims:
+        raise ValueError('{src}, {dst}: incompatible units'.format(
+            src=from_units, dst=to_units))
+
+    conversion = _CONVERSIONS[key] = (src.scale / dst.scale,
+                                      (src.offset - dst.offset) / dst.scale)
+    return conversion
+
+
+def convert(values, scale, offset, out):
+    """Convert values into a buffer in a single pass, where possible.
+
+    Parameters
+    ----------
+    values : array_like
+      Values to convert. They may be *out* itself.
+    scale, offset : float
+      Factors of the conversion, from :func:`unit_conversion`.
+    out : ndarray
+      A contiguous buffer to hold the converted values. Only its size
+      must match that of *values*.
+
+    Returns
+    -------
+    ndarray
+      The buffer, *out*.
+    """
+    if not out.flags['C_CONTIGUOUS']:
+        raise ValueError('buffer is not contiguous')
+
+    values = np.asarray(values)
+    if values.size != out.size:
+        raise ValueError('size mismatch ({actual} != {expected})'.format(
+            actual=out.size, expected=values.size))
+
+    dest = out.reshape(values.shape)
+    if offset == 0.:
+        np.multiply(values, scale, out=dest)
+    elif scale == 1.:
+        np.add(values, offset, out=dest)
+    else:
+        np.multiply(values, scale, out=dest)
+        dest += offset
+
+    return out
+
+
+class BmiUnitConverter(Bmi):
+
+    """Present a model's variables in other units.
+
+    Values of converted variables are passed through a scale and offset,
+    compiled once for each variable from its units and the requested
+    units with :func:`unit_conversion`. Values are converted as they are
+    copied into the destination buffer, so that, given a *dest*,
+    :func:`get_value` makes no temporary copies and only one pass over
+    the values (two for units with both a scale and an offset, such as
+    degF). :func:`set_value` and :func:`set_value_at_indices` convert
+    into a buffer allocated once per variable. All other calls go straight
+    to the model.
+
+    Only floating-point variables can be converted, so that converted
+    values keep the type that :func:`~bmi.vars.BmiVars.get_var_type`
+    reports; asking to convert any other variable raises a
+    :class:`TypeError`.
+
+    Because converted values are not the model's memory,
+    :func:`get_value_ref` returns ``None`` for converted variables, and
+    callers fall back to :func:`get_value`.
+
+    Parameters
+    ----------
+    bmi : Bmi
+      The model to wrap.
+    units : dict
+      Units in which to present variables, keyed by variable name.
+
+    Examples
+    --------
+    Present a model's precipitation rate in m/s::
+
+        bmi = BmiUnitConverter(model, {'precipitation__rate': 'm s-1'})
+    """
+
+    def __init__(self, bmi, units):
+        self._bmi = bmi
+        self._units = dict(units)
+        self._conversions = {}
+        self._buffers = {}
+
+    @property
+    def bmi(self):
+        """The wrapped model."""
+        return self._bmi
+
+    def _call(self, method, *args, **kwds):
+        return getattr(self._bmi, method)(*args, **kwds)
+
+    def _conversion(self, var_name):
+        """Get the scale and offset of a variable, or None if unconverted."""
+        try:
+            return self._conversions[var_name]
+        except KeyError:
+            pass
+
+        conversion = None
+        if var_name in self._units:
+            conversion = unit_conversion(self._bmi.get_var_units(var_name),
+                                         self._units[var_name])
+            if conversion == (1., 0.):
+                conversion = None
+            elif var_dtype(self._bmi, var_name).kind not in 'fc':
+                raise TypeError(
+                    '{name}: cannot convert units of a variable of type '
+                    '{type}'.format(name=var_name,
+                                    type=self._bmi.get_var_type(var_name)))
+        self._conversions[var_name] = conversion
+        return conversion
+
+    def _buffer(self, var_name, size):
+        """Get a buffer, allocated once per variable, for converted values."""
+        try:
+            buffer = self._buffers[var_name]
+        except KeyError:
+            buffer = self._buffers[var_name] = np.empty(
+                var_size(self._bmi, var_name),
+                dtype=var_dtype(self._bmi, var_name))
+        return buffer[:size]
+
+    def initialize(self, filename):
+        """Initialize the model and forget compiled conversions.
+
+        Parameters
+        ----------
+        filename : str, optional
+          The path to the model configuration file.
+        """
+        self._conversions.clear()
+        self._buffers.clear()
+        return self._bmi.initialize(filename)
+
+    def get_var_units(self, var_name):
+        """Get the units in which a variable is presented.
+
+        Parameters
+        ----------
+        var_name : str
+          An input or output variable name, a CSDMS Standard Name.
+
+        Returns
+        -------
+        str
+          The units of the variable.
+        """
+        try:
+            return self._units[var_name]
+        except KeyError:
+            return self._bmi.get_var_units(var_name)
+
+    def get_value(self, var_name, dest=None):
+        """Get a copy of values of the given variable, converted.
+
+        Parameters
+        ----------
+        var_name : str
+          An input or output variable name, a CSDMS Standard Name.
+        dest : ndarray, optional
+          A preallocated, contiguous array into which to place the values.
+
+        Returns
+        -------
+        ndarray
+          The value of the variable. If *dest* was given, this is *dest*.
+        """
+        conversion = self._conversion(var_name)
+        if conversion is None:
+            if dest is None:
+                return self._bmi.get_value(var_name)
+            return self._bmi.get_value(var_name, dest)
+
+        values = self._bmi.get_value_ref(var_name)
+        if values is None:
+            if dest is None:
+                values = dest = self._bmi.get_value(var_name)
+            else:
+                values = self._bmi.get_value(var_name, dest)
+        elif dest is None:
+            values = np.asarray(values)
+            dest = np.empty(values.size, dtype=values.dtype)
+
+        return convert(values, conversion[0], conversion[1], dest)
+
+    def get_value_ref(self, var_name):
+        """Get a reference to the values of an unconverted variable.
+
+        Parameters
+        ----------
+        var_name : str
+          An input or output variable name, a CSDMS Standard Name.
+
+        Returns
+        -------
+        array_like or None
+          A reference to the model's values, or ``None`` if the variable
+          is converted.
+        """
+        if self._conversion(var_name) is None:
+            return self._bmi.get_value_ref(var_name)
+        return None
+
+    def get_value_at_indices(self, var_name, indices):
+        """Get converted values at particular indices.
+
+        Parameters
+        ----------
+        var_name : str
+          An input or output variable name, a CSDMS Standard Name.
+        indices : array_like or IndexSet
+          The indices into the variable array.
+
+        Returns
+        -------
+        array_like
+          Value of the model variable at the given location.
+        """
+        values = self._bmi.get_value_at_indices(var_name, indices)
+        conversion = self._conversion(var_name)
+        if conversion is None:
+            return values
+        values = np.array(values)
+        return convert(values, conversion[0], conversion[1], values)
+
+    def set_value(self, var_name, src):
+        """Specify a new value for a model variable, converted to its units.
+
+        Parameters
+        ----------
+        var_name : str
+          An input or output variable name, a CSDMS Standard Name.
+        src : array_like
+          The new value for the specified variable.
+        """
+        conversion = self._conversion(var_name)
+        if conversion is None:
+            return self._bmi.set_value(var_name, src)
+
+        src = np.asarray(src)
+        scale, offset = conversion
+        self._bmi.set_value(var_name, convert(
+            src, 1. / scale, -offset / scale,
+            self._buffer(var_name, src.size)))
+
+    def set_value_at_indices(self, var_name, indices, src):
+        """Specify new values at particular indices, converted.
+
+        Parameters
+        ----------
+        var_name : str
+          An input or output variable name, a CSDMS Standard Name.
+        indices : array_like or IndexSet
+          The indices into the variable array.
+        src : array_like
+          The new value for the specified variable.
+        """
+        conversion = self._conversion(var_name)
+        if conversion is not None:
+            src = np.asarray(src)
+            scale, offset = conversion
+            src = convert(src, 1. / scale, -offset / scale,
+                          self._buffer(var_name, src.size))
+        return self._bmi.set_value_at_indices(var_name, indices, src)
+
+
+forward_methods(BmiUnitConverter,
+                'Call :func:`{name}` of the wrapped model.')
@@ -352,22 +352,29 @@ class BmiGetter(object):
     current values.
     """
 
-    def get_value(self, var_name):
+    def get_value(self, var_name, dest=None):
         """Get a copy of the values of the given variable.
 
         This is a getter for the model, used to access the model's
         current state. It returns a *copy* of a model variable, with
         the return type, size and rank dependent on the variable.
 
+        If *dest* is given, the values are copied into it rather than
+        into a newly allocated array.
+
         Parameters
         ----------
         var_name : str
           An input or output variable name, a CSDMS Standard Name.
+        dest : ndarray, optional
+          A preallocated, contiguous array into which to place the
+          values.
 
         Returns
         -------
         array_like
-          The value of a model variable.
+          The value of a model variable. If *dest* was given, this is
+          *dest*.
 
         """
         pass
@@ -379,6 +386,10 @@ class BmiGetter(object):
         current state. It returns a *reference* to a model variable,
         with the return type, size and rank dependent on the variable.
 
+        The reference must be a writable, C-contiguous array that shares
+        memory with the model, has the data type of the variable and has
+        the shape of the variable's grid.
+
         Parameters
         ----------
         var_name : str
@@ -386,12 +397,40 @@ class BmiGetter(object):
 
         Returns
         -------
-        array_like
+        ndarray
           A reference to a model variable.
 
         """
         pass
 
+    def get_values(self, var_names, dests=None):
+        """Get copies of the values of many variables.
+
+        This is a batched form of :func:`get_value`. The default
+        implementation calls :func:`get_value` for each variable in turn;
+        models with many variables can override it to gather values
+        with less overhead.
+
+        Parameters
+        ----------
+        var_names : iterable of str
+          Input or output variable names, CSDMS Standard Names.
+        dests : mapping, optional
+          Preallocated buffers, keyed by variable name, into which to
+          place the values. This may be a ``dict`` of arrays or a packed
+          structured array whose fields are the variable names.
+
+        Returns
+        -------
+        dict
+          The values of the variables, keyed by variable name.
+        """
+        if dests is None:
+            return dict((name, self.get_value(name)) for name in var_names)
+        else:
+            return dict((name, self.get_value(name, dests[name]))
+                        for name in var_names)
+
     def get_value_at_indices(self, var_name, indices):
         """Get values at particular locations.
 
@@ -399,8 +438,10 @@ class BmiGetter(object):
         ----------
         var_name : str
           An input or output variable name, a CSDMS Standard Name.
-        indices : array_like
-          The indices into the variable array.
+        indices : array_like or IndexSet
+          The indices into the variable array. Pass an
+          :class:`~bmi.indices.IndexSet` to reuse indices that have
+          already been validated and sorted.
 
         Returns
         -------
@@ -443,8 +484,10 @@ class BmiSetter(object):
         ----------
         var_name : str
           An input or output variable name, a CSDMS Standard Name.
-        indices : array_like
-          The indices into the variable array.
+        indices : array_like or IndexSet
+          The indices into the variable array. Pass an
+          :class:`~bmi.indices.IndexSet` to reuse indices that have
+          already been validated and sorted.
         src : array_like
           The new value for the specified variable.
 
@@ -19,5 +19,11 @@ setup(name='basic-modeling-interface',
         'Programming Language :: Python :: 2',
         'Programming Language :: Python :: 3',
       ],
-      packages=find_packages(),
+      packages=find_packages(exclude=['tests']),
+      install_requires=['numpy'],
+      entry_points={
+        'console_scripts': [
+          'bmi-check=basic_modeling_interface.check:main',
+        ],
+      },
 )
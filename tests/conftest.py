@@ -0,0 +1,31 @@
+import sys
+
+import pytest
+
+from basic_modeling_interface.heat import BmiHeat
+
+from .models import Plate
+
+# Coroutines need syntax that older versions cannot parse.
+collect_ignore = []
+if sys.version_info < (3, 7):
+    collect_ignore.append('test_aio.py')
+
+
+@pytest.fixture
+def plate():
+    """An initialized plate model."""
+    bmi = Plate()
+    bmi.initialize()
+    yield bmi
+    bmi.finalize()
+
+
+@pytest.fixture
+def heat():
+    """An initialized heat model that has taken one step."""
+    bmi = BmiHeat()
+    bmi.initialize(None)
+    bmi.update()
+    yield bmi
+    bmi.finalize()
@@ -0,0 +1,403 @@
+#! /usr/bin/env python
+"""Small models used by the tests."""
+
+import numpy as np
+
+from basic_modeling_interface.bmi import Bmi
+from basic_modeling_interface.buffers import check_value_buffer, copy_value
+from basic_modeling_interface.heat import BmiHeat
+
+
+#: The variable of :class:`Plate`.
+TEMPERATURE = 'plate_surface__temperature'
+
+
+class Plate(Bmi):
+
+    """A model with one variable on a small uniform rectilinear grid.
+
+    Values start as ``0, 1, 2, ...`` and each :func:`update` adds one to
+    all of them.
+    """
+
+    shape = (3, 4)
+
+    def __init__(self):
+        self._time = 0.
+        self._values = None
+
+    def initialize(self, filename=None):
+        self._time = 0.
+        self._values = np.arange(float(np.prod(self.shape))).reshape(
+            self.shape)
+
+    def update(self):
+        self._values += 1.
+        self._time += 1.
+
+    def finalize(self):
+        self._values = None
+
+    def get_component_name(self):
+        return 'plate'
+
+    def get_input_var_names(self):
+        return (TEMPERATURE, )
+
+    def get_output_var_names(self):
+        return (TEMPERATURE, )
+
+    def get_start_time(self):
+        return 0.
+
+    def get_current_time(self):
+        return self._time
+
+    def get_end_time(self):
+        return float('inf')
+
+    def get_time_step(self):
+        return 1.
+
+    def get_time_units(self):
+        return 's'
+
+    def get_var_type(self, var_name):
+        return 'float64'
+
+    def get_var_units(self, var_name):
+        return 'K'
+
+    def get_var_itemsize(self, var_name):
+        return 8
+
+    def get_var_nbytes(self, var_name):
+        return self._values.nbytes
+
+    def get_var_grid(self, var_name):
+        return 0
+
+    def get_value(self, var_name, dest=None):
+        if dest is None:
+            return self._values.reshape(-1).copy()
+        return copy_value(self._values,
+                          check_value_buffer(self, var_name, dest))
+
+    def get_value_ref(self, var_name):
+        return self._values
+
+    def get_value_at_indices(self, var_name, indices):
+        return self._values.reshape(-1).take(indices)
+
+    def set_value(self, var_name, src):
+        copy_value(src, self._values)
+
+    def set_value_at_indices(self, var_name, indices, src):
+        self._values.reshape(-1)[indices] = src
+
+    def get_grid_rank(self, grid_id):
+        return 2
+
+    def get_grid_size(self, grid_id):
+        return int(np.prod(self.shape))
+
+    def get_grid_type(self, grid_id):
+        return 'uniform_rectilinear'
+
+    def get_grid_shape(self, grid_id):
+        return np.array(self.shape)
+
+    def get_grid_spacing(self, grid_id):
+        return np.array([1., 1.])
+
+    def get_grid_origin(self, grid_id):
+        return np.array([0., 0.])
+
+    def get_grid_x(self, grid_id):
+        return np.arange(float(self.shape[1]))
+
+    def get_grid_y(self, grid_id):
+        return np.arange(float(self.shape[0]))
+
+
+class Clock(Bmi):
+
+    """A model with one value, the number of times it has been updated.
+
+    The model implements :func:`update_until`, but not
+    :func:`update_frac`. Values passed to :func:`set_value` are kept in
+    :attr:`received`, with the time at which they arrived.
+    """
+
+    time_step = 1.
+
+    def __init__(self):
+        self._time = 0.
+        self._value = np.zeros(1)
+        self.received = []
+
+    def initialize(self, filename=None):
+        self._time = 0.
+
+    def update(self):
+        self._time += self.time_step
+        self._value[0] += 1.
+
+    def update_until(self, time):
+        self._time = time
+
+    def finalize(self):
+        pass
+
+    def get_component_name(self):
+        return 'clock'
+
+    def get_input_var_names(self):
+        return ('count', )
+
+    def get_output_var_names(self):
+        return ('count', )
+
+    def get_start_time(self):
+        return 0.
+
+    def get_current_time(self):
+        return self._time
+
+    def get_end_time(self):
+        return float('inf')
+
+    def get_time_step(self):
+        return self.time_step
+
+    def get_time_units(self):
+        return 's'
+
+    def get_var_type(self, var_name):
+        return 'float64'
+
+    def get_var_units(self, var_name):
+        return '1'
+
+    def get_var_itemsize(self, var_name):
+        return 8
+
+    def get_var_nbytes(self, var_name):
+        return 8
+
+    def get_var_grid(self, var_name):
+        return 0
+
+    def get_value(self, var_name, dest=None):
+        if dest is None:
+            return self._value.copy()
+        return copy_value(self._value, check_value_buffer(self, var_name,
+                                                          dest))
+
+    def get_value_ref(self, var_name):
+        return self._value
+
+    def set_value(self, var_name, src):
+        self.received.append((self._time, float(np.asarray(src)[0])))
+
+    def get_grid_rank(self, grid_id):
+        return 0
+
+    def get_grid_size(self, grid_id):
+        return 1
+
+    def get_grid_type(self, grid_id):
+        return 'scalar'
+
+
+class Relay(Bmi):
+
+    """A model with scalar inputs and outputs that add up as they pass.
+
+    On :func:`update` every output is set to one more than the sum of the
+    values most recently passed to :func:`set_value`. The name of the
+    component is appended to :attr:`log` on each update so that models
+    that share a log record the order in which they were updated.
+    """
+
+    def __init__(self, name='relay', inputs=(), outputs=('out', ), log=None):
+        self._name = name
+        self._inputs = tuple(inputs)
+        self._outputs = tuple(outputs)
+        self._time = 0.
+        self._value = np.zeros(1)
+        self.received = dict((var_name, 0.) for var_name in self._inputs)
+        self.log = [] if log is None else log
+
+    def initialize(self, filename=None):
+        self._time = 0.
+
+    def update(self):
+        self._value[0] = 1. + sum(self.received.values())
+        self._time += 1.
+        self.log.append(self._name)
+
+    def update_until(self, time):
+        while self._time < time:
+            self.update()
+
+    def finalize(self):
+        pass
+
+    def get_component_name(self):
+        return self._name
+
+    def get_input_var_names(self):
+        return self._inputs
+
+    def get_output_var_names(self):
+        return self._outputs
+
+    def get_start_time(self):
+        return 0.
+
+    def get_current_time(self):
+        return self._time
+
+    def get_end_time(self):
+        return float('inf')
+
+    def get_time_step(self):
+        return 1.
+
+    def get_time_units(self):
+        return 's'
+
+    def get_var_type(self, var_name):
+        return 'float64'
+
+    def get_var_units(self, var_name):
+        return '1'
+
+    def get_var_itemsize(self, var_name):
+        return 8
+
+    def get_var_nbytes(self, var_name):
+        return 8
+
+    def get_var_grid(self, var_name):
+        return 0
+
+    def get_value(self, var_name, dest=None):
+        if dest is None:
+            return self._value.copy()
+        return copy_value(self._value, check_value_buffer(self, var_name,
+                                                          dest))
+
+    def get_value_ref(self, var_name):
+        return self._value
+
+    def set_value(self, var_name, src):
+        self.received[var_name] = float(np.asarray(src).reshape(-1)[0])
+
+    def get_grid_rank(self, grid_id):
+        return 0
+
+    def get_grid_size(self, grid_id):
+        return 1
+
+    def get_grid_type(self, grid_id):
+        return 'scalar'
+
+
+class Field(Bmi):
+
+    """A model with one variable, ``field``, on a grid of any type.
+
+    For structured grids, *x* and *y* are the coordinates along each axis
+    and a uniform rectilinear grid takes its spacing and origin from the
+    first two of each. For unstructured grids they are the coordinates of
+    each node.
+    """
+
+    def __init__(self, x, y, grid_type='uniform_rectilinear', dtype=float):
+        self._x = np.asarray(x, dtype=float)
+        self._y = np.asarray(y, dtype=float)
+        self._type = grid_type
+        if grid_type == 'unstructured':
+            self.shape = (len(self._x), )
+        else:
+            self.shape = (len(self._y), len(self._x))
+        self._values = np.zeros(int(np.prod(self.shape)), dtype=dtype)
+
+    def initialize(self, filename=None):
+        pass
+
+    def update(self):
+        pass
+
+    def finalize(self):
+        pass
+
+    def get_component_name(self):
+        return 'field'
+
+    def get_input_var_names(self):
+        return ('field', )
+
+    def get_output_var_names(self):
+        return ('field', )
+
+    def get_var_type(self, var_name):
+        return str(self._values.dtype)
+
+    def get_var_units(self, var_name):
+        return '1'
+
+    def get_var_itemsize(self, var_name):
+        return self._values.itemsize
+
+    def get_var_nbytes(self, var_name):
+        return self._values.nbytes
+
+    def get_var_grid(self, var_name):
+        return 0
+
+    def get_value(self, var_name, dest=None):
+        if dest is None:
+            return self._values.copy()
+        return copy_value(self._values,
+                          check_value_buffer(self, var_name, dest))
+
+    def get_value_ref(self, var_name):
+        return self._values
+
+    def set_value(self, var_name, src):
+        copy_value(src, self._values)
+
+    def get_grid_rank(self, grid_id):
+        return 2
+
+    def get_grid_size(self, grid_id):
+        return self._values.size
+
+    def get_grid_type(self, grid_id):
+        return self._type
+
+    def get_grid_shape(self, grid_id):
+        return np.array(self.shape)
+
+    def get_grid_spacing(self, grid_id):
+        return np.array([self._y[1] - self._y[0], self._x[1] - self._x[0]])
+
+    def get_grid_origin(self, grid_id):
+        return np.array([self._y[0], self._x[0]])
+
+    def get_grid_x(self, grid_id):
+        return self._x
+
+    def get_grid_y(self, grid_id):
+        return self._y
+
+
+class OldHeat(BmiHeat):
+
+    """A heat model whose get_value does not take a dest buffer."""
+
+    def get_value(self, var_name):
+        return super(OldHeat, self).get_value(var_name)
@@ -0,0 +1,83 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface.aio import AsyncBmi
+from basic_modeling_interface.heat import BmiHeat
+
+from .models import TEMPERATURE
+
+
+def test_update_concurrently():
+    models = [AsyncBmi(BmiHeat()), AsyncBmi(BmiHeat())]
+
+    async def run():
+        await asyncio.gather(*(bmi.initialize(None) for bmi in models))
+        await asyncio.gather(*(bmi.update() for bmi in models))
+        await asyncio.gather(*(bmi.update_frac(.5) for bmi in models))
+
+    asyncio.run(run())
+    for bmi in models:
+        assert bmi.bmi.get_current_time() == 1.5 * bmi.bmi.get_time_step()
+        bmi.shutdown()
+
+
+def test_get_and_set_value():
+    bmi = AsyncBmi(BmiHeat())
+
+    async def run():
+        await bmi.initialize(None)
+        await bmi.set_value(TEMPERATURE, np.ones(200))
+        dest = np.empty(200)
+        return await bmi.get_value(TEMPERATURE), dest, await bmi.get_value(
+            TEMPERATURE, dest)
+
+    try:
+        value, dest, result = asyncio.run(run())
+    finally:
+        bmi.shutdown()
+
+    assert np.all(value == 1.)
+    assert result is dest
+    assert np.all(dest == 1.)
+
+
+def test_calls_run_in_order():
+    bmi = AsyncBmi(BmiHeat())
+
+    async def run():
+        await bmi.initialize(None)
+        steps = [bmi.update() for _ in range(4)]
+        time = bmi.call('get_current_time')
+        await asyncio.gather(*steps)
+        return await time
+
+    try:
+        assert asyncio.run(run()) == 4 * bmi.bmi.get_time_step()
+    finally:
+        bmi.shutdown()
+
+
+def test_shared_executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    bmi = AsyncBmi(BmiHeat(), executor=executor)
+
+    async def run():
+        await bmi.initialize(None)
+
+    asyncio.run(run())
+    bmi.shutdown()
+
+    assert executor.submit(bmi.bmi.get_current_time).result() == 0.
+    executor.shutdown()
+
+
+def test_call_without_running_loop():
+    bmi = AsyncBmi(BmiHeat())
+    try:
+        with pytest.raises(RuntimeError):
+            bmi.update()
+    finally:
+        bmi.shutdown()
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from basic_modeling_interface.benchmark import (CallStats, benchmark,
+                                                benchmark_reference,
+                                                format_stats)
+from basic_modeling_interface.heat import BmiHeat
+
+from .models import TEMPERATURE, OldHeat
+
+
+@pytest.fixture(scope='module')
+def stats():
+    return benchmark(BmiHeat, n_calls=3, track_allocations=False)
+
+
+def test_calls(stats):
+    for key in [('initialize', None), ('update', None), ('finalize', None),
+                ('get_value', TEMPERATURE), ('get_value(dest)', TEMPERATURE),
+                ('get_value_ref', TEMPERATURE), ('set_value', TEMPERATURE),
+                ('get_grid_shape', 0), ('get_grid_x', 0)]:
+        assert isinstance(stats[key], CallStats)
+
+    assert stats[('update', None)].count == 3
+    assert stats[('initialize', None)].count == 1
+    assert ('get_grid_connectivity', 0) not in stats
+
+
+def test_timings(stats):
+    for stat in stats.values():
+        assert 0. <= stat.p50 <= stat.p90 <= stat.p99
+        assert stat.allocated is None
+
+
+def test_copies(stats):
+    assert stats[('get_value', TEMPERATURE)].copied == 1600.
+    assert stats[('get_value(dest)', TEMPERATURE)].copied == 1600.
+    assert stats[('get_value_ref', TEMPERATURE)].copied == 0.
+    assert stats[('update', None)].copied == 0.
+
+
+def test_allocations():
+    pytest.importorskip('tracemalloc')
+    stats = benchmark(BmiHeat, n_calls=2)
+
+    assert stats[('get_value', TEMPERATURE)].allocated >= 1600.
+
+
+def test_reference():
+    results = benchmark_reference(shapes=[(4, 5), (8, 10)], n_calls=2,
+                                  track_allocations=False)
+
+    assert sorted(results) == [(4, 5), (8, 10)]
+    assert results[(8, 10)][('get_value', TEMPERATURE)].copied == 640.
+
+
+def test_format_stats(stats):
+    lines = format_stats(stats).splitlines()
+
+    assert lines[0].split()[0] == 'call'
+    assert len(lines) == len(stats) + 2
+    assert any(line.startswith('update ') for line in lines)
+    assert any(line.startswith('get_value_ref(plate_surface__temperat...')
+               for line in lines)
+
+
+def test_benchmark_old_get_value():
+    stats = benchmark(OldHeat, n_calls=2, track_allocations=False)
+
+    assert ('get_value', TEMPERATURE) in stats
+    assert ('get_value(dest)', TEMPERATURE) not in stats
+
+
+class SettingOldHeat(OldHeat):
+
+    """An old heat model that remembers the values it is set to."""
+
+    received = []
+
+    def set_value(self, var_name, src):
+        self.received.append(np.array(src, copy=True))
+        super(SettingOldHeat, self).set_value(var_name, src)
+
+
+def test_benchmark_old_get_value_sets_values():
+    del SettingOldHeat.received[:]
+    benchmark(SettingOldHeat, n_calls=2, track_allocations=False)
+
+    bmi = OldHeat()
+    bmi.initialize(None)
+    assert len(SettingOldHeat.received) == 3
+    for src in SettingOldHeat.received:
+        assert np.array_equal(src, bmi.get_value(TEMPERATURE))
@@ -0,0 +1,201 @@
+import numpy as np
+import pytest
+
+from basic_modeling_interface.buffers import (check_value_buffer,
+                                              check_value_ref, copy_value,
+                                              empty_packed_buffer,
+                                              empty_value_buffer,
+                                              empty_value_buffers,
+                                              get_value_into,
+                                              is_value_ref_shared,
+                                              supports_dest, var_dtype,
+                                              var_shape, var_size)
+
+from .models import TEMPERATURE, OldHeat, Plate
+
+
+class CopyingPlate(Plate):
+
+    """A plate whose get_value_ref returns a copy."""
+
+    def get_value_ref(self, var_name):
+        return super(CopyingPlate, self).get_value_ref(var_name).copy()
+
+
+class ReadOnlyPlate(Plate):
+
+    """A plate whose get_value_ref returns a read-only view."""
+
+    def get_value_ref(self, var_name):
+        ref = super(ReadOnlyPlate, self).get_value_ref(var_name).view()
+        ref.flags.writeable = False
+        return ref
+
+
+class StagingPlate(Plate):
+
+    """A plate whose get_value_ref returns a buffer it never reads."""
+
+    def initialize(self, filename=None):
+        super(StagingPlate, self).initialize(filename)
+        self._staging = self._values.copy()
+
+    def get_value_ref(self, var_name):
+        return self._staging
+
+
+class ListPlate(Plate):
+
+    """A plate whose get_value_ref returns a list."""
+
+    def get_value_ref(self, var_name):
+        return super(ListPlate, self).get_value_ref(var_name).tolist()
+
+
+def test_var_dtype_and_size(plate):
+    assert var_dtype(plate, TEMPERATURE) == np.float64
+    assert var_size(plate, TEMPERATURE) == 12
+
+
+def test_var_shape(plate, monkeypatch):
+    assert var_shape(plate, TEMPERATURE) == (3, 4)
+
+    monkeypatch.setattr(plate, 'get_grid_shape', lambda grid: None)
+    assert var_shape(plate, TEMPERATURE) == (12, )
+
+
+def test_empty_value_buffer(plate):
+    dest = empty_value_buffer(plate, TEMPERATURE)
+
+    assert dest.shape == (12, )
+    assert dest.dtype == np.float64
+
+
+def test_get_value_into_dest(plate):
+    dest = empty_value_buffer(plate, TEMPERATURE)
+
+    assert plate.get_value(TEMPERATURE, dest) is dest
+    assert np.array_equal(dest, plate.get_value(TEMPERATURE))
+
+
+def test_get_values(plate):
+    values = plate.get_values([TEMPERATURE])
+
+    assert list(values) == [TEMPERATURE]
+    assert np.array_equal(values[TEMPERATURE], plate.get_value(TEMPERATURE))
+
+
+def test_get_values_into_dests(plate):
+    dests = empty_value_buffers(plate, [TEMPERATURE])
+    values = plate.get_values([TEMPERATURE], dests)
+
+    assert values[TEMPERATURE] is dests[TEMPERATURE]
+    assert np.array_equal(dests[TEMPERATURE], plate.get_value(TEMPERATURE))
+
+
+def test_get_values_into_packed_buffer(plate):
+    packed = empty_packed_buffer(plate, [TEMPERATURE])
+    plate.get_values([TEMPERATURE], packed)
+
+    assert packed.dtype.names == (TEMPERATURE, )
+    assert np.array_equal(packed[TEMPERATURE], plate.get_value(TEMPERATURE))
+
+
+def test_set_value_round_trip(plate):
+    values = np.arange(12.)[::-1].copy()
+    plate.set_value(TEMPERATURE, values)
+
+    assert np.array_equal(plate.get_value(TEMPERATURE), values)
+
+
+@pytest.mark.parametrize('dest, error', [
+    ([0.] * 12, TypeError),
+    (np.empty(12, dtype=np.float32), TypeError),
+    (np.empty(3), ValueError),
+    (np.empty(24)[::2], ValueError),
+])
+def test_check_value_buffer(plate, dest, error):
+    with pytest.raises(error):
+        check_value_buffer(plate, TEMPERATURE, dest)
+
+
+def test_check_read_only_buffer(plate):
+    dest = np.empty(12)
+    dest.flags.writeable = False
+    with pytest.raises(ValueError):
+        check_value_buffer(plate, TEMPERATURE, dest)
+
+
+def test_copy_value_ignores_shape():
+    dest = np.empty((3, 4))
+    copy_value(np.arange(12.), dest)
+
+    assert np.array_equal(dest.reshape(-1), np.arange(12.))
+
+
+def test_copy_value_size_mismatch():
+    with pytest.raises(ValueError):
+        copy_value(np.arange(3.), np.empty(4))
+
+
+def test_value_ref_is_shared(plate):
+    assert is_value_ref_shared(plate, TEMPERATURE)
+
+    ref = check_value_ref(plate, TEMPERATURE)
+    ref[0, 0] = 42.
+    assert plate.get_value(TEMPERATURE)[0] == 42.
+
+
+def test_value_ref_check_restores_values(plate):
+    is_value_ref_shared(plate, TEMPERATURE)
+
+    assert np.array_equal(plate.get_value(TEMPERATURE), np.arange(12.))
+
+
+@pytest.mark.parametrize('cls, error', [
+    (CopyingPlate, ValueError),
+    (ReadOnlyPlate, ValueError),
+    (StagingPlate, ValueError),
+    (ListPlate, TypeError),
+])
+def test_value_ref_not_zero_copy(cls, error):
+    bmi = cls()
+    bmi.initialize()
+
+    assert not is_value_ref_shared(bmi, TEMPERATURE)
+    with pytest.raises(error):
+        check_value_ref(bmi, TEMPERATURE)
+
+
+def test_supports_dest(plate):
+    assert supports_dest(plate)
+
+    old = OldHeat()
+    assert not supports_dest(old)
+
+
+def test_supports_dest_from_signature(plate, monkeypatch):
+    def get_value(var_name):
+        raise AssertionError('get_value should not be called')
+
+    monkeypatch.setattr(plate, 'get_value', get_value)
+    assert not supports_dest(plate)
+
+    monkeypatch.setattr(plate, 'get_value', lambda *args: None)
+    assert supports_dest(plate)
+
+
+def test_get_value_into(plate):
+    dest = empty_value_buffer(plate, TEMPERATURE)
+
+    assert get_value_into(plate, TEMPERATURE, dest) is dest
+    assert np.array_equal(dest, np.arange(12.))
+
+
+def test_get_value_into_old_get_value():
+    bmi = OldHeat()
+    bmi.initialize(None)
+    dest = empty_value_buffer(bmi, TEMPERATURE)
+
+    assert get_value_into(bmi, TEMPERATURE, dest) is dest
+    assert np.array_equal(dest, bmi.get_value(TEMPERATURE))
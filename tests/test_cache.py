@@ -0,0 +1,212 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface.cache import (BmiGridCache, BmiMetadataCache,
+                                            CacheInfo)
+
+from .models import TEMPERATURE, Plate
+
+
+class CountingPlate(Plate):
+
+    """A plate that counts calls to its metadata getters."""
+
+    def __init__(self):
+        super(CountingPlate, self).__init__()
+        self.calls = Counter()
+
+
+def _counted(name):
+    def method(self, *args):
+        self.calls[name] += 1
+        return getattr(super(CountingPlate, self), name)(*args)
+    return method
+
+
+for _name in (BmiMetadataCache.VAR_METADATA_METHODS +
+              BmiMetadataCache.GRID_METADATA_METHODS +
+              BmiGridCache.GRID_GEOMETRY_METHODS):
+    setattr(CountingPlate, _name, _counted(_name))
+del _name
+
+
+class CachedPlate(BmiMetadataCache, CountingPlate):
+    pass
+
+
+class GridCachedPlate(BmiGridCache, CountingPlate):
+
+    """A plate whose grid geometry is cached, with a settable version."""
+
+    GRID_CACHE_SIZE = 2
+    version = 0
+
+    def get_grid_version(self, grid_id):
+        return self.version
+
+
+@pytest.fixture
+def cached():
+    bmi = CachedPlate()
+    bmi.initialize(None)
+    yield bmi
+    bmi.finalize()
+
+
+@pytest.fixture
+def grid_cached():
+    bmi = GridCachedPlate()
+    bmi.initialize(None)
+    yield bmi
+    bmi.finalize()
+
+
+def test_hits_and_misses(cached):
+    for _ in range(3):
+        assert cached.get_var_type(TEMPERATURE) == 'float64'
+        assert cached.get_grid_rank(0) == 2
+
+    assert cached.calls['get_var_type'] == 1
+    assert cached.calls['get_grid_rank'] == 1
+
+    info = cached.metadata_cache_info()
+    assert info['get_var_type'] == CacheInfo(hits=2, misses=1, currsize=1)
+    assert info['get_grid_rank'] == CacheInfo(hits=2, misses=1, currsize=1)
+    assert info['get_var_units'] == CacheInfo(hits=0, misses=0, currsize=0)
+
+
+def test_not_cached_outside_of_run():
+    bmi = CachedPlate()
+    bmi.initialize(None)
+    bmi.get_var_units(TEMPERATURE)
+    bmi.finalize()
+    bmi.get_var_units(TEMPERATURE)
+
+    assert bmi.calls['get_var_units'] == 2
+    assert bmi.metadata_cache_info() == {}
+
+
+def test_cached_arrays_are_read_only(cached):
+    shape = cached.get_grid_shape(0)
+
+    assert cached.get_grid_shape(0) is shape
+    assert np.array_equal(shape, [3, 4])
+    with pytest.raises(ValueError):
+        shape[0] = 1
+
+
+def test_clear_var_metadata(cached):
+    cached.get_var_nbytes(TEMPERATURE)
+    cached.clear_var_metadata(TEMPERATURE)
+    cached.get_var_nbytes(TEMPERATURE)
+
+    assert cached.calls['get_var_nbytes'] == 2
+
+
+def test_clear_grid_metadata_clears_its_variables(cached):
+    cached.get_var_grid(TEMPERATURE)
+    cached.get_var_nbytes(TEMPERATURE)
+    cached.get_grid_size(0)
+
+    cached.clear_grid_metadata(1)
+    cached.get_var_nbytes(TEMPERATURE)
+    cached.get_grid_size(0)
+    assert cached.calls['get_var_nbytes'] == 1
+    assert cached.calls['get_grid_size'] == 1
+
+    cached.clear_grid_metadata(0)
+    cached.get_var_nbytes(TEMPERATURE)
+    cached.get_grid_size(0)
+    assert cached.calls['get_var_nbytes'] == 2
+    assert cached.calls['get_grid_size'] == 2
+
+
+def test_clear_metadata_cache(cached):
+    cached.get_var_type(TEMPERATURE)
+    cached.get_grid_type(0)
+    cached.clear_metadata_cache()
+
+    info = cached.metadata_cache_info()
+    assert info['get_var_type'].currsize == 0
+    assert info['get_grid_type'].currsize == 0
+
+
+def test_grid_hits_and_misses(grid_cached):
+    for _ in range(3):
+        assert np.array_equal(grid_cached.get_grid_x(0), [0., 1., 2., 3.])
+    grid_cached.get_grid_y(0)
+
+    assert grid_cached.calls['get_grid_x'] == 1
+    assert grid_cached.grid_cache_info() == {
+        'hits': 2, 'misses': 2, 'evictions': 0, 'currsize': 1}
+
+
+def test_grid_geometry_is_read_only(grid_cached):
+    x = grid_cached.get_grid_x(0)
+
+    assert not x.flags.writeable
+    with pytest.raises(ValueError):
+        x[0] = 1.
+
+
+def test_grid_geometry_is_a_view(grid_cached, monkeypatch):
+    x = np.arange(4.)
+    monkeypatch.setattr(Plate, 'get_grid_x', lambda self, grid: x)
+    cached = grid_cached.get_grid_x(0)
+
+    assert not cached.flags.owndata
+    assert np.shares_memory(cached, x)
+    assert x.flags.writeable
+    x[0] = 42.
+    assert grid_cached.get_grid_x(0)[0] == 42.
+
+
+def test_grid_not_cached_outside_of_run():
+    bmi = GridCachedPlate()
+    bmi.get_grid_x(0)
+    bmi.get_grid_x(0)
+
+    assert bmi.calls['get_grid_x'] == 2
+    assert bmi.grid_cache_info() == {}
+
+
+def test_grid_version_change(grid_cached):
+    grid_cached.get_grid_x(0)
+    grid_cached.get_grid_x(0)
+    grid_cached.version += 1
+    grid_cached.get_grid_x(0)
+    grid_cached.get_grid_x(0)
+
+    assert grid_cached.calls['get_grid_x'] == 2
+    assert grid_cached.grid_cache_info()['currsize'] == 1
+
+
+def test_least_recently_used_grid_is_evicted(grid_cached):
+    grid_cached.get_grid_x(0)
+    grid_cached.get_grid_x(1)
+    grid_cached.get_grid_x(0)
+    grid_cached.get_grid_x(2)
+
+    info = grid_cached.grid_cache_info()
+    assert info['evictions'] == 1
+    assert info['currsize'] == 2
+
+    grid_cached.get_grid_x(0)
+    assert grid_cached.calls['get_grid_x'] == 3
+    grid_cached.get_grid_x(1)
+    assert grid_cached.calls['get_grid_x'] == 4
+
+
+def test_clear_grid_geometry(grid_cached):
+    grid_cached.get_grid_x(0)
+    grid_cached.get_grid_x(1)
+
+    grid_cached.clear_grid_geometry(0)
+    grid_cached.get_grid_x(0)
+    grid_cached.get_grid_x(1)
+    assert grid_cached.calls['get_grid_x'] == 3
+
+    grid_cached.clear_grid_geometry()
+    assert grid_cached.grid_cache_info()['currsize'] == 0
@@ -0,0 +1,186 @@
+import numpy as np
+import pytest
+
+from basic_modeling_interface.check import check_model, load_class, main
+from basic_modeling_interface.heat import BmiHeat
+
+from .models import TEMPERATURE, OldHeat, Plate
+
+VAR = 'var ' + TEMPERATURE
+
+
+def _statuses(findings, subject):
+    return [finding.status for finding in findings
+            if finding.subject == subject]
+
+
+def _messages(findings, status):
+    return [finding.message for finding in findings
+            if finding.status == status]
+
+
+def test_check_heat(heat):
+    findings = check_model(heat)
+
+    assert 'fail' not in [finding.status for finding in findings]
+    assert _statuses(findings, 'time') == ['ok']
+    assert _statuses(findings, 'grid 0') == ['ok']
+    assert _statuses(findings, VAR) == ['ok', 'ok']
+
+
+def test_check_copying_value_ref(plate, monkeypatch):
+    monkeypatch.setattr(plate, 'get_value_ref',
+                        lambda name: plate.get_value(name))
+
+    assert _statuses(check_model(plate), VAR) == ['warn', 'ok']
+
+
+@pytest.mark.parametrize('method,value,message', [
+    ('get_var_itemsize', 4, 'get_var_itemsize (4) != itemsize'),
+    ('get_var_nbytes', 48, 'get_var_nbytes (48) != get_var_itemsize'),
+])
+def test_check_inconsistent_var(plate, monkeypatch, method, value, message):
+    monkeypatch.setattr(plate, method, lambda name: value)
+    failures = _messages(check_model(plate), 'fail')
+
+    assert any(failure.startswith(message) for failure in failures)
+
+
+def test_check_var_type(plate, monkeypatch):
+    monkeypatch.setattr(plate, 'get_var_type', lambda name: 'not_a_type')
+
+    assert _statuses(check_model(plate), VAR) == ['fail']
+
+
+def test_check_get_value(plate, monkeypatch):
+    monkeypatch.setattr(plate, 'get_value',
+                        lambda name, dest=None: np.zeros(12, dtype=int))
+
+    assert 'get_value returns int64, not float64' in _messages(
+        check_model(plate), 'fail')
+
+
+@pytest.mark.parametrize('method,value', [
+    ('get_grid_shape', np.array([12])),
+    ('get_grid_shape', np.array([4, 4])),
+    ('get_grid_spacing', np.array([1.])),
+])
+def test_check_inconsistent_grid(plate, monkeypatch, method, value):
+    monkeypatch.setattr(plate, method, lambda grid: value)
+
+    assert _statuses(check_model(plate), 'grid 0')[0] == 'fail'
+
+
+def test_check_unknown_grid_type(plate, monkeypatch):
+    monkeypatch.setattr(plate, 'get_grid_type', lambda grid: 'hexagons')
+
+    assert _statuses(check_model(plate), 'grid 0') == ['warn']
+
+
+def test_check_unstructured_grid(plate, monkeypatch):
+    monkeypatch.setattr(plate, 'get_grid_type', lambda grid: 'unstructured')
+    monkeypatch.setattr(plate, 'get_grid_connectivity', lambda grid: None)
+    monkeypatch.setattr(plate, 'get_grid_offset', lambda grid: None)
+    assert _statuses(check_model(plate), 'grid 0') == ['fail']
+
+    monkeypatch.setattr(plate, 'get_grid_connectivity',
+                        lambda grid: np.array([0, 1, 12]))
+    monkeypatch.setattr(plate, 'get_grid_offset', lambda grid: np.array([3]))
+    assert _messages(check_model(plate), 'fail')[0].startswith(
+        'connectivity and offset are inconsistent')
+
+    monkeypatch.setattr(plate, 'get_grid_connectivity',
+                        lambda grid: np.array([0, 1, 5, 4]))
+    monkeypatch.setattr(plate, 'get_grid_offset', lambda grid: np.array([4]))
+    assert _statuses(check_model(plate), 'grid 0') == ['ok']
+
+
+def test_check_time(plate, monkeypatch):
+    monkeypatch.setattr(plate, 'get_current_time', lambda: -1.)
+    monkeypatch.setattr(plate, 'get_time_step', lambda: 0.)
+
+    assert _statuses(check_model(plate), 'time') == ['fail', 'warn']
+
+
+@pytest.mark.parametrize('path', ['tests.models.Plate',
+                                  'tests.models:Plate'])
+def test_load_class(path):
+    assert load_class(path) is Plate
+
+
+@pytest.mark.parametrize('path', ['Plate', 'tests.models:'])
+def test_load_class_bad_path(path):
+    with pytest.raises(ValueError):
+        load_class(path)
+
+
+def test_main(capsys):
+    status = main(['basic_modeling_interface.heat.BmiHeat', '--n-calls', '2',
+                   '--no-allocations'])
+    out = capsys.readouterr()[0]
+
+    assert status == 0
+    assert 'OK   ' + VAR + ': get_value_ref is zero-copy' in out
+    assert 'p50 (us)' in out
+
+
+def test_check_old_get_value():
+    bmi = OldHeat()
+    bmi.initialize(None)
+    findings = check_model(bmi)
+
+    assert 'fail' not in _statuses(findings, VAR)
+    assert 'get_value does not accept a dest buffer' in _messages(
+        findings, 'warn')
+
+
+def test_check_get_value_dest(plate, monkeypatch):
+    def get_value(var_name, dest=None):
+        if dest is None:
+            return np.arange(12.)
+        dest[:] = 0.
+        return dest
+
+    monkeypatch.setattr(plate, 'get_value', get_value)
+
+    assert 'get_value fills dest with different values' in _messages(
+        check_model(plate), 'fail')
+
+
+def test_check_get_value_dest_raises(plate, monkeypatch):
+    def get_value(var_name, dest=None):
+        if dest is None:
+            return np.arange(12.)
+        raise TypeError('dest is not used')
+
+    monkeypatch.setattr(plate, 'get_value', get_value)
+    findings = check_model(plate)
+
+    assert 'get_value with a dest buffer raises: dest is not used' in (
+        _messages(findings, 'fail'))
+    assert 'get_value does not accept a dest buffer' not in _messages(
+        findings, 'warn')
+
+
+def test_main_old_get_value(capsys):
+    status = main(['tests.models.OldHeat', '--n-calls', '2'])
+
+    assert status == 0
+    assert 'get_value does not accept a dest buffer' in capsys.readouterr()[0]
+
+
+class BadHeat(BmiHeat):
+
+    """A heat model that misreports the size of its variable."""
+
+    def get_var_nbytes(self, var_name):
+        return 8
+
+
+def test_main_fails(capsys):
+    status = main(['tests.test_check:BadHeat', '--no-timings'])
+    out = capsys.readouterr()[0]
+
+    assert status == 1
+    assert 'FAIL ' + VAR in out
+    assert 'p50 (us)' not in out
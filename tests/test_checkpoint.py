@@ -0,0 +1,163 @@
+import os
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface.checkpoint import (ALIGNMENT, MAGIC,
+                                                 load_checkpoint,
+                                                 read_checkpoint_header,
+                                                 save_checkpoint)
+from basic_modeling_interface.heat import BmiHeat
+
+from .models import TEMPERATURE, OldHeat
+
+
+@pytest.fixture
+def other():
+    bmi = BmiHeat()
+    bmi.initialize(None)
+    yield bmi
+    bmi.finalize()
+
+
+def test_save_and_load(heat, other, tmpdir):
+    filename = str(tmpdir.join('heat.ckpt'))
+    saved = heat.get_value(TEMPERATURE)
+    header = save_checkpoint(heat, filename)
+
+    assert read_checkpoint_header(filename) == header
+    assert header['time'] == heat.get_current_time()
+    assert header['component'] == heat.get_component_name()
+    assert header['order'] == [TEMPERATURE]
+    assert header['vars'][TEMPERATURE] == {
+        'type': '<f8', 'shape': [10, 20], 'nbytes': 1600, 'offset': 0}
+
+    assert load_checkpoint(other, filename) == [TEMPERATURE]
+    assert np.array_equal(other.get_value(TEMPERATURE), saved)
+
+
+def test_save_old_get_value(other, tmpdir):
+    filename = str(tmpdir.join('heat.ckpt'))
+    bmi = OldHeat()
+    bmi.initialize(None)
+    bmi.update()
+    save_checkpoint(bmi, filename)
+
+    assert load_checkpoint(other, filename) == [TEMPERATURE]
+    assert np.array_equal(other.get_value(TEMPERATURE),
+                          bmi.get_value(TEMPERATURE))
+
+
+def test_layout(plate, tmpdir):
+    filename = str(tmpdir.join('plate.ckpt'))
+    header = save_checkpoint(plate, filename)
+
+    with open(filename, 'rb') as fp:
+        contents = fp.read()
+    var = header['vars'][TEMPERATURE]
+    start = len(contents) - ALIGNMENT * 2
+
+    assert contents.startswith(MAGIC)
+    assert len(contents) % ALIGNMENT == 0
+    assert np.array_equal(
+        np.frombuffer(contents[start:start + var['nbytes']],
+                      dtype=var['type']), plate.get_value(TEMPERATURE))
+
+
+def test_load_mismatched_model(heat, tmpdir):
+    filename = str(tmpdir.join('heat.ckpt'))
+    save_checkpoint(heat, filename)
+
+    config = tmpdir.join('heat.yaml')
+    config.write('shape: [4, 5]\n')
+    other = BmiHeat()
+    other.initialize(str(config))
+    try:
+        with pytest.raises(ValueError):
+            load_checkpoint(other, filename)
+    finally:
+        other.finalize()
+
+
+def test_load_not_a_checkpoint(tmpdir):
+    filename = tmpdir.join('junk.ckpt')
+    filename.write('not a checkpoint')
+
+    with pytest.raises(ValueError):
+        read_checkpoint_header(str(filename))
+
+
+def test_failed_save_keeps_checkpoint(heat, tmpdir, monkeypatch):
+    filename = str(tmpdir.join('heat.ckpt'))
+    header = save_checkpoint(heat, filename)
+    heat.update()
+
+    def fail(var_name, dest=None):
+        raise RuntimeError('get_value failed')
+
+    monkeypatch.setattr(heat, 'get_value', fail)
+    with pytest.raises(RuntimeError):
+        save_checkpoint(heat, filename)
+
+    assert os.listdir(str(tmpdir)) == ['heat.ckpt']
+    assert read_checkpoint_header(filename) == header
+
+
+def test_load_without_value_ref(heat, other, tmpdir, monkeypatch):
+    filename = str(tmpdir.join('heat.ckpt'))
+    save_checkpoint(heat, filename)
+    monkeypatch.setattr(other, 'get_value_ref', lambda name: None)
+
+    assert load_checkpoint(other, filename) == [TEMPERATURE]
+    assert np.array_equal(other.get_value(TEMPERATURE),
+                          heat.get_value(TEMPERATURE))
+
+
+def test_skip_unshared_output(heat, other, tmpdir, monkeypatch):
+    filename = str(tmpdir.join('heat.ckpt'))
+    save_checkpoint(heat, filename)
+    monkeypatch.setattr(other, 'get_value_ref', lambda name: None)
+    monkeypatch.setattr(other, 'get_input_var_names', lambda: ())
+
+    assert load_checkpoint(other, filename) == []
+
+
+def test_load_output_through_value_ref(heat, other, tmpdir, monkeypatch):
+    filename = str(tmpdir.join('heat.ckpt'))
+    save_checkpoint(heat, filename)
+    monkeypatch.setattr(other, 'get_input_var_names', lambda: ())
+    monkeypatch.setattr(other, 'set_value', None)
+
+    assert load_checkpoint(other, filename) == [TEMPERATURE]
+    assert np.array_equal(other.get_value(TEMPERATURE),
+                          heat.get_value(TEMPERATURE))
+
+
+def test_load_into_proxy(heat, tmpdir):
+    pytest.importorskip('multiprocessing.shared_memory')
+    from basic_modeling_interface.proxy import BmiProxy
+
+    filename = str(tmpdir.join('heat.ckpt'))
+    save_checkpoint(heat, filename)
+    with BmiProxy(BmiHeat) as proxy:
+        proxy.initialize(None)
+        try:
+            assert load_checkpoint(proxy, filename) == [TEMPERATURE]
+            assert np.array_equal(proxy.get_value(TEMPERATURE),
+                                  heat.get_value(TEMPERATURE))
+        finally:
+            proxy.finalize()
+
+
+def test_load_with_unshared_value_ref(plate, tmpdir, monkeypatch):
+    filename = str(tmpdir.join('plate.ckpt'))
+    save_checkpoint(plate, filename)
+    plate.update()
+    staging = np.zeros((3, 4))
+    monkeypatch.setattr(plate, 'get_value_ref', lambda name: staging)
+
+    assert load_checkpoint(plate, filename) == [TEMPERATURE]
+    assert np.array_equal(plate.get_value(TEMPERATURE), np.arange(12.))
+
+    monkeypatch.setattr(plate, 'get_input_var_names', lambda: ())
+    assert load_checkpoint(plate, filename) == []
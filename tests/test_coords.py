@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from basic_modeling_interface.coords import UniformRectilinearCoords
+
+
+@pytest.fixture
+def coords():
+    return UniformRectilinearCoords((3, 4), (2., 1.), (0., 10.))
+
+
+def test_from_bmi(plate):
+    coords = UniformRectilinearCoords.from_bmi(plate, 0)
+
+    assert coords.shape == (3, 4)
+    assert coords.ndim == 2
+    assert coords.size == 12
+    assert np.array_equal(coords.spacing, [1., 1.])
+    assert np.array_equal(coords.origin, [0., 0.])
+
+
+def test_mismatched_lengths():
+    with pytest.raises(ValueError):
+        UniformRectilinearCoords((3, 4), (1., ), (0., 0.))
+
+
+def test_getitem(coords):
+    y, x = coords[1:, :2]
+
+    assert np.array_equal(y, [[2.], [4.]])
+    assert np.array_equal(x, [[10., 11.]])
+
+
+def test_negative_index(coords):
+    assert coords.axis(1, -1) == 13.
+    assert np.array_equal(coords.axis(0, [0, -1]), [0., 4.])
+
+
+def test_too_many_indices(coords):
+    with pytest.raises(IndexError):
+        coords[0, 0, 0]
+
+
+@pytest.mark.parametrize('key', [3, -4, (0, 4), (0, [1, 4]), (0, -5)])
+def test_index_out_of_bounds(coords, key):
+    with pytest.raises(IndexError):
+        coords[key]
+
+
+def test_locate_inverts_at(coords):
+    y, x = coords.at([0, 5, 11])
+
+    assert np.array_equal(y, [0., 2., 4.])
+    assert np.array_equal(x, [10., 11., 13.])
+    assert np.allclose(coords.locate(y, x), ([0, 1, 2], [0, 1, 3]))
+
+
+def test_tiles_cover_grid(coords):
+    y, x = coords.materialize()
+    seen = np.zeros(coords.shape, dtype=int)
+    for key, (tile_y, tile_x) in coords.tiles((2, 3)):
+        seen[key] += 1
+        assert np.array_equal(np.broadcast_to(tile_y, y[key].shape), y[key])
+        assert np.array_equal(np.broadcast_to(tile_x, x[key].shape), x[key])
+
+    assert np.all(seen == 1)
+
+
+def test_materialize(coords):
+    y, x = coords.materialize()
+
+    assert y.shape == x.shape == (3, 4)
+    assert y.flags['C_CONTIGUOUS'] and x.flags['C_CONTIGUOUS']
+    assert np.array_equal(x[2], [10., 11., 12., 13.])
+    assert np.array_equal(y[:, 3], [0., 2., 4.])
@@ -0,0 +1,137 @@
+import pytest
+
+pytest.importorskip('concurrent.futures')
+
+from basic_modeling_interface import coupler as _coupler  # noqa: E402
+from basic_modeling_interface.coupler import (Connection,  # noqa: E402
+                                              Coupler, dependency_levels,
+                                              find_connections, pass_value)
+
+from .models import Relay  # noqa: E402
+
+
+@pytest.fixture
+def chain():
+    """Three components, each downstream of the ones before it."""
+    log = []
+    return {'a': Relay('a', outputs=('x', ), log=log),
+            'b': Relay('b', inputs=('x', ), outputs=('y', ), log=log),
+            'c': Relay('c', inputs=('x', 'y'), outputs=('z', ), log=log)}
+
+
+def _value(bmi, var_name):
+    return bmi.get_value(var_name)[0]
+
+
+def test_find_connections(chain):
+    assert find_connections(chain) == [Connection('a', 'b', 'x'),
+                                       Connection('a', 'c', 'x'),
+                                       Connection('b', 'c', 'y')]
+
+
+def test_no_connection_to_self():
+    components = {'a': Relay('a', inputs=('x', ), outputs=('x', ))}
+
+    assert find_connections(components) == []
+
+
+def test_dependency_levels(chain):
+    assert dependency_levels(chain, find_connections(chain)) == [
+        ['a'], ['b'], ['c']]
+    assert dependency_levels(['b', 'a', 'c'], []) == [['a', 'b', 'c']]
+
+
+def test_dependency_levels_with_cycle():
+    connections = [Connection('a', 'b', 'x'), Connection('b', 'c', 'y'),
+                   Connection('c', 'b', 'z'), Connection('c', 'd', 'z'),
+                   Connection('e', 'd', 'w')]
+
+    assert dependency_levels('abcde', connections) == [
+        ['a', 'e'], ['b', 'c'], ['d']]
+
+
+def test_update_in_order(chain):
+    coupler = Coupler(chain)
+    try:
+        assert coupler.levels == [['a'], ['b'], ['c']]
+        coupler.update()
+    finally:
+        coupler.close()
+
+    assert chain['a'].log == ['a', 'b', 'c']
+    assert _value(chain['a'], 'x') == 1.
+    assert _value(chain['b'], 'y') == 2.
+    assert _value(chain['c'], 'z') == 4.
+
+
+def test_cycle_is_lagged():
+    components = {'p': Relay('p', inputs=('q', ), outputs=('p', )),
+                  'q': Relay('q', inputs=('p', ), outputs=('q', ))}
+    coupler = Coupler(components)
+    try:
+        assert coupler.levels == [['p', 'q']]
+        coupler.update()
+        assert components['p'].received == {'q': 0.}
+        coupler.update()
+    finally:
+        coupler.close()
+
+    assert components['p'].received == {'q': 1.}
+    assert _value(components['p'], 'p') == 2.
+    assert _value(components['q'], 'q') == 2.
+
+
+def test_explicit_connections(chain):
+    coupler = Coupler(chain, connections=[Connection('a', 'c', 'x')])
+    try:
+        assert coupler.levels == [['a', 'b'], ['c']]
+        coupler.update()
+    finally:
+        coupler.close()
+
+    assert chain['b'].received == {'x': 0.}
+    assert chain['c'].received == {'x': 1., 'y': 0.}
+
+
+def test_exchange_without_value_ref(chain):
+    chain['a'].get_value_ref = lambda var_name: None
+    chain['a'].update()
+    coupler = Coupler(chain)
+    try:
+        coupler.exchange('b')
+    finally:
+        coupler.close()
+
+    assert chain['b'].received == {'x': 1.}
+
+
+def test_requires_concurrent_futures(chain, monkeypatch):
+    monkeypatch.setattr(_coupler, 'ThreadPoolExecutor', None)
+
+    with pytest.raises(RuntimeError):
+        Coupler(chain)
+
+
+def test_pass_value(chain):
+    chain['a'].update()
+    pass_value(chain['a'], chain['c'], 'x')
+
+    assert chain['c'].received == {'x': 1., 'y': 0.}
+
+    chain['b'].get_value_ref = lambda var_name: None
+    chain['b'].update()
+    pass_value(chain['b'], chain['c'], 'y')
+
+    assert chain['c'].received == {'x': 1., 'y': 1.}
+
+
+def test_update_until(chain):
+    coupler = Coupler(chain)
+    try:
+        coupler.update_until(3.)
+    finally:
+        coupler.close()
+
+    assert [chain[name].get_current_time() for name in 'abc'] == [3.] * 3
+    assert chain['a'].log == ['a'] * 3 + ['b'] * 3 + ['c'] * 3
+    assert chain['c'].received == {'x': 1., 'y': 2.}
@@ -0,0 +1,70 @@
+import pytest
+
+from basic_modeling_interface.base import BmiBase
+from basic_modeling_interface.driver import advance, plan_steps
+from basic_modeling_interface.units import BmiUnitConverter
+
+from .models import Clock
+
+
+class SteppingClock(Clock):
+
+    """A clock that can only take whole steps."""
+
+    update_until = BmiBase.update_until
+
+
+@pytest.mark.parametrize('current_time, time, time_step, expected', [
+    (0., 2.5, 1., (2, .5)),
+    (0., 3., 1., (3, 0.)),
+    (0., .3, .1, (3, 0.)),
+    (1., 1., 1., (0, 0.)),
+    (2., 1., 1., (0, 0.)),
+    (0., 1., 0., (0, 0.)),
+])
+def test_plan_steps(current_time, time, time_step, expected):
+    assert plan_steps(current_time, time, time_step) == expected
+
+
+def test_advance_with_update_frac(heat):
+    time = heat.get_current_time() + 2.5 * heat.get_time_step()
+
+    assert advance(heat, time) == pytest.approx(time)
+
+
+def test_advance_falls_back_to_update_until():
+    clock = Clock()
+    clock.initialize()
+
+    assert advance(clock, 2.5) == 2.5
+    assert clock.get_value('count')[0] == 2.
+
+
+def test_advance_falls_back_to_update():
+    clock = SteppingClock()
+    clock.initialize()
+
+    assert advance(clock, 2.5) == 3.
+
+
+def test_advance_wrapped_falls_back_to_update_until():
+    clock = Clock()
+    clock.initialize()
+
+    assert advance(BmiUnitConverter(clock, {}), 2.5) == 2.5
+    assert clock.get_value('count')[0] == 2.
+
+
+def test_advance_wrapped_falls_back_to_update():
+    clock = SteppingClock()
+    clock.initialize()
+
+    assert advance(BmiUnitConverter(clock, {}), 2.5) == 3.
+
+
+def test_advance_many():
+    clocks = [Clock(), SteppingClock()]
+    for clock in clocks:
+        clock.initialize()
+
+    assert advance(clocks, 1.5) == [1.5, 2.]
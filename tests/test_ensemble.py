@@ -0,0 +1,116 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface.heat import BmiHeat
+
+pytest.importorskip('multiprocessing.shared_memory')
+
+from basic_modeling_interface.ensemble import (EXITED_ERROR,  # noqa: E402
+                                               run_ensemble)
+
+from .models import TEMPERATURE, OldHeat  # noqa: E402
+
+
+class FragileHeat(BmiHeat):
+
+    """A heat model that raises, or kills its process, when told to."""
+
+    def initialize(self, filename=None):
+        if filename == 'raise':
+            raise ValueError('bad configuration')
+        elif filename == 'exit':
+            os._exit(1)
+        super(FragileHeat, self).initialize(filename)
+
+
+def _heat_at(time, filename=None):
+    bmi = BmiHeat()
+    bmi.initialize(filename)
+    bmi.update_until(time)
+    return bmi.get_value(TEMPERATURE)
+
+
+def test_ensemble():
+    result = run_ensemble(FragileHeat, [None, 'raise', None], [TEMPERATURE],
+                          time=1., processes=2)
+
+    assert result.filenames == (None, 'raise', None)
+    assert result.succeeded == (0, 2)
+    assert result.failed == (1, )
+    assert 'bad configuration' in result.errors[1]
+
+    values = result.values[TEMPERATURE]
+    assert values.shape == (3, 200)
+    assert np.array_equal(values[0], _heat_at(1.))
+    assert np.array_equal(values[2], values[0])
+    assert not np.any(values[1])
+
+
+def test_member_kills_worker():
+    result = run_ensemble(FragileHeat, [None, 'raise', 'exit', None],
+                          [TEMPERATURE], time=1., processes=2)
+
+    assert result.succeeded == (0, 3)
+    assert result.failed == (1, 2)
+    assert 'bad configuration' in result.errors[1]
+    assert result.errors[2] == EXITED_ERROR
+
+    values = result.values[TEMPERATURE]
+    assert np.array_equal(values[0], _heat_at(1.))
+    assert np.array_equal(values[3], values[0])
+    assert not np.any(values[1:3])
+
+
+def test_members_with_different_configs(tmpdir):
+    filenames = []
+    for alpha in (.5, 1.):
+        config = tmpdir.join('heat-{0}.yaml'.format(alpha))
+        config.write('alpha: {0}\n'.format(alpha))
+        filenames.append(str(config))
+
+    result = run_ensemble(BmiHeat, filenames, [TEMPERATURE], time=2.,
+                          processes=2)
+
+    assert result.failed == ()
+    for index, filename in enumerate(filenames):
+        assert np.array_equal(result.values[TEMPERATURE][index],
+                              _heat_at(2., filename))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11),
+                    reason='max_tasks_per_child requires Python 3.11')
+def test_maxtasksperchild():
+    result = run_ensemble(BmiHeat, [None] * 3, [TEMPERATURE], time=1.,
+                          processes=2, maxtasksperchild=1)
+
+    assert result.failed == ()
+    assert np.array_equal(result.values[TEMPERATURE][2], _heat_at(1.))
+
+
+@pytest.mark.skipif(sys.version_info >= (3, 11),
+                    reason='max_tasks_per_child requires Python 3.11')
+def test_maxtasksperchild_unsupported():
+    with pytest.raises(RuntimeError):
+        run_ensemble(BmiHeat, [None], [TEMPERATURE], maxtasksperchild=1)
+
+
+def test_old_get_value():
+    result = run_ensemble(OldHeat, [None], [TEMPERATURE], time=1.,
+                          processes=1)
+
+    assert result.failed == ()
+    assert np.array_equal(result.values[TEMPERATURE][0], _heat_at(1.))
+
+
+def test_size_mismatch(tmpdir):
+    config = tmpdir.join('heat.yaml')
+    config.write('shape: [4, 5]\n')
+
+    result = run_ensemble(BmiHeat, [None, str(config)], [TEMPERATURE],
+                          time=1., processes=1)
+
+    assert len(result.failed) == 1
+    assert 'size mismatch' in result.errors[result.failed[0]]
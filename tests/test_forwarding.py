@@ -0,0 +1,45 @@
+from basic_modeling_interface.bmi import Bmi
+from basic_modeling_interface.forwarding import forward_methods
+
+
+class Recorder(Bmi):
+
+    """A model that records the calls forwarded to it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _call(self, method, *args, **kwds):
+        self.calls.append((method, args, kwds))
+        return method
+
+    def get_component_name(self):
+        return 'recorder'
+
+
+forward_methods(Recorder, 'Record a call to :func:`{name}`.')
+
+
+def test_forwarded_methods():
+    bmi = Recorder()
+
+    assert bmi.update_until(2.) == 'update_until'
+    assert bmi.get_value('x', dest=None) == 'get_value'
+    assert bmi.calls == [('update_until', (2., ), {}),
+                         ('get_value', ('x', ), {'dest': None})]
+    assert Recorder.update.__name__ == 'update'
+    assert Recorder.update.__doc__ == 'Record a call to :func:`update`.'
+
+
+def test_defined_methods_are_kept():
+    bmi = Recorder()
+
+    assert bmi.get_component_name() == 'recorder'
+    assert bmi.calls == []
+
+
+def test_get_values_is_inherited():
+    bmi = Recorder()
+
+    assert bmi.get_values(['x', 'y']) == {'x': 'get_value', 'y': 'get_value'}
+    assert [call[0] for call in bmi.calls] == ['get_value', 'get_value']
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from basic_modeling_interface.buffers import check_value_ref
+from basic_modeling_interface.heat import BmiHeat, read_config
+from basic_modeling_interface.indices import IndexSet
+
+from .models import TEMPERATURE
+
+
+def test_read_config(tmpdir):
+    config = tmpdir.join('heat.yaml')
+    config.write('# A comment\n\nshape: [4, 5]\nalpha: 0.5\n')
+
+    assert read_config(str(config)) == {'shape': [4, 5], 'alpha': .5}
+
+
+def test_initialize_from_config(tmpdir):
+    config = tmpdir.join('heat.yaml')
+    config.write('shape: [4, 5]\nspacing: [2., 1.]\norigin: [1., 0.]\n'
+                 'alpha: 0.5\nend_time: 10.\n')
+    bmi = BmiHeat()
+    bmi.initialize(str(config))
+
+    assert np.array_equal(bmi.get_grid_shape(0), [4, 5])
+    assert np.array_equal(bmi.get_grid_y(0), [1., 3., 5., 7.])
+    assert np.array_equal(bmi.get_grid_x(0), [0., 1., 2., 3., 4.])
+    assert bmi.get_time_step() == .5
+    assert bmi.get_end_time() == 10.
+
+
+def test_diffusion(heat):
+    values = heat.get_value_ref(TEMPERATURE)
+
+    assert heat.get_current_time() == heat.get_time_step()
+    assert values.sum() == pytest.approx(100.)
+    assert values[5, 10] == pytest.approx(0.)
+    for neighbor in [(4, 10), (6, 10), (5, 9), (5, 11)]:
+        assert values[neighbor] == pytest.approx(25.)
+
+
+def test_boundaries_are_fixed(heat):
+    heat.update_until(50.)
+    values = heat.get_value_ref(TEMPERATURE)
+
+    assert values.sum() < 100.
+    assert values[5, 9] == pytest.approx(values[5, 11])
+    for edge in [values[0], values[-1], values[:, 0], values[:, -1]]:
+        assert np.all(edge == 0.)
+
+
+def test_update_until(heat):
+    time = heat.get_current_time() + 2.5 * heat.get_time_step()
+    heat.update_until(time)
+
+    assert heat.get_current_time() == pytest.approx(time)
+
+
+def test_update_frac(heat):
+    time = heat.get_current_time()
+    heat.update_frac(.25)
+
+    assert heat.get_current_time() == pytest.approx(
+        time + .25 * heat.get_time_step())
+
+
+def test_value_ref_is_zero_copy(heat):
+    ref = check_value_ref(heat, TEMPERATURE)
+
+    assert ref.shape == (10, 20)
+
+
+@pytest.mark.parametrize('indices', [[0, 105, 199], IndexSet([199, 0, 105])])
+def test_values_at_indices(heat, indices):
+    values = heat.get_value_at_indices(TEMPERATURE, indices)
+    assert np.array_equal(values, heat.get_value(TEMPERATURE)[[0, 105, 199]])
+
+    heat.set_value_at_indices(TEMPERATURE, indices, [1., 2., 3.])
+    assert np.array_equal(heat.get_value(TEMPERATURE)[[0, 105, 199]],
+                          [1., 2., 3.])
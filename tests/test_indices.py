@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from basic_modeling_interface.indices import IndexSet
+
+from .models import TEMPERATURE
+
+# One long run, gathered with slices, and no runs, gathered with take.
+INDICES = [np.arange(8, 72), np.arange(0, 128, 2)]
+
+
+def test_sorted_and_unique():
+    indices = IndexSet([7, 3, 3, 0, 7], size=8)
+
+    assert np.array_equal(indices.indices, [0, 3, 7])
+    assert len(indices) == 3
+    assert list(indices) == [0, 3, 7]
+    assert indices.size == 8
+    assert not indices.indices.flags.writeable
+
+
+def test_runs():
+    indices = IndexSet([10, 5, 6, 7, 1, 2])
+
+    assert indices.slices == (slice(1, 3), slice(5, 8), slice(10, 11))
+
+
+def test_empty():
+    indices = IndexSet([])
+
+    assert len(indices) == 0
+    assert indices.slices == ()
+    assert indices.take(np.arange(4.)).shape == (0, )
+
+
+@pytest.mark.parametrize('indices, error', [
+    ([0., 1.], TypeError),
+    ([-1, 2], ValueError),
+    ([1, 8], ValueError),
+])
+def test_invalid(indices, error):
+    with pytest.raises(error):
+        IndexSet(indices, size=8)
+
+
+def test_as_array():
+    indices = IndexSet([2, 1])
+
+    assert np.array_equal(np.asarray(indices), [1, 2])
+    assert np.asarray(indices, dtype=np.int32).dtype == np.int32
+    assert np.array_equal(np.arange(10.)[indices], [1., 2.])
+
+
+@pytest.mark.parametrize('indices', INDICES)
+def test_take(indices):
+    array = np.arange(256.).reshape((16, 16))
+    index_set = IndexSet(indices)
+
+    assert np.array_equal(index_set.take(array), array.reshape(-1)[indices])
+
+    out = np.empty(len(index_set))
+    assert index_set.take(array, out=out) is out
+    assert np.array_equal(out, array.reshape(-1)[indices])
+
+
+@pytest.mark.parametrize('indices', INDICES)
+def test_put(indices):
+    array = np.zeros((16, 16))
+    values = np.arange(len(indices), dtype=float) + 1.
+    IndexSet(indices).put(array, values)
+
+    expected = np.zeros(256)
+    expected[indices] = values
+    assert np.array_equal(array.reshape(-1), expected)
+
+
+@pytest.mark.parametrize('indices', INDICES)
+def test_put_broadcasts_one_value(indices):
+    array = np.zeros(256)
+    IndexSet(indices).put(array, [5.])
+
+    assert np.all(array[indices] == 5.)
+    assert array.sum() == 5. * len(indices)
+
+
+def test_put_size_mismatch():
+    with pytest.raises(ValueError):
+        IndexSet([0, 1, 2]).put(np.zeros(4), [1., 2.])
+
+
+def test_put_not_contiguous():
+    with pytest.raises(ValueError):
+        IndexSet([0, 1]).put(np.zeros(8)[::2], 1.)
+
+
+def test_model_accepts_index_set(plate):
+    indices = IndexSet([5, 1, 2], size=12)
+
+    assert np.array_equal(plate.get_value_at_indices(TEMPERATURE, indices),
+                          [1., 2., 5.])
+
+    plate.set_value_at_indices(TEMPERATURE, indices, [-1., -2., -5.])
+    assert np.array_equal(plate.get_value(TEMPERATURE)[[1, 2, 5]],
+                          [-1., -2., -5.])
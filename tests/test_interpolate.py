@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from basic_modeling_interface.interpolate import (SnapshotBuffer,
+                                                  _lagrange_weights)
+
+from .models import TEMPERATURE
+
+BASE = np.arange(12.)
+
+
+def _record_steps(plate, snapshots, n_steps):
+    for _ in range(n_steps):
+        plate.update()
+        snapshots.record()
+
+
+@pytest.mark.parametrize('capacity,order', [(2, 0), (2, 2), (3, 3)])
+def test_invalid_capacity_or_order(plate, capacity, order):
+    with pytest.raises(ValueError):
+        SnapshotBuffer(plate, TEMPERATURE, capacity=capacity, order=order)
+
+
+def test_ring_wraps_around(plate):
+    snapshots = SnapshotBuffer(plate, TEMPERATURE, capacity=3)
+    snapshots.record()
+    _record_steps(plate, snapshots, 4)
+
+    assert len(snapshots) == 3
+    assert snapshots.capacity == 3
+    assert np.array_equal(snapshots.times, [2., 3., 4.])
+    assert np.allclose(snapshots.interpolate(2.5), BASE + 2.5)
+    assert np.allclose(snapshots.interpolate(4.), BASE + 4.)
+    with pytest.raises(ValueError):
+        snapshots.interpolate(1.5)
+
+
+def test_extrapolate(plate):
+    snapshots = SnapshotBuffer(plate, TEMPERATURE)
+    snapshots.record()
+    _record_steps(plate, snapshots, 1)
+
+    with pytest.raises(ValueError):
+        snapshots.interpolate(3.)
+    assert np.allclose(snapshots.interpolate(3., extrapolate=True),
+                       BASE + 3.)
+
+
+def test_record_replaces_snapshot_at_same_time(plate):
+    snapshots = SnapshotBuffer(plate, TEMPERATURE)
+    snapshots.record()
+    plate.set_value(TEMPERATURE, np.zeros(12))
+    snapshots.record()
+
+    assert len(snapshots) == 1
+    assert np.array_equal(snapshots.interpolate(0.), np.zeros(12))
+
+
+def test_record_out_of_order(plate, monkeypatch):
+    snapshots = SnapshotBuffer(plate, TEMPERATURE)
+    plate.update()
+    snapshots.record()
+    monkeypatch.setattr(plate, 'get_current_time', lambda: 0.)
+
+    with pytest.raises(ValueError):
+        snapshots.record()
+
+
+def test_no_snapshots(plate):
+    with pytest.raises(ValueError):
+        SnapshotBuffer(plate, TEMPERATURE).interpolate(0.)
+
+
+def test_quadratic(plate):
+    snapshots = SnapshotBuffer(plate, TEMPERATURE, capacity=4, order=2)
+    for time in range(4):
+        if time > 0:
+            plate.update()
+        plate.set_value(TEMPERATURE, np.full(12, float(time) ** 2))
+        snapshots.record()
+
+    out = np.empty(12)
+    assert snapshots.interpolate(1.5, out=out) is out
+    assert np.allclose(out, 2.25)
+    assert np.allclose(snapshots.interpolate(2.5), 6.25)
+
+
+def test_integer_variable(plate, monkeypatch):
+    values = np.arange(12, dtype=np.int32)
+    monkeypatch.setattr(plate, 'get_var_type', lambda name: 'int32')
+    monkeypatch.setattr(plate, 'get_var_itemsize', lambda name: 4)
+    monkeypatch.setattr(plate, 'get_var_nbytes', lambda name: 48)
+    monkeypatch.setattr(plate, 'get_value_ref', lambda name: values)
+    snapshots = SnapshotBuffer(plate, TEMPERATURE)
+    snapshots.record()
+    plate.update()
+    values += 1
+    snapshots.record()
+
+    result = snapshots.interpolate(.5)
+    assert result.dtype == np.float64
+    assert np.allclose(result, BASE + .5)
+
+
+def test_old_get_value(plate, monkeypatch):
+    get_value = plate.get_value
+    monkeypatch.setattr(plate, 'get_value', lambda var_name: get_value(
+        var_name))
+    snapshots = SnapshotBuffer(plate, TEMPERATURE)
+    snapshots.record()
+    _record_steps(plate, snapshots, 1)
+
+    assert np.allclose(snapshots.interpolate(.5), BASE + .5)
+
+
+def test_lagrange_weights():
+    times = np.array([0., 1., 3.])
+
+    assert np.allclose(_lagrange_weights(times, 1.), [0., 1., 0.])
+    assert np.isclose(_lagrange_weights(times, 2.).sum(), 1.)
+    assert np.allclose(_lagrange_weights(times[:2], .25), [.75, .25])
@@ -0,0 +1,149 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface.mesh import CsrMesh
+
+# Two triangles and a quadrilateral:
+#
+#   4 --- 5
+#   |  2  |
+#   2 --- 3
+#   | \ 1 |
+#   | 0 \ |
+#   0 --- 1
+CONNECTIVITY = [0, 1, 2, 1, 3, 2, 2, 3, 5, 4]
+OFFSET = [3, 6, 10]
+
+
+@pytest.fixture
+def mesh():
+    return CsrMesh(CONNECTIVITY, OFFSET)
+
+
+def _triangulated_grid(n_rows, n_cols):
+    """Connectivity and offsets of a grid of nodes split into triangles."""
+    connectivity = []
+    for row, col in itertools.product(range(n_rows - 1), range(n_cols - 1)):
+        node = row * n_cols + col
+        connectivity += [node, node + 1, node + n_cols + 1,
+                         node, node + n_cols + 1, node + n_cols]
+    return connectivity, np.arange(3, len(connectivity) + 1, 3)
+
+
+def _edges_of_cell(mesh, cell):
+    nodes = list(mesh.nodes_of_cell(cell))
+    return set((min(a, b), max(a, b))
+               for a, b in zip(nodes, nodes[1:] + nodes[:1]))
+
+
+def _brute_force_edges(mesh):
+    edges = set()
+    for cell in range(mesh.n_cells):
+        edges |= _edges_of_cell(mesh, cell)
+    return edges
+
+
+def _brute_force_neighbors(mesh, cell):
+    edges = _edges_of_cell(mesh, cell)
+    return [other for other in range(mesh.n_cells)
+            if other != cell and edges & _edges_of_cell(mesh, other)]
+
+
+def test_cells(mesh):
+    assert mesh.n_nodes == 6
+    assert mesh.n_cells == 3
+    assert np.array_equal(mesh.indptr, [0, 3, 6, 10])
+    assert np.array_equal(mesh.nodes_per_cell, [3, 3, 4])
+    assert np.array_equal(mesh.nodes_of_cell(2), [2, 3, 5, 4])
+
+
+def test_index_arrays(mesh):
+    assert mesh.indices.dtype == np.int32
+    assert not mesh.indices.flags.writeable
+    assert not mesh.indptr.flags.writeable
+
+
+def test_leading_zero_is_optional():
+    mesh = CsrMesh(CONNECTIVITY, [0] + OFFSET)
+
+    assert np.array_equal(mesh.indptr, [0, 3, 6, 10])
+
+
+@pytest.mark.parametrize('offset, n_nodes', [
+    ([3, 6, 9], None),
+    ([3, 2, 10], None),
+    (OFFSET, 5),
+])
+def test_invalid(offset, n_nodes):
+    with pytest.raises(ValueError):
+        CsrMesh(CONNECTIVITY, offset, n_nodes=n_nodes)
+
+
+def test_edges(mesh):
+    assert mesh.n_edges == 8
+    assert [tuple(edge) for edge in mesh.edges] == [
+        (0, 1), (0, 2), (1, 2), (1, 3), (2, 3), (2, 4), (3, 5), (4, 5)]
+
+    indptr, cell_edges = mesh.cell_edges
+    assert np.array_equal(indptr, mesh.indptr)
+    for cell in range(mesh.n_cells):
+        edges = mesh.edges[cell_edges[indptr[cell]:indptr[cell + 1]]]
+        assert set(map(tuple, edges)) == _edges_of_cell(mesh, cell)
+
+
+def test_node_cells(mesh):
+    assert np.array_equal(mesh.cells_of_node(0), [0])
+    assert np.array_equal(mesh.cells_of_node(2), [0, 1, 2])
+    assert np.array_equal(mesh.cells_of_node(3), [1, 2])
+    assert np.array_equal(mesh.cells_of_node(5), [2])
+
+
+def test_cell_cells(mesh):
+    assert np.array_equal(mesh.neighbors_of_cell(0), [1])
+    assert np.array_equal(mesh.neighbors_of_cell(1), [0, 2])
+    assert np.array_equal(mesh.neighbors_of_cell(2), [1])
+
+
+def test_non_manifold_edge():
+    mesh = CsrMesh([0, 1, 2, 1, 0, 3, 0, 1, 4], [3, 6, 9])
+
+    assert mesh.n_edges == 7
+    for cell in range(3):
+        assert np.array_equal(mesh.neighbors_of_cell(cell),
+                              [other for other in range(3) if other != cell])
+
+
+def test_empty_cell():
+    mesh = CsrMesh([0, 1, 2, 2, 1, 3], [3, 3, 6])
+
+    assert np.array_equal(mesh.nodes_of_cell(1), [])
+    assert mesh.n_edges == 5
+    assert np.array_equal(mesh.neighbors_of_cell(0), [2])
+    assert np.array_equal(mesh.neighbors_of_cell(1), [])
+
+
+def test_matches_brute_force():
+    mesh = CsrMesh(*_triangulated_grid(4, 5))
+
+    assert set(map(tuple, mesh.edges)) == _brute_force_edges(mesh)
+    assert mesh.n_edges == len(_brute_force_edges(mesh))
+    for cell in range(mesh.n_cells):
+        assert list(mesh.neighbors_of_cell(cell)) == (
+            _brute_force_neighbors(mesh, cell))
+    for node in range(mesh.n_nodes):
+        assert list(mesh.cells_of_node(node)) == [
+            cell for cell in range(mesh.n_cells)
+            if node in mesh.nodes_of_cell(cell)]
+
+
+def test_from_bmi(plate, monkeypatch):
+    connectivity, offset = _triangulated_grid(3, 4)
+    monkeypatch.setattr(plate, 'get_grid_connectivity',
+                        lambda grid: np.array(connectivity))
+    monkeypatch.setattr(plate, 'get_grid_offset', lambda grid: offset)
+
+    mesh = CsrMesh.from_bmi(plate, 0)
+    assert mesh.n_nodes == 12
+    assert mesh.n_cells == 12
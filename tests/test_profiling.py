@@ -0,0 +1,119 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface.heat import BmiHeat
+from basic_modeling_interface.profiling import BmiProfiler
+
+from .models import TEMPERATURE
+
+
+class ProfiledHeat(BmiProfiler, BmiHeat):
+    pass
+
+
+@pytest.fixture
+def profiled():
+    bmi = ProfiledHeat()
+    bmi.initialize(None)
+    yield bmi
+    bmi.finalize()
+
+
+def test_stats(profiled):
+    for _ in range(3):
+        profiled.update()
+    profiled.get_grid_shape(0)
+    stats = profiled.profile_stats()
+
+    assert stats[('update', None)]['count'] == 3
+    assert stats[('update', None)]['nbytes'] == 0
+    assert stats[('get_grid_shape', 0)]['count'] == 1
+    assert stats[('initialize', None)]['count'] == 1
+    for stat in stats.values():
+        assert 0. <= stat['min'] <= stat['mean'] <= stat['max']
+        assert stat['total'] == pytest.approx(stat['mean'] * stat['count'])
+
+
+def test_bytes_moved(profiled):
+    nbytes = profiled.get_var_nbytes(TEMPERATURE)
+    value = profiled.get_value(TEMPERATURE)
+    profiled.get_value(TEMPERATURE, np.empty_like(value))
+    profiled.set_value(TEMPERATURE, value)
+    profiled.get_value_at_indices(TEMPERATURE, [0, 1])
+    profiled.get_value_ref(TEMPERATURE)
+    stats = profiled.profile_stats()
+
+    assert stats[('get_value', TEMPERATURE)]['count'] == 2
+    assert stats[('get_value', TEMPERATURE)]['nbytes'] == 2 * nbytes
+    assert stats[('set_value', TEMPERATURE)]['nbytes'] == nbytes
+    assert stats[('get_value_at_indices', TEMPERATURE)]['nbytes'] == 16
+    assert stats[('get_value_ref', TEMPERATURE)]['count'] == 1
+    assert stats[('get_value_ref', TEMPERATURE)]['nbytes'] == 0
+
+
+def test_failed_call_is_recorded(profiled):
+    with pytest.raises(KeyError):
+        profiled.get_value('not_a_variable')
+
+    assert profiled.profile_stats()[
+        ('get_value', 'not_a_variable')]['count'] == 1
+
+
+def test_reset_profile(profiled):
+    profiled.update()
+    profiled.reset_profile()
+
+    assert profiled.profile_stats() == {}
+
+
+def test_write_profile_csv(profiled, tmpdir):
+    profiled.update()
+    profiled.get_value(TEMPERATURE)
+    filename = str(tmpdir.join('profile.csv'))
+    profiled.write_profile_csv(filename)
+
+    with open(filename) as fp:
+        rows = list(csv.reader(fp))
+    assert rows[0] == ['method', 'subject', 'count', 'total', 'mean', 'min',
+                       'max', 'nbytes']
+    assert ['get_value', TEMPERATURE, '1'] in [row[:3] for row in rows]
+    assert ['update', '', '1'] in [row[:3] for row in rows]
+
+
+def test_write_chrome_trace(profiled, tmpdir):
+    profiled.update()
+    profiled.profile_trace = True
+    profiled.update()
+    profiled.get_value(TEMPERATURE)
+    filename = str(tmpdir.join('trace.json'))
+    profiled.write_chrome_trace(filename)
+
+    with open(filename) as fp:
+        events = json.load(fp)['traceEvents']
+    assert [event['name'] for event in events] == ['update', 'get_value']
+    assert events[1]['args'] == {'subject': TEMPERATURE,
+                                 'nbytes': profiled.get_var_nbytes(
+                                     TEMPERATURE)}
+    assert events[0]['ph'] == 'X' and events[0]['dur'] >= 0.
+
+
+def test_profile_get_values(profiled):
+    profiled.get_values([TEMPERATURE])
+    profiled.get_value(TEMPERATURE)
+    stats = profiled.profile_stats()
+
+    assert stats[('get_values', None)]['count'] == 1
+    assert stats[('get_values', None)]['nbytes'] == 0
+    assert stats[('get_value', TEMPERATURE)]['count'] == 2
+    assert stats[('get_value', TEMPERATURE)]['nbytes'] == (
+        2 * profiled.get_var_nbytes(TEMPERATURE))
+
+
+def test_unhashable_subject(profiled):
+    with pytest.raises(TypeError):
+        profiled.get_var_units([TEMPERATURE])
+
+    assert profiled.profile_stats()[('get_var_units', None)]['count'] == 1
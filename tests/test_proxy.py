@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from basic_modeling_interface.buffers import is_value_ref_shared
+from basic_modeling_interface.heat import BmiHeat
+
+from .models import TEMPERATURE, OldHeat
+
+pytest.importorskip('multiprocessing.shared_memory')
+
+from basic_modeling_interface.proxy import BmiProxy  # noqa: E402
+
+
+@pytest.fixture
+def proxy():
+    with BmiProxy(BmiHeat) as bmi:
+        bmi.initialize(None)
+        bmi.update()
+        yield bmi
+        bmi.finalize()
+
+
+def test_forwarded_methods(proxy, heat):
+    assert proxy.get_component_name() == heat.get_component_name()
+    assert proxy.get_current_time() == heat.get_current_time()
+    assert list(proxy.get_grid_shape(0)) == list(heat.get_grid_shape(0))
+    assert proxy.get_var_units(TEMPERATURE) == 'K'
+
+
+def test_get_and_set_value(proxy, heat):
+    assert np.array_equal(proxy.get_value(TEMPERATURE),
+                          heat.get_value(TEMPERATURE))
+
+    values = np.arange(proxy.get_grid_size(0), dtype=float)
+    proxy.set_value(TEMPERATURE, values)
+    dest = np.empty_like(values)
+
+    assert proxy.get_value(TEMPERATURE, dest) is dest
+    assert np.array_equal(dest, values)
+
+
+def test_old_get_value(heat):
+    with BmiProxy(OldHeat) as proxy:
+        proxy.initialize(None)
+        proxy.update()
+        dest = np.empty(proxy.get_grid_size(0))
+
+        assert proxy.get_value(TEMPERATURE, dest) is dest
+        assert np.array_equal(dest, heat.get_value(TEMPERATURE))
+        proxy.finalize()
+
+
+def test_value_ref_follows_model(proxy):
+    ref = proxy.get_value_ref(TEMPERATURE)
+    before = ref.copy()
+    proxy.update()
+
+    assert ref.shape == (10, 20)
+    assert np.array_equal(ref, before)
+    assert not np.array_equal(proxy.get_value_ref(TEMPERATURE), before)
+    assert np.array_equal(ref.reshape(-1), proxy.get_value(TEMPERATURE))
+
+
+def test_value_ref_is_read_only(proxy):
+    ref = proxy.get_value_ref(TEMPERATURE)
+
+    assert not ref.flags.writeable
+    assert not is_value_ref_shared(proxy, TEMPERATURE)
+    with pytest.raises(ValueError):
+        ref[0, 0] = 1.
+
+
+def test_release_buffers(proxy):
+    value = proxy.get_value(TEMPERATURE)
+    proxy.release_buffers()
+
+    assert np.array_equal(proxy.get_value(TEMPERATURE), value)
+
+
+def test_remote_error(proxy):
+    with pytest.raises(KeyError):
+        proxy.get_var_type('not_a_variable')
+    assert proxy.get_var_type(TEMPERATURE) == 'float64'
+
+
+def test_closed_proxy():
+    proxy = BmiProxy(BmiHeat)
+    proxy.close()
+    proxy.close()
+
+    with pytest.raises(RuntimeError):
+        proxy.initialize(None)
@@ -0,0 +1,95 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface.recorder import (INDEX_FILE, TIMES_FILE,
+                                               OutputRecorder)
+
+from .models import TEMPERATURE, OldHeat
+
+
+def _read_index(path):
+    with open(os.path.join(path, INDEX_FILE)) as fp:
+        return json.load(fp)
+
+
+def test_index(heat, tmpdir):
+    path = str(tmpdir.join('recording'))
+    with OutputRecorder(heat, [TEMPERATURE], path):
+        pass
+    index = _read_index(path)
+
+    assert index['component'] == heat.get_component_name()
+    assert index['time_units'] == heat.get_time_units()
+    assert index['output_var_names'] == [TEMPERATURE]
+    assert index['vars'][TEMPERATURE] == {
+        'type': 'float64', 'units': 'K', 'itemsize': 8, 'nbytes': 1600,
+        'grid': 0, 'shape': [10, 20], 'file': 'var0.bin'}
+
+    grid = index['grids']['0']
+    assert grid['type'] == 'uniform_rectilinear'
+    assert grid['shape'] == [10, 20]
+    assert np.array_equal(np.load(os.path.join(path, grid['x'])),
+                          heat.get_grid_x(0))
+
+
+def test_records(heat, tmpdir):
+    path = str(tmpdir.join('recording'))
+    expected, times = [], []
+    with OutputRecorder(heat, [TEMPERATURE], path, every=2) as recorder:
+        for _ in range(5):
+            recorder.update()
+            if recorder.record_count > len(times):
+                expected.append(heat.get_value(TEMPERATURE))
+                times.append(heat.get_current_time())
+
+    assert recorder.record_count == 2
+    assert np.array_equal(
+        np.fromfile(os.path.join(path, TIMES_FILE), dtype=np.float64), times)
+    assert np.array_equal(
+        np.fromfile(os.path.join(path, 'var0.bin')).reshape((2, -1)),
+        expected)
+
+
+def test_record_without_value_ref(heat, tmpdir, monkeypatch):
+    monkeypatch.setattr(heat, 'get_value_ref', lambda name: None)
+    path = str(tmpdir.join('recording'))
+    with OutputRecorder(heat, [TEMPERATURE], path) as recorder:
+        recorder.record()
+
+    assert np.array_equal(np.fromfile(os.path.join(path, 'var0.bin')),
+                          heat.get_value(TEMPERATURE))
+
+
+def test_record_old_get_value(heat, tmpdir, monkeypatch):
+    bmi = OldHeat()
+    bmi.initialize(None)
+    bmi.update()
+    monkeypatch.setattr(bmi, 'get_value_ref', lambda name: None)
+    path = str(tmpdir.join('recording'))
+    with OutputRecorder(bmi, [TEMPERATURE], path) as recorder:
+        recorder.record()
+
+    assert np.array_equal(np.fromfile(os.path.join(path, 'var0.bin')),
+                          heat.get_value(TEMPERATURE))
+
+
+def test_record_after_close(heat, tmpdir):
+    recorder = OutputRecorder(heat, [TEMPERATURE], str(tmpdir))
+    recorder.close()
+    recorder.close()
+
+    with pytest.raises(ValueError):
+        recorder.record()
+
+
+def test_write_error(heat, tmpdir):
+    recorder = OutputRecorder(heat, [TEMPERATURE], str(tmpdir))
+    recorder._files[0].close()
+    recorder._files[0] = open(os.path.join(str(tmpdir), 'var0.bin'), 'rb')
+    recorder.record()
+
+    with pytest.raises((IOError, OSError)):
+        recorder.close()
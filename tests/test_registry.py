@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from basic_modeling_interface.registry import VarInfo, VarRegistry
+
+from .models import TEMPERATURE
+
+
+@pytest.fixture
+def registry(plate, monkeypatch):
+    grids = {'inflow': 1, TEMPERATURE: 0, 'outflow': 1}
+    monkeypatch.setattr(plate, 'get_input_var_names',
+                        lambda: ('inflow', TEMPERATURE))
+    monkeypatch.setattr(plate, 'get_output_var_names',
+                        lambda: (TEMPERATURE, 'outflow'))
+    monkeypatch.setattr(plate, 'get_var_grid', lambda name: grids[name])
+    return VarRegistry.from_bmi(plate)
+
+
+def test_from_bmi(registry):
+    assert len(registry) == 3
+    assert set(registry) == set(['inflow', TEMPERATURE, 'outflow'])
+    assert registry.input_var_names == ('inflow', TEMPERATURE)
+    assert registry.output_var_names == (TEMPERATURE, 'outflow')
+
+    info = registry[TEMPERATURE]
+    assert info.dtype == np.float64
+    assert info.units == 'K'
+    assert info.itemsize == 8
+    assert info.nbytes == 96
+    assert info.size == 12
+    assert info.grid == 0
+
+
+@pytest.mark.parametrize('name, role, is_input, is_output', [
+    ('inflow', 'in', True, False),
+    (TEMPERATURE, 'inout', True, True),
+    ('outflow', 'out', False, True),
+])
+def test_roles(registry, name, role, is_input, is_output):
+    assert registry[name].role == role
+    assert registry[name].is_input == is_input
+    assert registry[name].is_output == is_output
+
+
+def test_grids(registry):
+    assert registry.grids == (0, 1)
+    assert sorted(registry.vars_on_grid(1)) == ['inflow', 'outflow']
+    assert registry.vars_on_grid(0) == (TEMPERATURE, )
+    assert registry.vars_on_grid(2) == ()
+
+
+def test_var_info_is_read_only(registry):
+    info = registry[TEMPERATURE]
+    with pytest.raises(AttributeError):
+        info.units = 'degC'
+    with pytest.raises(AttributeError):
+        del info.units
+
+
+def test_var_info_equality():
+    info = VarInfo('x', np.dtype('float64'), 'm', 8, 80, 0, 'out')
+    same = VarInfo('x', np.dtype('float64'), 'm', 8, 80, 0, 'out')
+    other = VarInfo('x', np.dtype('float64'), 'km', 8, 80, 0, 'out')
+
+    assert info == same
+    assert not info != same
+    assert hash(info) == hash(same)
+    assert info != other
+    assert len(set([info, same, other])) == 2
+
+
+def test_missing_variable(registry):
+    with pytest.raises(KeyError):
+        registry['not_a_variable']
+    assert 'not_a_variable' not in registry
@@ -0,0 +1,222 @@
+import os
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface import regrid
+from basic_modeling_interface.regrid import Regridder
+
+from .models import Field
+
+
+def _uniform(n_x, n_y, spacing=1., origin=0.):
+    return Field(origin + spacing * np.arange(n_x),
+                 origin + spacing * np.arange(n_y))
+
+
+def _nodes(bmi):
+    if bmi.get_grid_type(0) == 'unstructured':
+        return bmi.get_grid_x(0), bmi.get_grid_y(0)
+    y, x = np.meshgrid(bmi.get_grid_y(0), bmi.get_grid_x(0), indexing='ij')
+    return x.reshape(-1), y.reshape(-1)
+
+
+def _plane(bmi):
+    x, y = _nodes(bmi)
+    return 2. * x + 3. * y + 1.
+
+
+@pytest.fixture(params=['numpy', 'scipy'])
+def backend(request, monkeypatch):
+    """Apply weights with NumPy and, if it is installed, with SciPy."""
+    if request.param == 'numpy':
+        monkeypatch.setattr(regrid, 'sparse', None)
+    elif regrid.sparse is None:
+        pytest.skip('scipy is not installed')
+    return request.param
+
+
+def test_unknown_method():
+    src, dst = _uniform(3, 3), _uniform(3, 3)
+
+    with pytest.raises(ValueError):
+        Regridder(src, 0, dst, 0, method='cubic')
+
+
+@pytest.mark.parametrize('method', regrid.METHODS)
+def test_same_grid(method, backend):
+    src, dst = _uniform(4, 3), _uniform(4, 3)
+    regridder = Regridder(src, 0, dst, 0, method=method)
+    values = np.arange(12.)
+
+    assert regridder.method == method
+    assert regridder.shape == (12, 12)
+    assert np.allclose(regridder.regrid(values), values)
+
+
+def test_bilinear(backend):
+    src = _uniform(4, 3)
+    dst = _uniform(7, 5, spacing=.5)
+    regridder = Regridder.from_var(src, dst, 'field')
+
+    assert np.allclose(regridder.regrid(_plane(src)), _plane(dst))
+
+
+def test_bilinear_rectilinear_source(backend):
+    src = Field([0., 1., 3.], [0., 2.], grid_type='rectilinear')
+    dst = _uniform(4, 3)
+    regridder = Regridder(src, 0, dst, 0)
+
+    assert np.allclose(regridder.regrid(_plane(src)), _plane(dst))
+
+
+def test_bilinear_outside_takes_edge_values(backend):
+    src = _uniform(2, 2)
+    dst = Field([-1., 2.], [.5], grid_type='rectilinear')
+    values = Regridder(src, 0, dst, 0).regrid([0., 1., 2., 3.])
+
+    assert np.allclose(values, [1., 2.])
+
+
+def test_nearest(backend):
+    src = _uniform(3, 3)
+    dst = Field([.4, 1.6, 5.], [.4, .4, 1.7], grid_type='unstructured')
+    values = Regridder(src, 0, dst, 0, method='nearest').regrid(np.arange(9.))
+
+    assert np.array_equal(values, [0., 2., 8.])
+
+
+@pytest.fixture(params=['kdtree', 'brute_force'])
+def search(request, monkeypatch):
+    """Find nearest nodes with SciPy, if installed, and with NumPy."""
+    if request.param == 'brute_force':
+        monkeypatch.setattr(regrid, 'cKDTree', None)
+        monkeypatch.setattr(regrid, '_NEAREST_CHUNK_SIZE', 2)
+    elif regrid.cKDTree is None:
+        pytest.skip('scipy is not installed')
+    return request.param
+
+
+def test_nearest_unstructured_source(search):
+    src = Field([0., 1., 0., 1., .5], [0., 0., 1., 1., .5],
+                grid_type='unstructured')
+    dst = Field([.1, .9, .45, .8, .1], [.1, 1.2, .55, .1, .9],
+                grid_type='unstructured')
+    regridder = Regridder(src, 0, dst, 0, method='nearest')
+
+    assert regridder.shape == (5, 5)
+    assert np.array_equal(regridder.regrid(np.arange(5.)),
+                          [0., 3., 4., 1., 2.])
+
+
+def test_default_method(search):
+    src = Field([0., 1., 0., 1.], [0., 0., 1., 1.], grid_type='unstructured')
+    dst = _uniform(2, 2, spacing=.8, origin=.1)
+    regridder = Regridder.from_var(src, dst, 'field')
+
+    assert regridder.method == 'nearest'
+    assert np.array_equal(regridder.regrid(np.arange(4.)), np.arange(4.))
+    assert Regridder(dst, 0, src, 0).method == 'bilinear'
+
+
+def test_bilinear_unstructured_source():
+    src = Field([0., 1.], [0., 1.], grid_type='unstructured')
+
+    with pytest.raises(NotImplementedError):
+        Regridder(src, 0, _uniform(2, 2), 0, method='bilinear')
+
+
+def test_conservative(backend):
+    src = _uniform(4, 4)
+    dst = _uniform(2, 2, spacing=2., origin=.5)
+    values = np.arange(16.)
+    regridded = Regridder(src, 0, dst, 0, method='conservative').regrid(
+        values)
+
+    assert np.allclose(regridded, [2.5, 4.5, 10.5, 12.5])
+    assert np.isclose(regridded.sum() * 4., values.sum())
+
+
+def test_conservative_requires_uniform_grids():
+    src = Field([0., 1., 3.], [0., 2.], grid_type='rectilinear')
+
+    with pytest.raises(NotImplementedError):
+        Regridder(src, 0, _uniform(2, 2), 0, method='conservative')
+
+
+def test_regrid_into_buffer(backend):
+    regridder = Regridder(_uniform(2, 2), 0, _uniform(3, 3, spacing=.5), 0)
+    out = np.empty(9)
+
+    assert regridder.regrid([0., 1., 2., 3.], out=out) is out
+    assert np.allclose(out, [0., .5, 1., 1., 1.5, 2., 2., 2.5, 3.])
+    with pytest.raises(ValueError):
+        regridder.regrid(np.arange(5.))
+
+
+def test_exchange(backend):
+    src = _uniform(4, 3)
+    dst = _uniform(7, 5, spacing=.5)
+    src.set_value('field', _plane(src))
+    regridder = Regridder.from_var(src, dst, 'field')
+    regridder.exchange(src, dst, 'field')
+
+    assert np.allclose(dst.get_value('field'), _plane(dst))
+
+
+def test_exchange_without_value_ref(monkeypatch):
+    src, dst = _uniform(2, 2), _uniform(2, 2)
+    src.set_value('field', [1., 2., 3., 4.])
+    monkeypatch.setattr(src, 'get_value_ref', lambda name: None)
+    Regridder(src, 0, dst, 0).exchange(src, dst, 'field')
+
+    assert np.array_equal(dst.get_value('field'), [1., 2., 3., 4.])
+
+
+def test_cached_weights(tmpdir, monkeypatch):
+    src, dst = _uniform(4, 3), _uniform(7, 5, spacing=.5)
+    cache_dir = str(tmpdir)
+    regridder = Regridder(src, 0, dst, 0, cache_dir=cache_dir)
+    path = os.path.join(cache_dir, regridder.key + '.npz')
+
+    assert os.listdir(cache_dir) == [regridder.key + '.npz']
+    assert os.path.isfile(path)
+
+    def fail(src, dst):
+        raise AssertionError('weights were recomputed')
+
+    monkeypatch.setitem(regrid._WEIGHTS, 'bilinear', fail)
+    cached = Regridder(src, 0, dst, 0, cache_dir=cache_dir)
+
+    assert cached.key == regridder.key
+    for array, expected in zip(cached.weights, regridder.weights):
+        assert np.array_equal(array, expected)
+
+
+def test_key_depends_on_geometry():
+    src = _uniform(4, 3)
+    keys = set(Regridder(src, 0, dst, 0, method=method).key
+               for dst in (_uniform(4, 3), _uniform(4, 3, origin=1.))
+               for method in ('nearest', 'bilinear'))
+
+    assert len(keys) == 4
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.int32, np.int64])
+def test_regrid_other_dtypes(backend, dtype):
+    regridder = Regridder(_uniform(2, 2), 0, _uniform(3, 3, spacing=.5), 0)
+    values = np.array([0, 2, 4, 6], dtype=dtype)
+
+    assert np.allclose(regridder.regrid(values),
+                       [0., 1., 2., 2., 3., 4., 4., 5., 6.])
+
+
+def test_exchange_into_integer_variable(backend):
+    src = _uniform(2, 2)
+    dst = Field([0., .5, 1.], [0., .5, 1.], dtype=np.int32)
+    src.set_value('field', [0., 1., 2., 3.])
+    Regridder(src, 0, dst, 0).exchange(src, dst, 'field')
+
+    assert dst.get_value('field').dtype == np.int32
+    assert np.array_equal(dst.get_value('field'),
+                          [0, 0, 1, 1, 2, 2, 2, 2, 3])
@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface.indices import IndexSet
+from basic_modeling_interface.recorder import INDEX_FILE, OutputRecorder
+from basic_modeling_interface.replay import BmiReplay
+
+from .models import TEMPERATURE
+
+
+@pytest.fixture
+def recording(heat, tmpdir):
+    """A recording of three steps of the heat model, with its values."""
+    path = str(tmpdir.join('recording'))
+    times, values = [], []
+    with OutputRecorder(heat, [TEMPERATURE], path) as recorder:
+        for _ in range(3):
+            recorder.update()
+            times.append(heat.get_current_time())
+            values.append(heat.get_value(TEMPERATURE))
+    return path, times, values
+
+
+@pytest.fixture
+def replay(recording):
+    bmi = BmiReplay()
+    bmi.initialize(recording[0])
+    yield bmi
+    bmi.finalize()
+
+
+def test_metadata(replay, heat):
+    assert replay.record_count == 3
+    assert replay.get_component_name() == heat.get_component_name()
+    assert replay.get_input_var_names() == ()
+    assert replay.get_output_var_names() == (TEMPERATURE, )
+    assert replay.get_var_units(TEMPERATURE) == 'K'
+    assert replay.get_var_nbytes(TEMPERATURE) == 1600
+    assert replay.get_time_step() == heat.get_time_step()
+    assert replay.get_grid_type(0) == 'uniform_rectilinear'
+    assert np.array_equal(replay.get_grid_shape(0), heat.get_grid_shape(0))
+    assert np.array_equal(replay.get_grid_x(0), heat.get_grid_x(0))
+    assert replay.get_grid_connectivity(0) is None
+
+
+def test_play_back(replay, recording):
+    _, times, values = recording
+
+    for n, (time, expected) in enumerate(zip(times, values)):
+        if n > 0:
+            replay.update()
+        assert replay.record == n
+        assert replay.get_current_time() == time
+        assert np.array_equal(replay.get_value(TEMPERATURE), expected)
+        assert np.array_equal(
+            replay.get_value_ref(TEMPERATURE).reshape(-1), expected)
+
+    with pytest.raises(ValueError):
+        replay.update()
+
+
+def test_update_until(replay, recording):
+    _, times, _ = recording
+
+    replay.update_until(times[2])
+    assert replay.record == 2
+    replay.update_until(.5 * (times[0] + times[1]))
+    assert replay.record == 0
+    replay.update_frac(1.)
+    assert replay.record == 1
+    replay.update_until(0.)
+    assert replay.record == 0
+
+
+def test_values_at_indices(replay, recording):
+    expected = recording[2][0]
+
+    assert np.array_equal(
+        replay.get_value_at_indices(TEMPERATURE, [0, 105]), expected[[0, 105]])
+    assert np.array_equal(
+        replay.get_value_at_indices(TEMPERATURE, IndexSet([105, 0])),
+        expected[[0, 105]])
+
+
+def test_set_value_leaves_recording(replay, recording):
+    replay.set_value(TEMPERATURE, np.zeros(200))
+    replay.set_value_at_indices(TEMPERATURE, [0], [1.])
+    assert replay.get_value(TEMPERATURE)[:2].tolist() == [1., 0.]
+
+    other = BmiReplay()
+    other.initialize(os.path.join(recording[0], INDEX_FILE))
+    try:
+        assert np.array_equal(other.get_value(TEMPERATURE), recording[2][0])
+    finally:
+        other.finalize()
+
+
+def test_empty_recording(heat, tmpdir):
+    path = str(tmpdir.join('recording'))
+    OutputRecorder(heat, [TEMPERATURE], path).close()
+
+    with pytest.raises(ValueError):
+        BmiReplay().initialize(path)
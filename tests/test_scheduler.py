@@ -0,0 +1,139 @@
+import pytest
+
+pytest.importorskip('concurrent.futures')
+
+from basic_modeling_interface import scheduler as _scheduler  # noqa: E402
+from basic_modeling_interface.coupler import Connection  # noqa: E402
+from basic_modeling_interface.scheduler import (  # noqa: E402
+    ExchangeScheduler)
+
+from .models import Clock  # noqa: E402
+
+
+def _clocks(**time_steps):
+    components = {}
+    for name, time_step in time_steps.items():
+        components[name] = Clock()
+        components[name].time_step = time_step
+        components[name].initialize()
+    return components
+
+
+@pytest.fixture
+def components():
+    return _clocks(fast=1., slow=3.)
+
+
+@pytest.fixture
+def scheduler(components):
+    scheduler = ExchangeScheduler(
+        components, connections=[Connection('fast', 'slow', 'count')])
+    yield scheduler
+    scheduler.close()
+
+
+def test_requires_concurrent_futures(components, monkeypatch):
+    monkeypatch.setattr(_scheduler, 'ThreadPoolExecutor', None)
+
+    with pytest.raises(RuntimeError):
+        ExchangeScheduler(components)
+
+
+def test_exchange_at_slower_step(scheduler, components):
+    connection = Connection('fast', 'slow', 'count')
+
+    assert scheduler.interval(connection) == 3.
+    assert scheduler.next_exchange_time(connection, 0.) == 3.
+    assert scheduler.next_exchange_time(connection, 3.) == 6.
+
+    scheduler.run_until(7.)
+
+    assert scheduler.time == 7.
+    assert scheduler.exchange_count == 3
+    assert components['fast'].get_current_time() == 7.
+    assert [time for time, _ in components['slow'].received] == [0., 3., 6.]
+
+
+def test_unconnected_components_wait(components):
+    components.update(_clocks(idle=1.))
+    times = []
+    update_until = components['idle'].update_until
+    components['idle'].update_until = lambda time: (
+        times.append(time), update_until(time))
+    scheduler = ExchangeScheduler(
+        components, connections=[Connection('fast', 'slow', 'count')])
+    try:
+        scheduler.run_until(7.)
+    finally:
+        scheduler.close()
+
+    assert times == [7.]
+    assert components['idle'].get_current_time() == 7.
+
+
+def test_run_until_past_time(scheduler):
+    scheduler.run_until(6.)
+    scheduler.run_until(3.)
+
+    assert scheduler.time == 6.
+
+
+def test_time_units():
+    components = _clocks(seconds=60., minutes=2.)
+    components['minutes'].get_time_units = lambda: 'min'
+    scheduler = ExchangeScheduler(
+        components, connections=[Connection('seconds', 'minutes', 'count')],
+        time_units='s')
+    try:
+        connection = Connection('seconds', 'minutes', 'count')
+        assert scheduler.time_units == 's'
+        assert scheduler.interval(connection) == 120.
+
+        scheduler.run_until(240.)
+
+        assert components['seconds'].get_current_time() == 240.
+        assert components['minutes'].get_current_time() == 4.
+        assert [time for time, _ in components['minutes'].received] == [
+            0., 2., 4.]
+    finally:
+        scheduler.close()
+
+
+def test_default_time_units():
+    components = _clocks(a=1., b=1.)
+    components['b'].get_time_units = lambda: 'min'
+    scheduler = ExchangeScheduler(components, connections=[])
+    try:
+        assert scheduler.time_units == 's'
+        scheduler.run_until(120.)
+    finally:
+        scheduler.close()
+
+    assert components['a'].get_current_time() == 120.
+    assert components['b'].get_current_time() == 2.
+
+
+def test_zero_time_step_exchanges_at_end():
+    components = _clocks(a=0., b=0.)
+    scheduler = ExchangeScheduler(
+        components, connections=[Connection('a', 'b', 'count')])
+    try:
+        assert scheduler.next_exchange_time(
+            Connection('a', 'b', 'count'), 0.) == float('inf')
+
+        scheduler.run_until(5.)
+        scheduler.run_until(8.)
+
+        assert scheduler.time == 8.
+        assert components['a'].get_current_time() == 8.
+        assert [time for time, _ in components['b'].received] == [0., 5., 8.]
+    finally:
+        scheduler.close()
+
+
+def test_time_must_advance(scheduler, monkeypatch):
+    monkeypatch.setattr(scheduler, 'next_exchange_time',
+                        lambda connection, after: after)
+
+    with pytest.raises(RuntimeError):
+        scheduler.run_until(3.)
@@ -0,0 +1,218 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from basic_modeling_interface.units import (BmiUnitConverter, convert,
+                                            parse_time_units, parse_units,
+                                            time_conversion, unit_conversion)
+
+from .models import TEMPERATURE
+
+
+@pytest.mark.parametrize('units,scale', [('s', 1.), ('ms', 1e-3),
+                                         ('Minutes', 60.), ('hr', 3600.),
+                                         ('d', 86400.), ('weeks', 604800.)])
+def test_parse_time_units(units, scale):
+    parsed = parse_time_units(units)
+
+    assert parsed.scale == scale
+    assert parsed.epoch is None
+
+
+@pytest.mark.parametrize('epoch', ['2000-01-02 12:30:00', '2000-01-02T12:30',
+                                   '2000-01-02 12:30:00 UTC',
+                                   '2000-01-02T12:30:00.0Z'])
+def test_parse_epoch(epoch):
+    parsed = parse_time_units('days since ' + epoch)
+
+    assert parsed.scale == 86400.
+    assert parsed.epoch == datetime.datetime(2000, 1, 2, 12, 30)
+
+
+@pytest.mark.parametrize('units', ['fortnights', 'days since yesterday', ''])
+def test_unknown_time_units(units):
+    with pytest.raises(ValueError):
+        parse_time_units(units)
+
+
+def test_parsed_units_are_remembered():
+    assert parse_time_units('h since 1970-01-01') is parse_time_units(
+        'h since 1970-01-01')
+
+
+@pytest.mark.parametrize('from_units,to_units,scale,offset', [
+    ('d', 's', 86400., 0.),
+    ('s', 'min', 1. / 60., 0.),
+    ('hours since 1970-01-02', 'days since 1970-01-01', 1. / 24., 1.),
+    ('s since 2000-01-01 00:01:00', 'min since 2000-01-01', 1. / 60., 1.),
+    ('d', 'hours since 1970-01-01', 24., 0.),
+])
+def test_time_conversion(from_units, to_units, scale, offset):
+    assert time_conversion(from_units, to_units) == pytest.approx(
+        (scale, offset))
+
+
+@pytest.mark.parametrize('units,scale,dims', [
+    ('km2', 1e6, (2, 0, 0, 0, 0, 0)),
+    ('m^2', 1., (2, 0, 0, 0, 0, 0)),
+    ('m**2', 1., (2, 0, 0, 0, 0, 0)),
+    ('mm/day', 1e-3 / 86400., (1, 0, -1, 0, 0, 0)),
+    ('kg m-2 s-1', 1., (-2, 1, -1, 0, 0, 0)),
+    ('kg.m-2.s-1', 1., (-2, 1, -1, 0, 0, 0)),
+    ('g/cm3', 1e3, (-3, 1, 0, 0, 0, 0)),
+    ('kPa', 1e3, (-1, 1, -2, 0, 0, 0)),
+    ('%', 1e-2, (0, 0, 0, 0, 0, 0)),
+])
+def test_parse_units(units, scale, dims):
+    parsed = parse_units(units)
+
+    assert parsed.scale == pytest.approx(scale)
+    assert parsed.offset == 0.
+    assert parsed.dims == dims
+
+
+def test_offset_only_for_lone_units():
+    assert parse_units('degC').offset == 273.15
+    assert parse_units('degC/s').offset == 0.
+
+
+@pytest.mark.parametrize('units', ['furlongs', 'm^x', 'km/', 'kdegC'])
+def test_unknown_units(units):
+    with pytest.raises(ValueError):
+        parse_units(units)
+
+
+@pytest.mark.parametrize('from_units,to_units,value,expected', [
+    ('degC', 'K', 0., 273.15),
+    ('K', 'degC', 0., -273.15),
+    ('degF', 'degC', 212., 100.),
+    ('mm/day', 'm s-1', 86400., 1e-3),
+    ('km', 'm', 2., 2000.),
+])
+def test_unit_conversion(from_units, to_units, value, expected):
+    scale, offset = unit_conversion(from_units, to_units)
+
+    assert value * scale + offset == pytest.approx(expected)
+
+
+def test_incompatible_units():
+    with pytest.raises(ValueError):
+        unit_conversion('m', 's')
+
+
+def test_convert():
+    values = np.arange(6.).reshape((2, 3))
+    out = np.empty(6)
+
+    assert convert(values, 2., 0., out) is out
+    assert np.array_equal(out, np.arange(0., 12., 2.))
+    assert np.array_equal(convert(values, 1., 1., out), np.arange(1., 7.))
+    assert np.array_equal(convert(out, 2., 1., out), np.arange(3., 15., 2.))
+
+
+def test_convert_bad_buffer():
+    with pytest.raises(ValueError):
+        convert(np.arange(6.), 1., 1., np.empty(12)[::2])
+    with pytest.raises(ValueError):
+        convert(np.arange(6.), 1., 1., np.empty(5))
+
+
+@pytest.fixture
+def celsius(plate):
+    return BmiUnitConverter(plate, {TEMPERATURE: 'degC'})
+
+
+def test_converted_values(celsius, plate):
+    expected = plate.get_value(TEMPERATURE) - 273.15
+    dest = np.empty(12)
+
+    assert celsius.get_var_units(TEMPERATURE) == 'degC'
+    assert np.allclose(celsius.get_value(TEMPERATURE), expected)
+    assert celsius.get_value(TEMPERATURE, dest) is dest
+    assert np.allclose(dest, expected)
+    assert np.allclose(celsius.get_value_at_indices(TEMPERATURE, [0, 11]),
+                       expected[[0, 11]])
+    assert celsius.get_value_ref(TEMPERATURE) is None
+
+
+def test_set_converted_values(celsius, plate):
+    celsius.set_value(TEMPERATURE, np.zeros(12))
+    assert np.allclose(plate.get_value(TEMPERATURE), 273.15)
+
+    celsius.set_value_at_indices(TEMPERATURE, [1, 2], [10., 20.])
+    assert np.allclose(plate.get_value(TEMPERATURE)[:3],
+                       [273.15, 283.15, 293.15])
+
+
+def test_value_without_ref(celsius, plate, monkeypatch):
+    monkeypatch.setattr(plate, 'get_value_ref', lambda name: None)
+
+    assert np.allclose(celsius.get_value(TEMPERATURE),
+                       np.arange(12.) - 273.15)
+
+
+def test_unconverted_values(plate):
+    bmi = BmiUnitConverter(plate, {TEMPERATURE: 'K'})
+
+    assert bmi.get_value_ref(TEMPERATURE) is plate.get_value_ref(TEMPERATURE)
+    assert bmi.bmi is plate
+
+
+def test_forwarded_methods(celsius, plate):
+    celsius.update()
+
+    assert celsius.get_current_time() == plate.get_current_time() == 1.
+    assert celsius.get_var_grid(TEMPERATURE) == 0
+
+
+def test_initialize_recompiles_conversions(celsius, plate, monkeypatch):
+    assert np.allclose(celsius.get_value(TEMPERATURE)[0], -273.15)
+    monkeypatch.setattr(plate, 'get_var_units', lambda name: 'degF')
+    celsius.initialize(None)
+
+    assert np.allclose(celsius.get_value(TEMPERATURE)[0], -160. / 9.)
+
+
+def test_converted_get_values(celsius, plate):
+    expected = plate.get_value(TEMPERATURE) - 273.15
+    dests = {TEMPERATURE: np.empty(12)}
+
+    assert np.allclose(celsius.get_values([TEMPERATURE])[TEMPERATURE],
+                       expected)
+    assert celsius.get_values([TEMPERATURE], dests) == dests
+    assert np.allclose(dests[TEMPERATURE], expected)
+
+
+def test_converted_values_keep_their_type(celsius, plate, monkeypatch):
+    values = np.arange(12, dtype=np.float32)
+    monkeypatch.setattr(plate, 'get_var_type', lambda name: 'float32')
+    monkeypatch.setattr(plate, 'get_value_ref', lambda name: values)
+
+    assert celsius.get_value(TEMPERATURE).dtype == np.float32
+
+
+def test_integer_variable_is_not_converted(celsius, plate, monkeypatch):
+    monkeypatch.setattr(plate, 'get_var_type', lambda name: 'int32')
+
+    with pytest.raises(TypeError):
+        celsius.get_value(TEMPERATURE)
+    with pytest.raises(TypeError):
+        celsius.set_value_at_indices(TEMPERATURE, [0], [1])
+
+
+def test_set_value_at_indices_reuses_buffer(celsius, plate, monkeypatch):
+    received = []
+    set_value_at_indices = plate.set_value_at_indices
+
+    def record(var_name, indices, src):
+        received.append(src)
+        set_value_at_indices(var_name, indices, src)
+
+    monkeypatch.setattr(plate, 'set_value_at_indices', record)
+    celsius.set_value_at_indices(TEMPERATURE, [1, 2], [10., 20.])
+    celsius.set_value_at_indices(TEMPERATURE, [3], [30.])
+
+    assert np.shares_memory(received[0], received[1])
+    assert np.allclose(plate.get_value(TEMPERATURE)[:4],
+                       [0., 283.15, 293.15, 303.15])